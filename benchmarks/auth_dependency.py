@@ -0,0 +1,63 @@
+"""Cost of the `get_current_user` dependency with and without the
+verified-claims cache.
+
+The database is replaced by a stub session that always finds the user,
+so the numbers isolate token verification from query latency.
+
+    python -m benchmarks.auth_dependency --calls 20000
+"""
+
+import argparse
+import asyncio
+from datetime import datetime
+from time import perf_counter
+
+from fast_zero import security
+from fast_zero.cache import Cache, MemoryBackend
+from fast_zero.models import User
+
+
+class StubSession:
+    def __init__(self, user: User):
+        self.user = user
+
+    async def scalar(self, statement):
+        return self.user
+
+
+async def bench(token: str, session: StubSession, calls: int) -> float:
+    started = perf_counter()
+    for _ in range(calls):
+        await security.get_current_user(session, token)
+    return (perf_counter() - started) / calls
+
+
+async def run(calls: int):
+    user = User(username='bench', email='bench@test.com', password='x')
+    user.id, user.created_at, user.updated_at = 1, datetime.now(), None
+    session = StubSession(user)
+    token = security.create_access_token({'sub': user.email})
+    # Só o custo do token importa aqui
+    security.user_cache = Cache(MemoryBackend(maxsize=0), ttl=0)
+
+    security.token_cache = Cache(MemoryBackend(maxsize=0), ttl=0)
+    uncached = await bench(token, session, calls)
+
+    security.token_cache = Cache(MemoryBackend(), ttl=60)
+    cached = await bench(token, session, calls)
+
+    print(f'without claims cache: {uncached * 1e6:8.2f} us/call')
+    print(f'with claims cache:    {cached * 1e6:8.2f} us/call')
+    print(f'speedup:              {uncached / cached:8.2f}x')
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--calls', type=int, default=20_000)
+    args = parser.parse_args()
+
+    asyncio.run(run(args.calls))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,125 @@
+"""Cold start: time from process start to the first successful request.
+
+Each run starts a fresh server process (the same commands as
+`entrypoint.sh`, migrations optional) and polls `--path` until it
+answers 2xx. Reported per run: when the server first answered at all,
+when `--path` first succeeded, and the latency of that first successful
+request, which is where lazy initialization shows up. Runs go with and
+without the startup warm-up.
+
+    python -m benchmarks.cold_start --runs 5 --migrate --path /todos/
+"""
+
+import argparse
+import asyncio
+import os
+import subprocess
+import sys
+from statistics import median
+from time import perf_counter
+
+from httpx import AsyncClient, HTTPError
+
+from benchmarks.common import (
+    app_client,
+    auth_headers,
+    bench_engine,
+    drop_user,
+    seed_user,
+)
+
+
+async def first_success(client, path, headers, started, deadline):
+    """Poll until the server answers, then until `path` succeeds."""
+    up = None
+    while perf_counter() < deadline:
+        sent = perf_counter()
+        try:
+            response = await client.get(path, headers=headers)
+        except HTTPError:
+            await asyncio.sleep(0.01)
+            continue
+        if up is None:
+            up = sent - started
+        if response.is_success:
+            return up, perf_counter() - started, perf_counter() - sent
+        await asyncio.sleep(0.01)
+    raise TimeoutError(f'{path} did not succeed in time')
+
+
+async def cold_start(args, warmup: bool, headers: dict) -> tuple:
+    env = os.environ | {'STARTUP_WARMUP': str(warmup).lower()}
+    started = perf_counter()
+    if args.migrate:
+        subprocess.run(
+            [sys.executable, '-m', 'fast_zero.migrate'], env=env, check=True
+        )
+    server = subprocess.Popen(
+        [
+            sys.executable,
+            '-m',
+            'uvicorn',
+            '--port',
+            str(args.port),
+            'fast_zero.app:app',
+        ],
+        env=env,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    try:
+        async with AsyncClient(
+            base_url=f'http://127.0.0.1:{args.port}', timeout=args.timeout
+        ) as client:
+            return await first_success(
+                client, args.path, headers, started, started + args.timeout
+            )
+    finally:
+        server.terminate()
+        server.wait()
+
+
+async def run(args):
+    engine = bench_engine()
+    user = await seed_user(engine)
+
+    try:
+        # Token emitido antes: o login não entra na conta da partida a frio
+        async with app_client() as client:
+            headers = await auth_headers(client, user)
+
+        print(f'{"warm-up":>8} {"up":>8} {"first ok":>9} {"latency":>8}  (ms)')
+        for warmup in (False, True):
+            runs = [
+                await cold_start(args, warmup, headers)
+                for _ in range(args.runs)
+            ]
+            up, ok, latency = (
+                median(run[i] for run in runs) * 1000 for i in range(3)
+            )
+            print(f'{warmup!s:>8} {up:>8.0f} {ok:>9.0f} {latency:>8.1f}')
+    finally:
+        await drop_user(engine, user)
+        await engine.dispose()
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawTextHelpFormatter
+    )
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--path', default='/todos/')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--timeout', type=float, default=60.0)
+    parser.add_argument(
+        '--migrate',
+        action='store_true',
+        help='run fast_zero.migrate first, as entrypoint.sh does',
+    )
+    args = parser.parse_args()
+
+    asyncio.run(run(args))
+
+
+if __name__ == '__main__':
+    main()
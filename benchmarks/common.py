@@ -0,0 +1,97 @@
+"""Helpers shared by the benchmarks that need a populated database.
+
+Benchmarks run against `DATABASE_URL` (migrated to head) and
+drive the real app in-process through httpx, so they measure the same
+code path as production minus the network.
+"""
+
+import random
+from statistics import quantiles
+from time import perf_counter
+from uuid import uuid4
+
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy import delete, insert
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from fast_zero.app import app
+from fast_zero.hashing import get_password_hash
+from fast_zero.models import Todo, TodoState, User
+from fast_zero.settings import get_settings
+
+PASSWORD = 'benchmark'
+WORDS = (
+    'buy milk call mom write report fix bug review pull request plan trip '
+    'pay bills book flight clean house water plants'
+).split()
+
+
+def bench_engine():
+    return create_async_engine(get_settings().DATABASE_URL)
+
+
+async def seed_user(engine, todos: int = 0, batch: int = 5_000) -> User:
+    """Insert a throwaway user owning `todos` random todos."""
+    name = f'bench_{uuid4().hex[:12]}'
+    async with engine.begin() as conn:
+        user_id = await conn.scalar(
+            insert(User)
+            .values(
+                username=name,
+                email=f'{name}@bench.com',
+                password=get_password_hash(PASSWORD),
+            )
+            .returning(User.id)
+        )
+
+        states = list(TodoState)
+        for start in range(0, todos, batch):
+            await conn.execute(
+                insert(Todo),
+                [
+                    {
+                        'title': ' '.join(random.choices(WORDS, k=3)),
+                        'description': ' '.join(random.choices(WORDS, k=8)),
+                        'state': random.choice(states),
+                        'user_id': user_id,
+                    }
+                    for _ in range(min(batch, todos - start))
+                ],
+            )
+
+    user = User(username=name, email=f'{name}@bench.com', password=PASSWORD)
+    user.id = user_id
+    return user
+
+
+async def drop_user(engine, user: User):
+    async with engine.begin() as conn:
+        await conn.execute(delete(Todo).where(Todo.user_id == user.id))
+        await conn.execute(delete(User).where(User.id == user.id))
+
+
+def app_client() -> AsyncClient:
+    return AsyncClient(
+        transport=ASGITransport(app=app), base_url='http://bench'
+    )
+
+
+async def auth_headers(client: AsyncClient, user: User) -> dict:
+    response = await client.post(
+        '/auth/token', data={'username': user.email, 'password': PASSWORD}
+    )
+    response.raise_for_status()
+    return {'Authorization': f'Bearer {response.json()["access_token"]}'}
+
+
+async def timed(coro_factory, repeat: int) -> dict:
+    """Run `coro_factory()` `repeat` times and summarize latency in ms."""
+    samples = []
+    for _ in range(repeat):
+        started = perf_counter()
+        await coro_factory()
+        samples.append((perf_counter() - started) * 1000)
+
+    samples.sort()
+    cuts = quantiles(samples, n=100) if len(samples) > 1 else samples * 99
+    return {'p50': cuts[49], 'p95': cuts[94], 'max': samples[-1]}
@@ -0,0 +1,60 @@
+"""Latency of an unchanged `GET /todos/` poll: full 200 response vs a 304
+answered from the collection change token (`If-None-Match`).
+
+    python -m benchmarks.conditional_get --todos 10000 --limit 100
+"""
+
+import argparse
+import asyncio
+
+from benchmarks.common import (
+    app_client,
+    auth_headers,
+    bench_engine,
+    drop_user,
+    seed_user,
+    timed,
+)
+
+
+async def run(todos: int, limit: int, repeat: int):
+    engine = bench_engine()
+    user = await seed_user(engine, todos)
+    url = f'/todos/?limit={limit}'
+
+    try:
+        async with app_client() as client:
+            headers = await auth_headers(client, user)
+            etag = (await client.get(url, headers=headers)).headers['etag']
+            polls = {
+                '200': await timed(
+                    lambda: client.get(url, headers=headers), repeat
+                ),
+                '304': await timed(
+                    lambda: client.get(
+                        url, headers={**headers, 'If-None-Match': etag}
+                    ),
+                    repeat,
+                ),
+            }
+    finally:
+        await drop_user(engine, user)
+        await engine.dispose()
+
+    print(f'{"status":>6} {"p50":>8} {"p95":>8}  (ms)')
+    for status, result in polls.items():
+        print(f'{status:>6} {result["p50"]:>8.2f} {result["p95"]:>8.2f}')
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--todos', type=int, default=10_000)
+    parser.add_argument('--limit', type=int, default=100)
+    parser.add_argument('--repeat', type=int, default=200)
+    args = parser.parse_args()
+
+    asyncio.run(run(args.todos, args.limit, args.repeat))
+
+
+if __name__ == '__main__':
+    main()
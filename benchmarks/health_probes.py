@@ -0,0 +1,61 @@
+"""Latency of the on-demand health check (`GET /health/`) against the
+cached readiness probe (`GET /health/ready`), with the engine pool idle
+and with every pool connection held by other work.
+
+    python -m benchmarks.health_probes --repeat 500 --cap 2
+"""
+
+import argparse
+import asyncio
+from contextlib import AsyncExitStack
+
+from benchmarks.common import app_client, timed
+from fast_zero.database import engine, pool_status
+from fast_zero.readiness import readiness_probe
+
+
+async def capped(request, cap: float):
+    try:
+        await asyncio.wait_for(request(), cap)
+    except TimeoutError:
+        pass
+
+
+async def measure(client, repeat: int, cap: float):
+    for path in ('/health/', '/health/ready'):
+        stats = await timed(
+            lambda path=path: capped(lambda: client.get(path), cap), repeat
+        )
+        print(f'{path:>14} {stats["p50"]:>9.2f} {stats["p95"]:>9.2f}')
+
+
+async def run(repeat: int, cap: float):
+    await readiness_probe.run()
+
+    async with app_client() as client:
+        print(f'{"idle pool":>14} {"p50":>9} {"p95":>9}  (ms)')
+        await measure(client, repeat, cap)
+
+        async with AsyncExitStack() as stack:
+            for _ in range(pool_status()['max_connections']):
+                await stack.enter_async_context(engine.connect())
+            print(f'\n{"held pool":>14} {"p50":>9} {"p95":>9}  (ms)')
+            # Poucas repetições: cada check sob demanda espera até `cap`
+            await measure(client, max(repeat // 50, 2), cap)
+
+    await engine.dispose()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--repeat', type=int, default=500)
+    parser.add_argument(
+        '--cap', type=float, default=2.0, help='give up a request after'
+    )
+    args = parser.parse_args()
+
+    asyncio.run(run(args.repeat, args.cap))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,96 @@
+"""Memory and allocations of the list-endpoint reads: full ORM entities
+(`select(Todo)` / `select(User)`) vs the column-projected rows the
+routers now use. The users read covers whatever accounts the database
+already holds, up to `--rows`.
+
+    python -m benchmarks.list_queries --rows 1000 --repeat 20
+"""
+
+import argparse
+import asyncio
+import tracemalloc
+from time import perf_counter
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from benchmarks.common import bench_engine, drop_user, seed_user
+from fast_zero.models import Todo, User
+from fast_zero.routers.todos import TODO_COLUMNS
+from fast_zero.routers.users import USER_COLUMNS
+
+
+async def entities(session, query):
+    return (await session.scalars(query)).all()
+
+
+async def rows(session, query):
+    return (await session.execute(query)).all()
+
+
+async def measure(engine, fetch, query, repeat: int) -> dict:
+    """Peak traced memory per request, live allocation blocks per row
+    while the page is held, and p50 latency."""
+    peaks, blocks, latencies = [], [], []
+    for _ in range(repeat):
+        async with AsyncSession(engine, expire_on_commit=False) as session:
+            tracemalloc.start()
+            before = tracemalloc.take_snapshot()
+            started = perf_counter()
+            page = await fetch(session, query)
+            latencies.append((perf_counter() - started) * 1000)
+            after = tracemalloc.take_snapshot()
+            peaks.append(tracemalloc.get_traced_memory()[1])
+            tracemalloc.stop()
+
+            grown = sum(
+                stat.count_diff for stat in after.compare_to(before, 'lineno')
+            )
+            blocks.append(grown / max(len(page), 1))
+
+    latencies.sort()
+    return {
+        'peak_kib': sorted(peaks)[len(peaks) // 2] / 1024,
+        'blocks_per_row': sorted(blocks)[len(blocks) // 2],
+        'p50_ms': latencies[len(latencies) // 2],
+    }
+
+
+async def run(size: int, repeat: int):
+    engine = bench_engine()
+    user = await seed_user(engine, size)
+    owner = Todo.user_id == user.id
+    cases = (
+        ('todos', entities, select(Todo).where(owner).order_by(Todo.id)),
+        ('todos', rows, select(*TODO_COLUMNS).where(owner).order_by(Todo.id)),
+        ('users', entities, select(User).order_by(User.id).limit(size)),
+        ('users', rows, select(*USER_COLUMNS).order_by(User.id).limit(size)),
+    )
+
+    print(
+        f'{"read":>6} {"mode":>9} {"peak KiB":>10} '
+        f'{"blocks/row":>11} {"p50 ms":>8}'
+    )
+    try:
+        for name, fetch, query in cases:
+            result = await measure(engine, fetch, query, repeat)
+            print(
+                f'{name:>6} {fetch.__name__:>9} {result["peak_kib"]:>10.0f} '
+                f'{result["blocks_per_row"]:>11.1f} {result["p50_ms"]:>8.2f}'
+            )
+    finally:
+        await drop_user(engine, user)
+        await engine.dispose()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--rows', type=int, default=1_000)
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args()
+
+    asyncio.run(run(args.rows, args.repeat))
+
+
+if __name__ == '__main__':
+    main()
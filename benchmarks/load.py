@@ -0,0 +1,362 @@
+"""Mixed-workload load test of the API.
+
+Seeds `--users` users owning `--todos` todos each (built with the test
+factories), then runs `--concurrency` virtual users against the app for
+`--duration` seconds. Every virtual user logs in once and then picks
+operations at random according to `--mix`. Throughput and p50/p95/p99
+latency per operation go to a JSON report. With `--baseline`, the run is
+compared against a stored report and the exit status is 1 when any
+operation regressed by more than `--tolerance`.
+
+    python -m benchmarks.load --users 50 --todos 200 --concurrency 32 \\
+        --duration 30 --report load.json --baseline baseline.json
+
+Without `--url` the app is driven in-process through httpx; with it, a
+running server (e.g. `fastapi run`) is load-tested over the network.
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import sys
+from dataclasses import dataclass, field
+from statistics import quantiles
+from time import perf_counter
+from uuid import uuid4
+
+import factory
+from httpx import AsyncClient, Limits
+from sqlalchemy import delete, insert
+
+from benchmarks.common import PASSWORD, app_client, bench_engine
+from fast_zero.hashing import get_password_hash
+from fast_zero.models import Todo, User
+from tests.conftest import TodoFactory, UserFactory
+
+# Operação -> peso padrão no sorteio; o prefixo é o router exercitado
+DEFAULT_MIX = {
+    'auth.login': 1,
+    'todos.list': 10,
+    'todos.create': 3,
+    'todos.patch': 3,
+    'todos.delete': 2,
+    'users.read': 2,
+    'health.check': 1,
+}
+
+# Aumento tolerado na taxa de erros (pontos percentuais / 100)
+ERROR_RATE_SLACK = 0.01
+
+
+@dataclass
+class Population:
+    # (email, user id, ids dos todos semeados)
+    users: list[tuple[str, int, list[int]]]
+
+
+@dataclass
+class Recorder:
+    warmup_until: float
+    samples: dict[str, list[float]] = field(default_factory=dict)
+    errors: dict[str, int] = field(default_factory=dict)
+
+    def record(self, name: str, started: float, ok: bool):
+        if started < self.warmup_until:
+            return
+        self.samples.setdefault(name, []).append(perf_counter() - started)
+        if not ok:
+            self.errors[name] = self.errors.get(name, 0) + 1
+
+
+async def seed(engine, users: int, todos: int) -> Population:
+    tag = uuid4().hex[:8]
+    # Um hash só: argon2 por usuário dominaria o tempo de carga
+    password = get_password_hash(PASSWORD)
+    rows = factory.build_batch(
+        dict,
+        users,
+        FACTORY_CLASS=UserFactory,
+        username=factory.Sequence(lambda n: f'load_{tag}_{n}'),
+        password=password,
+    )
+
+    async with engine.begin() as conn:
+        created = (
+            await conn.execute(
+                insert(User).returning(User.id, User.email),
+                rows,
+            )
+        ).all()
+
+        population = []
+        for user_id, email in created:
+            todo_ids = []
+            if todos:
+                todo_ids = list(
+                    await conn.scalars(
+                        insert(Todo).returning(Todo.id),
+                        factory.build_batch(
+                            dict,
+                            todos,
+                            FACTORY_CLASS=TodoFactory,
+                            user_id=user_id,
+                        ),
+                    )
+                )
+            population.append((email, user_id, todo_ids))
+
+    return Population(population)
+
+
+async def drop(engine, population: Population):
+    ids = [user_id for _, user_id, _ in population.users]
+    async with engine.begin() as conn:
+        await conn.execute(delete(Todo).where(Todo.user_id.in_(ids)))
+        await conn.execute(delete(User).where(User.id.in_(ids)))
+
+
+class VirtualUser:
+    def __init__(self, client: AsyncClient, email: str, user_id, todo_ids):
+        self.client = client
+        self.email = email
+        self.user_id = user_id
+        self.todo_ids = list(todo_ids)
+        self.created: list[int] = []
+        self.headers = {}
+
+    async def login(self):
+        response = await self.client.post(
+            '/auth/token',
+            data={'username': self.email, 'password': PASSWORD},
+        )
+        if response.is_success:
+            token = response.json()['access_token']
+            self.headers = {'Authorization': f'Bearer {token}'}
+        return response
+
+    async def list_todos(self):
+        return await self.client.get('/todos/', headers=self.headers)
+
+    async def create_todo(self):
+        response = await self.client.post(
+            '/todos/',
+            headers=self.headers,
+            json={'title': 'load', 'description': 'test', 'state': 'todo'},
+        )
+        if response.is_success:
+            self.created.append(response.json()['id'])
+        return response
+
+    async def patch_todo(self):
+        ids = self.todo_ids + self.created
+        if not ids:
+            return await self.create_todo()
+        return await self.client.patch(
+            f'/todos/{random.choice(ids)}',
+            headers=self.headers,
+            json={'state': random.choice(['todo', 'doing', 'done'])},
+        )
+
+    async def delete_todo(self):
+        # Só apaga o que a própria carga criou: os dados semeados ficam
+        if not self.created:
+            await self.create_todo()
+        return await self.client.delete(
+            f'/todos/{self.created.pop()}', headers=self.headers
+        )
+
+    async def read_user(self):
+        return await self.client.get(f'/users/{self.user_id}')
+
+    async def health(self):
+        return await self.client.get('/health/')
+
+    def operations(self):
+        return {
+            'auth.login': self.login,
+            'todos.list': self.list_todos,
+            'todos.create': self.create_todo,
+            'todos.patch': self.patch_todo,
+            'todos.delete': self.delete_todo,
+            'users.read': self.read_user,
+            'health.check': self.health,
+        }
+
+
+async def virtual_user(user, mix, deadline, recorder):
+    await user.login()
+    operations = user.operations()
+    names, weights = list(mix), list(mix.values())
+
+    while perf_counter() < deadline:
+        name = random.choices(names, weights)[0]
+        started = perf_counter()
+        try:
+            response = await operations[name]()
+            ok = response.is_success
+        except Exception:
+            ok = False
+        recorder.record(name, started, ok)
+
+
+def summarize(samples: list[float], errors: int, elapsed: float) -> dict:
+    samples = sorted(samples)
+    cuts = quantiles(samples, n=100) if len(samples) > 1 else samples * 99
+    return {
+        'requests': len(samples),
+        'errors': errors,
+        'throughput': len(samples) / elapsed,
+        'p50': cuts[49] * 1000,
+        'p95': cuts[94] * 1000,
+        'p99': cuts[98] * 1000,
+        'max': samples[-1] * 1000,
+    }
+
+
+def compare(report: dict, baseline: dict, tolerance: float) -> list[str]:
+    """Regressions of `report` against `baseline`, one line each."""
+    regressions = []
+    for name, base in baseline['operations'].items():
+        current = report['operations'].get(name)
+        if current is None:
+            continue
+
+        for metric in ('p50', 'p95', 'p99'):
+            if current[metric] > base[metric] * (1 + tolerance):
+                regressions.append(
+                    f'{name}: {metric} {base[metric]:.2f} -> '
+                    f'{current[metric]:.2f} ms'
+                )
+        if current['throughput'] < base['throughput'] * (1 - tolerance):
+            regressions.append(
+                f'{name}: throughput {base["throughput"]:.1f} -> '
+                f'{current["throughput"]:.1f} req/s'
+            )
+        base_rate = base['errors'] / max(base['requests'], 1)
+        rate = current['errors'] / max(current['requests'], 1)
+        if rate > base_rate + ERROR_RATE_SLACK:
+            regressions.append(
+                f'{name}: error rate {base_rate:.2%} -> {rate:.2%}'
+            )
+    return regressions
+
+
+def parse_mix(value: str) -> dict[str, int]:
+    mix = {}
+    for item in value.split(','):
+        name, _, weight = item.partition('=')
+        if name not in DEFAULT_MIX:
+            raise argparse.ArgumentTypeError(f'unknown operation {name!r}')
+        mix[name] = int(weight)
+    return mix
+
+
+def make_client(url: str | None, concurrency: int) -> AsyncClient:
+    if url is None:
+        return app_client()
+    return AsyncClient(
+        base_url=url,
+        limits=Limits(max_connections=concurrency),
+        timeout=30,
+    )
+
+
+async def run(args) -> dict:
+    engine = bench_engine()
+    population = await seed(engine, args.users, args.todos)
+
+    try:
+        async with make_client(args.url, args.concurrency) as client:
+            started = perf_counter()
+            deadline = started + args.warmup + args.duration
+            recorder = Recorder(warmup_until=started + args.warmup)
+            await asyncio.gather(
+                *(
+                    virtual_user(
+                        VirtualUser(client, *population.users[i % args.users]),
+                        args.mix,
+                        deadline,
+                        recorder,
+                    )
+                    for i in range(args.concurrency)
+                )
+            )
+            elapsed = perf_counter() - started - args.warmup
+    finally:
+        await drop(engine, population)
+        await engine.dispose()
+
+    operations = {
+        name: summarize(samples, recorder.errors.get(name, 0), elapsed)
+        for name, samples in sorted(recorder.samples.items())
+    }
+    return {
+        'config': {
+            'users': args.users,
+            'todos': args.todos,
+            'concurrency': args.concurrency,
+            'duration': args.duration,
+            'mix': args.mix,
+            'url': args.url,
+        },
+        'total': {
+            'requests': sum(op['requests'] for op in operations.values()),
+            'errors': sum(op['errors'] for op in operations.values()),
+            'throughput': sum(op['throughput'] for op in operations.values()),
+        },
+        'operations': operations,
+    }
+
+
+def print_report(report: dict):
+    print(
+        f'{"operation":>14} {"req/s":>8} {"p50":>8} {"p95":>8} '
+        f'{"p99":>8} {"errors":>7}  (ms)'
+    )
+    for name, op in report['operations'].items():
+        print(
+            f'{name:>14} {op["throughput"]:>8.1f} {op["p50"]:>8.2f} '
+            f'{op["p95"]:>8.2f} {op["p99"]:>8.2f} {op["errors"]:>7}'
+        )
+    total = report['total']
+    print(
+        f'{"total":>14} {total["throughput"]:>8.1f} '
+        f'({total["requests"]} requests, {total["errors"]} errors)'
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawTextHelpFormatter
+    )
+    parser.add_argument('--users', type=int, default=50)
+    parser.add_argument('--todos', type=int, default=200)
+    parser.add_argument('--concurrency', type=int, default=32)
+    parser.add_argument('--duration', type=float, default=30.0)
+    parser.add_argument('--warmup', type=float, default=3.0)
+    parser.add_argument('--mix', type=parse_mix, default=DEFAULT_MIX)
+    parser.add_argument('--url', help='load-test a running server instead')
+    parser.add_argument('--report', help='write the JSON report here')
+    parser.add_argument('--baseline', help='JSON report to compare against')
+    parser.add_argument('--tolerance', type=float, default=0.2)
+    args = parser.parse_args()
+
+    report = asyncio.run(run(args))
+    print_report(report)
+
+    if args.report:
+        with open(args.report, 'w', encoding='utf-8') as file:
+            json.dump(report, file, indent=2)
+
+    if args.baseline:
+        with open(args.baseline, encoding='utf-8') as file:
+            regressions = compare(report, json.load(file), args.tolerance)
+        for regression in regressions:
+            print(f'REGRESSION {regression}')
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,87 @@
+"""Page-N latency of `GET /todos/` with offset vs keyset pagination.
+
+Offset pages get slower the deeper they are; cursor pages should stay
+flat.
+
+    python -m benchmarks.pagination --todos 200000 --page-size 50
+"""
+
+import argparse
+import asyncio
+
+from sqlalchemy import select
+
+from benchmarks.common import (
+    app_client,
+    auth_headers,
+    bench_engine,
+    drop_user,
+    seed_user,
+    timed,
+)
+from fast_zero.models import Todo
+from fast_zero.pagination import encode_cursor
+
+
+async def id_at(engine, user, position: int) -> int:
+    """Id of the row that ends the previous page (what a cursor holds)."""
+    async with engine.connect() as conn:
+        return await conn.scalar(
+            select(Todo.id)
+            .where(Todo.user_id == user.id)
+            .order_by(Todo.id)
+            .offset(position)
+            .limit(1)
+        )
+
+
+async def run(todos: int, page_size: int, repeat: int):
+    engine = bench_engine()
+    user = await seed_user(engine, todos)
+
+    try:
+        async with app_client() as client:
+            headers = await auth_headers(client, user)
+
+            print(f'{"page":>8} {"offset p50":>12} {"cursor p50":>12}  (ms)')
+            page = 1
+            while (page - 1) * page_size < todos:
+                skip = (page - 1) * page_size
+                query = f'limit={page_size}'
+                if skip:
+                    last_id = await id_at(engine, user, skip - 1)
+                    query += f'&cursor={encode_cursor(last_id)}'
+
+                offset_stats = await timed(
+                    lambda: client.get(
+                        f'/todos/?offset={skip}&limit={page_size}',
+                        headers=headers,
+                    ),
+                    repeat,
+                )
+                cursor_stats = await timed(
+                    lambda: client.get(f'/todos/?{query}', headers=headers),
+                    repeat,
+                )
+                print(
+                    f'{page:>8} {offset_stats["p50"]:>12.2f} '
+                    f'{cursor_stats["p50"]:>12.2f}'
+                )
+                page *= 10
+    finally:
+        await drop_user(engine, user)
+        await engine.dispose()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--todos', type=int, default=100_000)
+    parser.add_argument('--page-size', type=int, default=50)
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args()
+
+    asyncio.run(run(args.todos, args.page_size, args.repeat))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,77 @@
+"""Logins per second per core for the configured argon2 parameters.
+
+Measures raw `verify_password` throughput in a single process and then
+through the `HashingPool` with every worker busy, which is what a login
+storm looks like to the API.
+
+    python -m benchmarks.password_hashing --logins 200 --workers 4
+"""
+
+import argparse
+import asyncio
+import os
+from time import perf_counter
+
+from fast_zero.hashing import (
+    HashingPool,
+    get_password_hash,
+    settings,
+    verify_password,
+)
+
+
+def bench_inline(hashed: str, logins: int) -> float:
+    started = perf_counter()
+    for _ in range(logins):
+        verify_password('benchmark', hashed)
+    return logins / (perf_counter() - started)
+
+
+async def bench_pool(hashed: str, logins: int, workers: int) -> float:
+    pool = HashingPool(workers=workers, max_pending=logins, retry_after=1)
+    # Spawn the workers before the clock starts
+    await asyncio.gather(
+        *(
+            pool.run(verify_password, 'benchmark', hashed)
+            for _ in range(workers)
+        )
+    )
+
+    started = perf_counter()
+    await asyncio.gather(
+        *(
+            pool.run(verify_password, 'benchmark', hashed)
+            for _ in range(logins)
+        )
+    )
+    elapsed = perf_counter() - started
+    pool.shutdown()
+
+    return logins / elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--logins', type=int, default=100)
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1)
+    args = parser.parse_args()
+
+    hashed = get_password_hash('benchmark')
+    print(
+        f'argon2 time_cost={settings.ARGON2_TIME_COST} '
+        f'memory_cost={settings.ARGON2_MEMORY_COST} '
+        f'parallelism={settings.ARGON2_PARALLELISM}'
+    )
+
+    inline = bench_inline(hashed, args.logins)
+    print(f'inline:           {inline:8.1f} logins/s (1 core)')
+
+    pooled = asyncio.run(bench_pool(hashed, args.logins, args.workers))
+    print(
+        f'pool ({args.workers} workers): {pooled:8.1f} logins/s, '
+        f'{pooled / args.workers:.1f} logins/s per core'
+    )
+
+
+if __name__ == '__main__':
+    main()
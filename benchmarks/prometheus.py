@@ -0,0 +1,89 @@
+"""Cost of the Prometheus instrumentation: per-request overhead of
+`PrometheusMiddleware` and the time to answer a scrape that merges
+`--workers` snapshot files.
+
+    python -m benchmarks.prometheus --workers 8 --routes 30
+"""
+
+import argparse
+import asyncio
+import json
+import tempfile
+from pathlib import Path
+from time import perf_counter
+
+from fastapi import FastAPI
+from httpx import ASGITransport, AsyncClient
+
+from benchmarks.common import timed
+from fast_zero.metrics import request_metrics
+from fast_zero.prometheus import (
+    PrometheusMiddleware,
+    collect,
+    merge,
+    read_snapshots,
+    render,
+)
+
+
+def make_app(instrumented: bool) -> FastAPI:
+    app = FastAPI()
+
+    @app.get('/items/{item_id}')
+    async def read_item(item_id: int):
+        return {'id': item_id}
+
+    if instrumented:
+        app.add_middleware(PrometheusMiddleware)
+    return app
+
+
+async def request_overhead(repeat: int):
+    print(f'{"metrics":>7} {"p50":>8} {"p95":>8}  (ms)')
+    for instrumented in (False, True):
+        transport = ASGITransport(app=make_app(instrumented))
+        async with AsyncClient(
+            transport=transport, base_url='http://bench'
+        ) as client:
+            result = await timed(lambda: client.get('/items/1'), repeat)
+        label = 'on' if instrumented else 'off'
+        print(f'{label:>7} {result["p50"]:>8.3f} {result["p95"]:>8.3f}')
+
+
+def scrape_cost(workers: int, routes: int, repeat: int):
+    for route in range(routes):
+        request_metrics.started()
+        request_metrics.finished('GET', f'/route/{route}', 200, 0.01)
+    snapshot = json.dumps(collect())
+
+    with tempfile.TemporaryDirectory() as directory:
+        for pid in range(workers):
+            # pids fictícios: contam como processos mortos (sem gauges)
+            Path(directory, f'{4_194_305 + pid}.json').write_text(
+                snapshot, encoding='utf-8'
+            )
+
+        started = perf_counter()
+        for _ in range(repeat):
+            text = render(merge(read_snapshots(directory)))
+        elapsed = (perf_counter() - started) / repeat
+
+    print(
+        f'scrape of {workers} workers x {routes} routes: '
+        f'{elapsed * 1000:.2f} ms, {len(text) / 1024:.0f} KiB'
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--repeat', type=int, default=2000)
+    parser.add_argument('--workers', type=int, default=8)
+    parser.add_argument('--routes', type=int, default=30)
+    args = parser.parse_args()
+
+    asyncio.run(request_overhead(args.repeat))
+    scrape_cost(args.workers, args.routes, max(args.repeat // 100, 1))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,67 @@
+"""Latency of the cached read endpoints with the response cache off and
+on, plus the per-route hit ratio and saved time it reports.
+
+    python -m benchmarks.response_cache --todos 10000 --repeat 200
+"""
+
+import argparse
+import asyncio
+
+from benchmarks.common import (
+    app_client,
+    auth_headers,
+    bench_engine,
+    drop_user,
+    seed_user,
+    timed,
+)
+from fast_zero.response_cache import response_cache
+
+
+async def run(todos: int, limit: int, repeat: int, ttl: float):
+    engine = bench_engine()
+    user = await seed_user(engine, todos)
+
+    try:
+        async with app_client() as client:
+            headers = await auth_headers(client, user)
+            routes = {
+                'list_todos': lambda: client.get(
+                    f'/todos/?limit={limit}', headers=headers
+                ),
+                'read_users': lambda: client.get(f'/users/?limit={limit}'),
+                'read_user': lambda: client.get(f'/users/{user.id}'),
+            }
+
+            print(f'{"route":>12} {"off p50":>9} {"on p50":>9}  (ms)')
+            for name, request in routes.items():
+                response_cache.ttl = 0
+                off = await timed(request, repeat)
+                response_cache.ttl = ttl
+                on = await timed(request, repeat)
+                print(f'{name:>12} {off["p50"]:>9.2f} {on["p50"]:>9.2f}')
+
+            print()
+            for name, stats in response_cache.stats().items():
+                print(
+                    f'{name:>12} hit ratio {stats["hit_ratio"]:.2f}, '
+                    f'saved {stats["saved_seconds"] * 1000:.1f} ms'
+                )
+    finally:
+        await drop_user(engine, user)
+        await engine.dispose()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--todos', type=int, default=10_000)
+    parser.add_argument('--limit', type=int, default=100)
+    parser.add_argument('--repeat', type=int, default=200)
+    parser.add_argument('--ttl', type=float, default=60.0)
+    args = parser.parse_args()
+
+    asyncio.run(run(args.todos, args.limit, args.repeat, args.ttl))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,114 @@
+"""CPU time per 1k rows to turn a `GET /todos/` / `GET /users/` page of
+ORM objects into JSON bytes: FastAPI's `response_model` path vs
+`fast_zero.serialization`. No database needed.
+
+    python -m benchmarks.serialization --rows 1000 --repeat 200
+"""
+
+import argparse
+import asyncio
+from time import process_time
+
+from fastapi.responses import JSONResponse
+from fastapi.routing import serialize_response
+
+from benchmarks.common import WORDS
+from fast_zero.app import app
+from fast_zero.models import Todo, TodoState, User
+from fast_zero.serialization import todo_page, user_page
+
+
+def make_todos(rows: int) -> list[Todo]:
+    todos = []
+    for n in range(rows):
+        todo = Todo(
+            title=' '.join(WORDS[n % 10 : n % 10 + 3]),
+            description=' '.join(WORDS[: n % 16]),
+            state=list(TodoState)[n % len(TodoState)],
+            user_id=1,
+        )
+        todo.id = n + 1
+        todos.append(todo)
+    return todos
+
+
+def make_users(rows: int) -> list[User]:
+    users = []
+    for n in range(rows):
+        user = User(
+            username=f'user{n}', email=f'user{n}@bench.com', password='x' * 97
+        )
+        user.id = n + 1
+        users.append(user)
+    return users
+
+
+def response_field(path: str):
+    return next(
+        route.response_field
+        for route in app.routes
+        if route.path == path and 'GET' in route.methods
+    )
+
+
+async def default_path(field, content: dict) -> bytes:
+    return JSONResponse(
+        await serialize_response(field=field, response_content=content)
+    ).body
+
+
+async def cpu_ms_per_1k(coro_factory, rows: int, repeat: int) -> float:
+    started = process_time()
+    for _ in range(repeat):
+        await coro_factory()
+    return (process_time() - started) * 1000 / repeat * 1000 / rows
+
+
+async def run(rows: int, repeat: int):
+    todos, users = make_todos(rows), make_users(rows)
+    todo_field, user_field = (
+        response_field('/todos/'),
+        response_field('/users/'),
+    )
+
+    async def fast_todos():
+        return todo_page.dump_json(todos, None)
+
+    async def fast_users():
+        return user_page.dump_json(users, None)
+
+    cases = (
+        (
+            'todos',
+            lambda: default_path(
+                todo_field, {'todos': todos, 'next_cursor': None}
+            ),
+            fast_todos,
+        ),
+        (
+            'users',
+            lambda: default_path(
+                user_field, {'users': users, 'next_cursor': None}
+            ),
+            fast_users,
+        ),
+    )
+
+    print(f'{"page":>6} {"default":>10} {"fast":>10}  (CPU ms / 1k rows)')
+    for name, default, fast in cases:
+        default_ms = await cpu_ms_per_1k(default, rows, repeat)
+        fast_ms = await cpu_ms_per_1k(fast, rows, repeat)
+        print(f'{name:>6} {default_ms:>10.2f} {fast_ms:>10.2f}')
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--rows', type=int, default=1_000)
+    parser.add_argument('--repeat', type=int, default=200)
+    args = parser.parse_args()
+
+    asyncio.run(run(args.rows, args.repeat))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,60 @@
+"""Overhead of the `Server-Timing` instrumentation: a no-op `phase()`
+call with timing off, and per-request latency of the same endpoint with
+and without `ServerTimingMiddleware` + `instrument_routes`.
+
+    python -m benchmarks.server_timing --repeat 2000
+"""
+
+import argparse
+import asyncio
+from timeit import timeit
+
+from fastapi import FastAPI
+from httpx import ASGITransport, AsyncClient
+
+from benchmarks.common import timed
+from fast_zero.schemas import Message
+from fast_zero.timing import ServerTimingMiddleware, instrument_routes, phase
+
+
+def make_app(instrumented: bool) -> FastAPI:
+    app = FastAPI()
+
+    @app.get('/ping', response_model=Message)
+    async def ping():
+        with phase('jwt'):
+            pass
+        return {'message': 'pong'}
+
+    if instrumented:
+        instrument_routes(app)
+        app.add_middleware(ServerTimingMiddleware)
+    return app
+
+
+async def run(repeat: int):
+    calls = 1_000_000
+    seconds = timeit(lambda: phase('jwt'), number=calls)
+    print(f'phase() with timing off: {seconds / calls * 1e9:.0f} ns/call')
+
+    print(f'{"timing":>6} {"p50":>8} {"p95":>8}  (ms)')
+    for instrumented in (False, True):
+        transport = ASGITransport(app=make_app(instrumented))
+        async with AsyncClient(
+            transport=transport, base_url='http://bench'
+        ) as client:
+            result = await timed(lambda: client.get('/ping'), repeat)
+        label = 'on' if instrumented else 'off'
+        print(f'{label:>6} {result["p50"]:>8.3f} {result["p95"]:>8.3f}')
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--repeat', type=int, default=2000)
+    args = parser.parse_args()
+
+    asyncio.run(run(args.repeat))
+
+
+if __name__ == '__main__':
+    main()
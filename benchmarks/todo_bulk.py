@@ -0,0 +1,109 @@
+"""Write throughput (rows/sec) of the `/todos/bulk` endpoints vs the
+single-item `POST /todos/` and `PATCH /todos/{id}` path.
+
+    python -m benchmarks.todo_bulk --rows 5000 --batch 500
+"""
+
+import argparse
+import asyncio
+from time import perf_counter
+
+from benchmarks.common import (
+    app_client,
+    auth_headers,
+    bench_engine,
+    drop_user,
+    seed_user,
+)
+
+
+def new_todo(n: int) -> dict:
+    return {'title': f'todo {n}', 'description': 'bulk', 'state': 'todo'}
+
+
+async def rate(coro_factory, rows: int) -> float:
+    started = perf_counter()
+    await coro_factory()
+    return rows / (perf_counter() - started)
+
+
+async def run(rows: int, batch: int):
+    engine = bench_engine()
+    user = await seed_user(engine)
+
+    async def single_create():
+        for n in range(rows):
+            response = await client.post(
+                '/todos/', json=new_todo(n), headers=headers
+            )
+            response.raise_for_status()
+
+    async def bulk_create():
+        for start in range(0, rows, batch):
+            response = await client.post(
+                '/todos/bulk',
+                json={
+                    'todos': [
+                        new_todo(n)
+                        for n in range(start, min(start + batch, rows))
+                    ]
+                },
+                headers=headers,
+            )
+            response.raise_for_status()
+
+    async def single_patch():
+        for todo_id in ids[:rows]:
+            response = await client.patch(
+                f'/todos/{todo_id}', json={'state': 'done'}, headers=headers
+            )
+            response.raise_for_status()
+
+    async def bulk_patch():
+        for start in range(rows, 2 * rows, batch):
+            response = await client.patch(
+                '/todos/bulk',
+                json={
+                    'todos': [
+                        {'id': todo_id, 'state': 'done'}
+                        for todo_id in ids[start : start + batch]
+                    ]
+                },
+                headers=headers,
+            )
+            response.raise_for_status()
+
+    try:
+        async with app_client() as client:
+            headers = await auth_headers(client, user)
+
+            print(f'{"operation":>10} {"single":>12} {"bulk":>12}  (rows/s)')
+            created = (
+                await rate(single_create, rows),
+                await rate(bulk_create, rows),
+            )
+            print(f'{"create":>10} {created[0]:>12.0f} {created[1]:>12.0f}')
+
+            listing = await client.get('/todos/', headers=headers)
+            ids = [todo['id'] for todo in listing.json()['todos']]
+            patched = (
+                await rate(single_patch, rows),
+                await rate(bulk_patch, rows),
+            )
+            print(f'{"patch":>10} {patched[0]:>12.0f} {patched[1]:>12.0f}')
+    finally:
+        await drop_user(engine, user)
+        await engine.dispose()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--rows', type=int, default=5_000)
+    parser.add_argument('--batch', type=int, default=500)
+    args = parser.parse_args()
+
+    asyncio.run(run(args.rows, args.batch))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,110 @@
+"""Peak memory and time to first byte of `GET /todos/export` vs loading
+the whole account through `GET /todos/`, at several account sizes.
+
+    python -m benchmarks.todo_export --sizes 10000 100000 1000000
+"""
+
+import argparse
+import asyncio
+import tracemalloc
+from time import perf_counter
+
+from benchmarks.common import (
+    app_client,
+    auth_headers,
+    bench_engine,
+    drop_user,
+    seed_user,
+)
+from fast_zero.app import app
+
+
+async def measure(path: str, query: str, headers: dict) -> dict:
+    """Call the ASGI app directly and drop each body chunk as it arrives
+    (httpx's ASGITransport would buffer the whole body). Reports peak
+    traced memory in MiB plus first-byte and total latency in ms."""
+    scope = {
+        'type': 'http',
+        'http_version': '1.1',
+        'method': 'GET',
+        'scheme': 'http',
+        'path': path,
+        'raw_path': path.encode(),
+        'query_string': query.encode(),
+        'root_path': '',
+        'headers': [
+            (key.lower().encode(), value.encode())
+            for key, value in headers.items()
+        ],
+        'client': ('bench', 0),
+        'server': ('bench', 80),
+    }
+    first_byte = None
+    requested = asyncio.Event()
+
+    async def receive():
+        # Depois do corpo (vazio) da requisição, o cliente nunca desconecta
+        if requested.is_set():
+            await asyncio.Event().wait()
+        requested.set()
+        return {'type': 'http.request', 'body': b'', 'more_body': False}
+
+    async def send(message):
+        nonlocal first_byte
+        if message['type'] == 'http.response.body' and first_byte is None:
+            first_byte = perf_counter() - started
+
+    tracemalloc.start()
+    started = perf_counter()
+    await app(scope, receive, send)
+    total = perf_counter() - started
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    return {
+        'peak': peak / 2**20,
+        'ttfb': (first_byte or total) * 1000,
+        'total': total * 1000,
+    }
+
+
+async def run(sizes: list[int]):
+    engine = bench_engine()
+    print(
+        f'{"todos":>10} {"endpoint":>10} {"peak MiB":>10} '
+        f'{"ttfb ms":>10} {"total ms":>10}'
+    )
+
+    async with app_client() as client:
+        for size in sizes:
+            user = await seed_user(engine, size)
+            try:
+                headers = await auth_headers(client, user)
+                for name, path, query in (
+                    ('list', '/todos/', ''),
+                    ('ndjson', '/todos/export', ''),
+                    ('csv', '/todos/export', 'format=csv'),
+                ):
+                    result = await measure(path, query, headers)
+                    print(
+                        f'{size:>10} {name:>10} {result["peak"]:>10.1f} '
+                        f'{result["ttfb"]:>10.1f} {result["total"]:>10.1f}'
+                    )
+            finally:
+                await drop_user(engine, user)
+
+    await engine.dispose()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        '--sizes', type=int, nargs='+', default=[10_000, 100_000, 1_000_000]
+    )
+    args = parser.parse_args()
+
+    asyncio.run(run(args.sizes))
+
+
+if __name__ == '__main__':
+    main()
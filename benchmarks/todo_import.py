@@ -0,0 +1,99 @@
+"""Import throughput (rows/sec) of `POST /todos/import` (COPY) vs the
+ORM paths: one `POST /todos/` per row and `POST /todos/bulk` batches.
+
+    python -m benchmarks.todo_import --rows 100000 --single-rows 2000
+"""
+
+import argparse
+import asyncio
+import json
+from time import perf_counter
+
+from benchmarks.common import (
+    app_client,
+    auth_headers,
+    bench_engine,
+    drop_user,
+    seed_user,
+)
+
+
+def new_todo(n: int) -> dict:
+    return {'title': f'todo {n}', 'description': 'imported', 'state': 'todo'}
+
+
+async def ndjson_body(rows: int, lines_per_chunk: int = 1_000):
+    """Generate the upload lazily so the client side stays small too."""
+    for start in range(0, rows, lines_per_chunk):
+        yield ''.join(
+            json.dumps(new_todo(n)) + '\n'
+            for n in range(start, min(start + lines_per_chunk, rows))
+        ).encode()
+
+
+async def rate(coro_factory, rows: int) -> float:
+    started = perf_counter()
+    await coro_factory()
+    return rows / (perf_counter() - started)
+
+
+async def run(rows: int, single_rows: int, batch: int):
+    engine = bench_engine()
+    user = await seed_user(engine)
+
+    async def single():
+        for n in range(single_rows):
+            response = await client.post(
+                '/todos/', json=new_todo(n), headers=headers
+            )
+            response.raise_for_status()
+
+    async def bulk():
+        for start in range(0, rows, batch):
+            response = await client.post(
+                '/todos/bulk',
+                json={
+                    'todos': [
+                        new_todo(n)
+                        for n in range(start, min(start + batch, rows))
+                    ]
+                },
+                headers=headers,
+            )
+            response.raise_for_status()
+
+    async def copy():
+        response = await client.post(
+            '/todos/import', content=ndjson_body(rows), headers=headers
+        )
+        response.raise_for_status()
+        assert response.json()['accepted'] == rows
+
+    try:
+        async with app_client() as client:
+            headers = await auth_headers(client, user)
+            print(f'{"path":>8} {"rows":>10} {"rows/s":>12}')
+            for name, factory, count in (
+                ('single', single, single_rows),
+                ('bulk', bulk, rows),
+                ('copy', copy, rows),
+            ):
+                result = await rate(factory, count)
+                print(f'{name:>8} {count:>10} {result:>12.0f}')
+    finally:
+        await drop_user(engine, user)
+        await engine.dispose()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--rows', type=int, default=100_000)
+    parser.add_argument('--single-rows', type=int, default=2_000)
+    parser.add_argument('--batch', type=int, default=1_000)
+    args = parser.parse_args()
+
+    asyncio.run(run(args.rows, args.single_rows, args.batch))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,127 @@
+"""EXPLAIN plans and latencies of the `/todos` query patterns with and
+without the indexes from migration b7e1c2d9f4a3.
+
+The "before" numbers are taken inside a transaction that drops the
+indexes and is rolled back afterwards, so the schema is left untouched.
+That transaction holds an exclusive lock on `todos`: run this against a
+benchmark database, never production.
+
+    python -m benchmarks.todo_indexes --todos 500000 --output indexes.json
+"""
+
+import argparse
+import asyncio
+import json
+from time import perf_counter
+
+from sqlalchemy import text
+
+from benchmarks.common import bench_engine, drop_user, seed_user
+
+INDEXES = (
+    'ix_todos_user_id_id',
+    'ix_todos_user_id_state_id',
+    'ix_todos_title_trgm',
+    'ix_todos_description_trgm',
+)
+
+QUERIES = {
+    'list': (
+        'SELECT * FROM todos WHERE user_id = :user_id ORDER BY id LIMIT 50'
+    ),
+    'list_by_state': (
+        'SELECT * FROM todos WHERE user_id = :user_id '
+        "AND state = 'done' ORDER BY id LIMIT 50"
+    ),
+    'cursor_page': (
+        'SELECT * FROM todos WHERE user_id = :user_id '
+        'AND id > :after ORDER BY id LIMIT 50'
+    ),
+    'title_search': (
+        "SELECT * FROM todos WHERE user_id = :user_id AND title ILIKE '%milk%'"
+    ),
+    'description_search': (
+        'SELECT * FROM todos WHERE user_id = :user_id '
+        "AND description ILIKE '%report%'"
+    ),
+}
+
+
+async def measure(conn, params: dict, repeat: int) -> dict:
+    results = {}
+    for name, sql in QUERIES.items():
+        plan = await conn.scalars(
+            text(f'EXPLAIN (ANALYZE, BUFFERS) {sql}'), params
+        )
+
+        samples = []
+        for _ in range(repeat):
+            started = perf_counter()
+            (await conn.execute(text(sql), params)).all()
+            samples.append((perf_counter() - started) * 1000)
+        samples.sort()
+
+        results[name] = {
+            'p50_ms': samples[len(samples) // 2],
+            'max_ms': samples[-1],
+            'plan': list(plan),
+        }
+    return results
+
+
+async def run(todos: int, other_users: int, repeat: int) -> dict:
+    engine = bench_engine()
+    user = await seed_user(engine, todos)
+    noise = [
+        await seed_user(engine, todos // max(other_users, 1))
+        for _ in range(other_users)
+    ]
+
+    try:
+        async with engine.connect() as conn:
+            await conn.execute(text('ANALYZE todos'))
+            after_id = await conn.scalar(
+                text('SELECT min(id) + :half FROM todos WHERE user_id = :uid'),
+                {'half': todos // 2, 'uid': user.id},
+            )
+            params = {'user_id': user.id, 'after': after_id}
+
+            after = await measure(conn, params, repeat)
+            await conn.rollback()
+
+            for index in INDEXES:
+                await conn.execute(text(f'DROP INDEX IF EXISTS {index}'))
+            before = await measure(conn, params, repeat)
+            await conn.rollback()
+    finally:
+        for seeded in (user, *noise):
+            await drop_user(engine, seeded)
+        await engine.dispose()
+
+    return {'todos': todos, 'before': before, 'after': after}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--todos', type=int, default=200_000)
+    parser.add_argument('--other-users', type=int, default=4)
+    parser.add_argument('--repeat', type=int, default=20)
+    parser.add_argument('--output', help='write the full report as JSON')
+    args = parser.parse_args()
+
+    report = asyncio.run(run(args.todos, args.other_users, args.repeat))
+
+    print(f'{"query":<20} {"before p50":>12} {"after p50":>12}  (ms)')
+    for name in QUERIES:
+        print(
+            f'{name:<20} {report["before"][name]["p50_ms"]:>12.2f} '
+            f'{report["after"][name]["p50_ms"]:>12.2f}'
+        )
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as output:
+            json.dump(report, output, indent=2)
+
+
+if __name__ == '__main__':
+    main()
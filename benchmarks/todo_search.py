@@ -0,0 +1,65 @@
+"""Latency of `GET /todos/` full-text search (`q=`) vs the `ilike`
+title/description filters, at several account sizes.
+
+    python -m benchmarks.todo_search --sizes 10000 100000 1000000
+"""
+
+import argparse
+import asyncio
+
+from benchmarks.common import (
+    app_client,
+    auth_headers,
+    bench_engine,
+    drop_user,
+    seed_user,
+    timed,
+)
+
+
+async def run(sizes: list[int], term: str, limit: int, repeat: int):
+    engine = bench_engine()
+    print(f'{"todos":>10} {"ilike p50":>12} {"q p50":>12}  (ms)')
+
+    async with app_client() as client:
+        for size in sizes:
+            user = await seed_user(engine, size)
+            try:
+                headers = await auth_headers(client, user)
+                ilike = await timed(
+                    lambda: client.get(
+                        f'/todos/?title={term}&limit={limit}',
+                        headers=headers,
+                    ),
+                    repeat,
+                )
+                search = await timed(
+                    lambda: client.get(
+                        f'/todos/?q={term}&limit={limit}', headers=headers
+                    ),
+                    repeat,
+                )
+                print(
+                    f'{size:>10} {ilike["p50"]:>12.2f} {search["p50"]:>12.2f}'
+                )
+            finally:
+                await drop_user(engine, user)
+
+    await engine.dispose()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        '--sizes', type=int, nargs='+', default=[10_000, 100_000, 1_000_000]
+    )
+    parser.add_argument('--term', default='flight')
+    parser.add_argument('--limit', type=int, default=50)
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args()
+
+    asyncio.run(run(args.sizes, args.term, args.limit, args.repeat))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,76 @@
+"""`GET /todos/stats` (counter table) against the per-state `GROUP BY`
+scan it replaces, for one user owning `--todos` rows, plus the cost of a
+full reconciliation pass.
+
+    python -m benchmarks.todo_stats --todos 1000000
+"""
+
+import argparse
+import asyncio
+from time import perf_counter
+
+from sqlalchemy import func, select
+
+from benchmarks.common import (
+    app_client,
+    auth_headers,
+    bench_engine,
+    drop_user,
+    seed_user,
+    timed,
+)
+from fast_zero.models import Todo
+from fast_zero.todo_stats import RECONCILE_LOCK, RECONCILE_TODO_COUNTS
+
+
+async def run(todos: int, repeat: int):
+    engine = bench_engine()
+    user = await seed_user(engine, todos)
+    scan = (
+        select(Todo.state, func.count())
+        .where(Todo.user_id == user.id)
+        .group_by(Todo.state)
+    )
+
+    try:
+        async with app_client() as client, engine.connect() as conn:
+            headers = await auth_headers(client, user)
+
+            async def group_by():
+                return (await conn.execute(scan)).all()
+
+            results = {
+                'counters': await timed(
+                    lambda: client.get('/todos/stats', headers=headers),
+                    repeat,
+                ),
+                'group by': await timed(group_by, max(repeat // 10, 2)),
+            }
+
+            started = perf_counter()
+            await conn.scalar(RECONCILE_LOCK)
+            repaired = len((await conn.execute(RECONCILE_TODO_COUNTS)).all())
+            await conn.commit()
+            reconcile = perf_counter() - started
+    finally:
+        await drop_user(engine, user)
+        await engine.dispose()
+
+    print(f'{todos} todos')
+    print(f'{"read":>9} {"p50":>9} {"p95":>9}  (ms)')
+    for name, result in results.items():
+        print(f'{name:>9} {result["p50"]:>9.2f} {result["p95"]:>9.2f}')
+    print(f'reconcile: {reconcile:.2f} s, {repaired} counters repaired')
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--todos', type=int, default=1_000_000)
+    parser.add_argument('--repeat', type=int, default=200)
+    args = parser.parse_args()
+
+    asyncio.run(run(args.todos, args.repeat))
+
+
+if __name__ == '__main__':
+    main()
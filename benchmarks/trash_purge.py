@@ -0,0 +1,99 @@
+"""Trash purge throughput per batch size, and the latency a concurrent
+`GET /todos/` poll sees while the purger runs.
+
+    python -m benchmarks.trash_purge --todos 100000 --batch-size 500 5000
+"""
+
+import argparse
+import asyncio
+from datetime import timedelta
+from time import perf_counter
+
+from sqlalchemy import func, update
+
+from benchmarks.common import (
+    app_client,
+    auth_headers,
+    bench_engine,
+    drop_user,
+    seed_user,
+    timed,
+)
+from fast_zero.database import open_session
+from fast_zero.models import Todo, TodoState
+from fast_zero.purger import TrashPurger
+
+
+async def expire_all(engine, user):
+    async with engine.begin() as conn:
+        await conn.execute(
+            update(Todo)
+            .where(Todo.user_id == user.id)
+            .values(
+                state=TodoState.trash,
+                updated_at=func.now() - timedelta(days=365),
+            )
+        )
+
+
+async def run(todos: int, batch_sizes: list[int], pause: float, limit: int):
+    engine = bench_engine()
+    reader = await seed_user(engine, 1_000)
+
+    print(f'{"batch":>6} {"rows/s":>9} {"poll p50":>9} {"poll p95":>9}')
+    try:
+        async with app_client() as client:
+            headers = await auth_headers(client, reader)
+
+            async def poll():
+                return await client.get(
+                    f'/todos/?limit={limit}', headers=headers
+                )
+
+            for batch_size in batch_sizes:
+                owner = await seed_user(engine, todos)
+                await expire_all(engine, owner)
+                purger = TrashPurger(
+                    open_session,
+                    retention=timedelta(days=30),
+                    batch_size=batch_size,
+                    max_batches=todos // batch_size + 1,
+                    pause=pause,
+                    interval=0,
+                )
+
+                started = perf_counter()
+                purge = asyncio.create_task(purger.purge())
+                polls = []
+                while not purge.done():
+                    polls.append(await timed(poll, 10))
+                purged = await purge
+                elapsed = perf_counter() - started
+
+                p50 = max((p['p50'] for p in polls), default=0.0)
+                p95 = max((p['p95'] for p in polls), default=0.0)
+                print(
+                    f'{batch_size:>6} {purged / elapsed:>9.0f} '
+                    f'{p50:>9.2f} {p95:>9.2f}'
+                )
+                await drop_user(engine, owner)
+    finally:
+        await drop_user(engine, reader)
+        await engine.dispose()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--todos', type=int, default=100_000)
+    parser.add_argument(
+        '--batch-size', type=int, nargs='+', default=[100, 500, 5_000]
+    )
+    parser.add_argument('--pause', type=float, default=0.0)
+    parser.add_argument('--limit', type=int, default=100)
+    args = parser.parse_args()
+
+    asyncio.run(run(args.todos, args.batch_size, args.pause, args.limit))
+
+
+if __name__ == '__main__':
+    main()
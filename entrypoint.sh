@@ -1,7 +1,8 @@
 #!/bin/sh
 
-# Executa as migrações do banco de dados
-poetry run alembic upgrade head
+# Executa as migrações do banco de dados (não faz nada se já estiver no head)
+python -m fast_zero.migrate
 
-# Inicia a aplicação
-poetry run uvicorn --host 0.0.0.0 --port 8000 fast_zero.app:app
\ No newline at end of file
+# Inicia a aplicação (um worker por CPU, veja fast_zero/server.py); exec:
+# o supervisor recebe os sinais de parada direto
+exec python -m fast_zero.server
@@ -1,17 +1,53 @@
+from contextlib import asynccontextmanager
 from http import HTTPStatus
 
 from fastapi import FastAPI
 from fastapi.responses import HTMLResponse
 
-from fast_zero.routers import auth, health, todos, users
+from fast_zero.database import dispose_engines, replica_monitor
+from fast_zero.hashing import hashing_pool
+from fast_zero.prometheus import PrometheusMiddleware, snapshot_writer
+from fast_zero.purger import trash_purger
+from fast_zero.readiness import readiness_probe
+from fast_zero.routers import auth, health, metrics, todos, users
 from fast_zero.schemas import Message
+from fast_zero.settings import get_settings
+from fast_zero.timing import ServerTimingMiddleware, instrument_routes
+from fast_zero.todo_stats import todo_count_reconciler
+from fast_zero.warmup import warm_up
 
-app = FastAPI()
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    if settings.STARTUP_WARMUP:
+        await warm_up()
+    # Réplicas só entram em rotação depois de uma medição de atraso
+    if replica_monitor.interval > 0:
+        await replica_monitor.run()
+    replica_monitor.start()
+    readiness_probe.start()
+    trash_purger.start()
+    todo_count_reconciler.start()
+    snapshot_writer.start()
+    yield
+    await snapshot_writer.stop()
+    await todo_count_reconciler.stop()
+    await trash_purger.stop()
+    await readiness_probe.stop()
+    await replica_monitor.stop()
+    hashing_pool.shutdown()
+    await dispose_engines()
+
+
+settings = get_settings()
+
+app = FastAPI(lifespan=lifespan)
 
 app.include_router(users.router)
 app.include_router(auth.router)
 app.include_router(todos.router)
 app.include_router(health.router)
+app.include_router(metrics.router)
 
 
 @app.get('/', status_code=HTTPStatus.OK, response_model=Message)
@@ -31,3 +67,12 @@ def ola_mundo():
       </body>
     </html>
     """
+
+
+# Depois de registrar todas as rotas
+if settings.SERVER_TIMING:
+    instrument_routes(app)
+    app.add_middleware(ServerTimingMiddleware)
+
+if settings.REQUEST_METRICS:
+    app.add_middleware(PrometheusMiddleware)
@@ -0,0 +1,220 @@
+"""Small caching layer with pluggable backends.
+
+`Cache` is the front-end used by the application: it applies the TTL and
+keeps hit/miss counters. Storage is delegated to a `CacheBackend`, either
+the process-local `MemoryBackend` (TTL + LRU, bounded by entry count) or a
+shared store such as `RedisBackend`, so several workers can stay coherent.
+`ResponseCache` builds on the same backends to cache whole response
+bodies.
+"""
+
+from __future__ import annotations
+
+import json
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from time import monotonic, perf_counter
+from typing import Any
+from uuid import uuid4
+
+
+class CacheBackend(ABC):
+    @abstractmethod
+    async def get(self, key: str) -> Any | None: ...
+
+    @abstractmethod
+    async def set(self, key: str, value: Any, ttl: float) -> None: ...
+
+    @abstractmethod
+    async def delete(self, key: str) -> None: ...
+
+    @abstractmethod
+    async def clear(self) -> None: ...
+
+
+class MemoryBackend(CacheBackend):
+    """Process-local store with per-entry expiry and LRU eviction."""
+
+    def __init__(self, maxsize: int = 1024, clock=monotonic):
+        self.maxsize = maxsize
+        self._clock = clock
+        self._data: OrderedDict[str, tuple[float, Any]] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    async def get(self, key: str) -> Any | None:
+        item = self._data.get(key)
+        if item is None:
+            return None
+
+        expires_at, value = item
+        if expires_at <= self._clock():
+            del self._data[key]
+            return None
+
+        self._data.move_to_end(key)
+        return value
+
+    async def set(self, key: str, value: Any, ttl: float) -> None:
+        self._data[key] = (self._clock() + ttl, value)
+        self._data.move_to_end(key)
+
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    async def delete(self, key: str) -> None:
+        self._data.pop(key, None)
+
+    async def clear(self) -> None:
+        self._data.clear()
+
+
+class RedisBackend(CacheBackend):
+    """Shared store over an asyncio Redis client.
+
+    Any client exposing `get`, `set(..., px=...)`, `delete` and
+    `scan_iter` coroutines works (e.g. `redis.asyncio.Redis`). Values are
+    stored as JSON, so they must be JSON serializable.
+    """
+
+    def __init__(self, client, prefix: str = 'fast_zero:'):
+        self.client = client
+        self.prefix = prefix
+
+    async def get(self, key: str) -> Any | None:
+        raw = await self.client.get(self.prefix + key)
+        return None if raw is None else json.loads(raw)
+
+    async def set(self, key: str, value: Any, ttl: float) -> None:
+        await self.client.set(
+            self.prefix + key, json.dumps(value), px=int(ttl * 1000)
+        )
+
+    async def delete(self, key: str) -> None:
+        await self.client.delete(self.prefix + key)
+
+    async def clear(self) -> None:
+        async for key in self.client.scan_iter(match=self.prefix + '*'):
+            await self.client.delete(key)
+
+
+class Cache:
+    """TTL cache front-end with hit/miss counters.
+
+    A non-positive `ttl` disables the cache: every lookup is a miss and
+    nothing is stored.
+    """
+
+    def __init__(self, backend: CacheBackend, ttl: float):
+        self.backend = backend
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+
+    async def get(self, key: str) -> Any | None:
+        value = None
+        if self.ttl > 0:
+            value = await self.backend.get(key)
+
+        if value is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return value
+
+    async def set(
+        self, key: str, value: Any, ttl: float | None = None
+    ) -> None:
+        """Store `value`, optionally expiring sooner than the default TTL."""
+        ttl = self.ttl if ttl is None else min(ttl, self.ttl)
+        if ttl > 0:
+            await self.backend.set(key, value, ttl)
+
+    async def invalidate(self, key: str) -> None:
+        await self.backend.delete(key)
+
+    async def clear(self) -> None:
+        await self.backend.clear()
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_ratio': self.hits / lookups if lookups else 0.0,
+        }
+
+
+class ResponseCache:
+    """Caches route results under invalidatable scopes.
+
+    Every key embeds the current generation of its scope (e.g. one user's
+    todos), kept in the backend next to the entries. `invalidate` drops
+    the generation, so the next read picks a fresh one and every entry of
+    that scope becomes unreachable at once. Losing a generation (expiry,
+    eviction) only ever causes misses, never stale reads, so this works
+    with any `CacheBackend`.
+
+    Per route it counts hits and misses and how long misses took to load,
+    which estimates the database time the hits saved.
+    """
+
+    def __init__(self, backend: CacheBackend, ttl: float):
+        self.backend = backend
+        self.ttl = ttl
+        self.routes: dict[str, dict] = {}
+
+    @property
+    def enabled(self) -> bool:
+        return self.ttl > 0
+
+    async def _generation(self, scope: str) -> str:
+        key = f'generation:{scope}'
+        generation = await self.backend.get(key)
+        if generation is None:
+            generation = uuid4().hex
+            await self.backend.set(key, generation, self.ttl)
+        return generation
+
+    async def get_or_load(self, route: str, scope: str, params: str, load):
+        """The cached value for `route` with `params`, or the result of
+        awaiting `load()`, which is then stored. Values must be JSON
+        serializable so any backend can hold them."""
+        stats = self.routes.setdefault(
+            route, {'hits': 0, 'misses': 0, 'load_seconds': 0.0}
+        )
+        key = f'{route}:{scope}:{await self._generation(scope)}:{params}'
+
+        value = await self.backend.get(key)
+        if value is not None:
+            stats['hits'] += 1
+            return value
+
+        started = perf_counter()
+        value = await load()
+        stats['misses'] += 1
+        stats['load_seconds'] += perf_counter() - started
+
+        await self.backend.set(key, value, self.ttl)
+        return value
+
+    async def invalidate(self, *scopes: str) -> None:
+        for scope in scopes:
+            await self.backend.delete(f'generation:{scope}')
+
+    async def clear(self) -> None:
+        await self.backend.clear()
+
+    def stats(self) -> dict:
+        report = {}
+        for route, stats in self.routes.items():
+            lookups = stats['hits'] + stats['misses']
+            per_load = stats['load_seconds'] / (stats['misses'] or 1)
+            report[route] = {
+                'hits': stats['hits'],
+                'misses': stats['misses'],
+                'hit_ratio': stats['hits'] / lookups if lookups else 0.0,
+                'saved_seconds': stats['hits'] * per_load,
+            }
+        return report
@@ -1,11 +1,426 @@
-from sqlalchemy import create_engine
+import asyncio
+import logging
+from hashlib import blake2b
+from itertools import count
+from time import perf_counter
+
+from fastapi import Request
+from sqlalchemy import create_engine, event, text
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    AsyncSession,
+    create_async_engine,
+)
 from sqlalchemy.orm import Session
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+from starlette.concurrency import run_in_threadpool
+
+from fast_zero.cache import Cache, MemoryBackend
+from fast_zero.jobs import PeriodicJob
+from fast_zero.metrics import pool_metrics
+from fast_zero.settings import Settings, get_settings
+from fast_zero.timing import current
+
+logger = logging.getLogger(__name__)
+settings = get_settings()
+
+
+class _TimedPoolMixin:
+    """Records how long callers wait to get a connection from the pool."""
+
+    def connect(self):
+        started = perf_counter()
+        try:
+            return super().connect()
+        finally:
+            pool_metrics.wait.observe(perf_counter() - started)
+
+
+class TimedQueuePool(_TimedPoolMixin, QueuePool):
+    pass
+
+
+class TimedAsyncQueuePool(_TimedPoolMixin, AsyncAdaptedQueuePool):
+    pass
+
+
+def pool_options(settings: Settings) -> dict:
+    """Translate the `DATABASE_POOL_*` settings into engine arguments."""
+    return {
+        'pool_size': settings.DATABASE_POOL_SIZE,
+        'max_overflow': settings.DATABASE_MAX_OVERFLOW,
+        'pool_timeout': settings.DATABASE_POOL_TIMEOUT,
+        'pool_recycle': settings.DATABASE_POOL_RECYCLE,
+        'pool_pre_ping': settings.DATABASE_POOL_PRE_PING,
+        'pool_use_lifo': settings.DATABASE_POOL_USE_LIFO,
+    }
+
+
+def instrument_pool(sync_engine) -> None:
+    """Attach the pool event listeners that feed `pool_metrics`."""
+
+    @event.listens_for(sync_engine, 'do_connect')
+    def _connect_started(dialect, conn_rec, cargs, cparams):
+        conn_rec.info['connect_started'] = perf_counter()
+
+    @event.listens_for(sync_engine, 'connect')
+    def _connected(dbapi_connection, connection_record):
+        pool_metrics.incr('connects')
+        started = connection_record.info.pop('connect_started', None)
+        if started is not None:
+            pool_metrics.connect_latency.observe(perf_counter() - started)
+
+    @event.listens_for(sync_engine, 'checkout')
+    def _checkout(dbapi_connection, connection_record, connection_proxy):
+        pool_metrics.incr('checkouts')
+
+    @event.listens_for(sync_engine, 'invalidate')
+    def _invalidate(dbapi_connection, connection_record, exception):
+        pool_metrics.incr('invalidations')
+
+
+def instrument_queries(sync_engine) -> None:
+    """Count and time statements into the current request's timings."""
+
+    @event.listens_for(sync_engine, 'before_cursor_execute')
+    def _query_started(conn, *args):
+        if current() is not None:
+            conn.info.setdefault('query_started', []).append(perf_counter())
+
+    @event.listens_for(sync_engine, 'after_cursor_execute')
+    def _query_done(conn, *args):
+        timings = current()
+        started = conn.info.get('query_started')
+        if timings is not None and started:
+            timings.queries += 1
+            timings.add('db', perf_counter() - started.pop())
+
+
+def make_engine(url: str):
+    """An instrumented engine, async or sync per `DATABASE_ASYNC`."""
+    if settings.DATABASE_ASYNC:
+        new_engine = create_async_engine(
+            url, poolclass=TimedAsyncQueuePool, **pool_options(settings)
+        )
+        sync_engine = new_engine.sync_engine
+    else:
+        new_engine = create_engine(
+            url, poolclass=TimedQueuePool, **pool_options(settings)
+        )
+        sync_engine = new_engine
+
+    instrument_pool(sync_engine)
+    if settings.SERVER_TIMING:
+        instrument_queries(sync_engine)
+    return new_engine
+
+
+engine = make_engine(settings.DATABASE_URL)
+
+
+def pool_status() -> dict:
+    """Current occupancy of the engine pool plus the event metrics."""
+    pool = engine.pool
+
+    return {
+        'pool_size': pool.size(),
+        'max_overflow': settings.DATABASE_MAX_OVERFLOW,
+        'max_connections': pool.size() + settings.DATABASE_MAX_OVERFLOW,
+        'checked_out': pool.checkedout(),
+        'checked_in': pool.checkedin(),
+        'overflow': max(pool.overflow(), 0),
+        'connects': pool_metrics.connects,
+        'checkouts': pool_metrics.checkouts,
+        'invalidations': pool_metrics.invalidations,
+        'wait_seconds': pool_metrics.wait.snapshot(),
+        'connect_seconds': pool_metrics.connect_latency.snapshot(),
+    }
+
+
+class ThreadedResult:
+    """Async iteration over a streaming sync `Result`, one partition
+    (`yield_per` rows) per threadpool hop."""
+
+    def __init__(self, result):
+        self.result = result
+
+    async def partitions(self, size: int | None = None):
+        partitions = self.result.partitions(size)
+        while rows := await run_in_threadpool(next, partitions, None):
+            yield rows
+
+
+class ThreadedSession:
+    """Awaitable facade over a blocking `Session`.
+
+    Used when `DATABASE_ASYNC` is off, so the async handlers keep a single
+    code path. Every round trip is pushed to Starlette's threadpool, which
+    is exactly how the sync handlers used to hold a worker per query.
+    """
+
+    def __init__(self, session: Session):
+        self.sync_session = session
+
+    def add(self, instance):
+        self.sync_session.add(instance)
+
+    def add_all(self, instances):
+        self.sync_session.add_all(instances)
+
+    async def execute(self, *args, **kwargs):
+        return await run_in_threadpool(
+            self.sync_session.execute, *args, **kwargs
+        )
+
+    async def scalar(self, *args, **kwargs):
+        return await run_in_threadpool(
+            self.sync_session.scalar, *args, **kwargs
+        )
+
+    async def scalars(self, *args, **kwargs):
+        return await run_in_threadpool(
+            self.sync_session.scalars, *args, **kwargs
+        )
+
+    async def stream(self, *args, **kwargs):
+        result = await run_in_threadpool(
+            self.sync_session.execute, *args, **kwargs
+        )
+        return ThreadedResult(result)
+
+    async def merge(self, instance, *args, **kwargs):
+        return await run_in_threadpool(
+            self.sync_session.merge, instance, *args, **kwargs
+        )
+
+    async def delete(self, instance):
+        await run_in_threadpool(self.sync_session.delete, instance)
 
-from fast_zero.settings import Settings
+    async def refresh(self, instance, *args, **kwargs):
+        await run_in_threadpool(
+            self.sync_session.refresh, instance, *args, **kwargs
+        )
 
-engine = create_engine(Settings().DATABASE_URL)
+    async def flush(self):
+        await run_in_threadpool(self.sync_session.flush)
+
+    async def commit(self):
+        await run_in_threadpool(self.sync_session.commit)
+
+    async def rollback(self):
+        await run_in_threadpool(self.sync_session.rollback)
+
+    async def close(self):
+        await run_in_threadpool(self.sync_session.close)
+
+    async def run_sync(self, fn, *args, **kwargs):
+        return await run_in_threadpool(fn, self.sync_session, *args, **kwargs)
+
+
+def open_session(bind=None) -> AsyncSession | ThreadedSession:
+    """A new session on `bind` (default: the primary); the caller closes
+    it."""
+    bind = engine if bind is None else bind
+    if settings.DATABASE_ASYNC:
+        return AsyncSession(bind, expire_on_commit=False)
+    return ThreadedSession(Session(bind, expire_on_commit=False))
+
+
+async def warm_pool(connections: int) -> None:
+    """Open up to `connections` pool connections ahead of traffic."""
+    # Acima de pool_size a conexão seria descartada ao voltar para o pool
+    sessions = [
+        open_session() for _ in range(min(connections, engine.pool.size()))
+    ]
+    try:
+        await asyncio.gather(
+            *(session.execute(text('SELECT 1')) for session in sessions)
+        )
+    finally:
+        for session in sessions:
+            await session.close()
+
+
+# Atraso de replicação em segundos; 0 fora de recuperação (não é réplica)
+# e quando tudo o que chegou já foi aplicado
+REPLICA_LAG = text("""
+SELECT CASE
+    WHEN NOT pg_is_in_recovery() THEN 0
+    WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+    ELSE coalesce(
+        extract(epoch FROM now() - pg_last_xact_replay_timestamp())::float8,
+        'Infinity'
+    )
+END
+""")
+
+
+async def measure_lag(bind) -> float:
+    if isinstance(bind, AsyncEngine):
+        async with bind.connect() as conn:
+            return await conn.scalar(REPLICA_LAG)
+
+    def measure():
+        with bind.connect() as conn:
+            return conn.scalar(REPLICA_LAG)
+
+    return await run_in_threadpool(measure)
+
+
+class ReplicaSet:
+    """Read replicas in round-robin, minus the ones lagging too far.
+
+    A replica enters rotation only after a check measured its lag under
+    `max_lag`; a failed or timed out check takes it out.
+    """
+
+    def __init__(self, engines, max_lag: float, timeout: float):
+        self.engines = list(engines)
+        self.max_lag = max_lag
+        self.timeout = timeout
+        self.lag: list[float | None] = [None] * len(self.engines)
+        self._healthy = []
+        self._turn = count()
+
+    def pick(self):
+        """The next replica in rotation, or None when there is none."""
+        healthy = self._healthy
+        if not healthy:
+            return None
+        return healthy[next(self._turn) % len(healthy)]
+
+    async def check(self):
+        for index, replica in enumerate(self.engines):
+            try:
+                lag = await asyncio.wait_for(
+                    measure_lag(replica), self.timeout
+                )
+            except Exception:
+                logger.warning('Replica %d check failed', index, exc_info=True)
+                lag = None
+            self.lag[index] = lag
+
+        self._healthy = [
+            replica
+            for replica, lag in zip(self.engines, self.lag)
+            if lag is not None and lag <= self.max_lag
+        ]
+
+    def status(self) -> list[dict]:
+        return [
+            {
+                'replica': index,
+                'lag_seconds': lag,
+                'in_rotation': replica in self._healthy,
+            }
+            for index, (replica, lag) in enumerate(zip(self.engines, self.lag))
+        ]
+
+
+async def dispose_engines() -> None:
+    """Close the pooled connections of the primary and the replicas."""
+    for bound in (engine, *replicas.engines):
+        if isinstance(bound, AsyncEngine):
+            await bound.dispose()
+        else:
+            bound.dispose()
+
+
+class ReplicaMonitor(PeriodicJob):
+    name = 'Replica lag check'
+
+    def __init__(self, replicas: ReplicaSet, interval: float):
+        super().__init__(interval if replicas.engines else 0)
+        self.replicas = replicas
+
+    async def run(self):
+        await self.replicas.check()
+
+
+@event.listens_for(Session, 'after_commit')
+def _committed(session):
+    session.info['committed'] = True
+
+
+class SessionRouter:
+    """Writes go to the primary, reads to a replica in rotation.
+
+    After a commit, reads sent with the same credentials (the
+    `Authorization` header) stay on the primary for `recent_writers.ttl`
+    seconds, so a client always reads its own writes. The default store
+    is per process; give `recent_writers` a shared backend when several
+    workers serve the same clients.
+    """
+
+    def __init__(self, primary, replicas: ReplicaSet, recent_writers: Cache):
+        self.primary = primary
+        self.replicas = replicas
+        self.recent_writers = recent_writers
+
+    @staticmethod
+    def _writer(request: Request) -> str | None:
+        credentials = request.headers.get('authorization')
+        if not credentials:
+            return None
+        return blake2b(credentials.encode(), digest_size=16).hexdigest()
+
+    async def track_write(self, request: Request, session) -> None:
+        """Pin the request's client to the primary if `session` committed."""
+        if session.sync_session.info.pop('committed', False):
+            writer = self._writer(request)
+            if writer is not None:
+                await self.recent_writers.set(writer, True)
+
+    async def read_session(self, request: Request):
+        bind = None
+        if self.replicas.engines:
+            writer = self._writer(request)
+            if writer is None or not await self.recent_writers.get(writer):
+                bind = self.replicas.pick()
+        session = open_session(bind or self.primary)
+        session.sync_session.info['replica'] = bind is not None
+        return session
+
+
+def read_source(session) -> str:
+    """Where a read session's queries go: 'replica' or 'primary'.
+
+    Part of the response cache key of routes read from a replica, so a
+    body loaded from a lagging replica is never served to a client that
+    was pinned to the primary to read its own writes.
+    """
+    return 'replica' if session.sync_session.info.get('replica') else 'primary'
+
+
+replicas = ReplicaSet(
+    [make_engine(url) for url in settings.DATABASE_REPLICA_URLS],
+    max_lag=settings.REPLICA_MAX_LAG,
+    timeout=settings.REPLICA_CHECK_TIMEOUT,
+)
+replica_monitor = ReplicaMonitor(replicas, settings.REPLICA_CHECK_INTERVAL)
+session_router = SessionRouter(
+    engine,
+    replicas,
+    Cache(
+        MemoryBackend(maxsize=settings.READ_YOUR_WRITES_MAXSIZE),
+        ttl=settings.READ_YOUR_WRITES_SECONDS,
+    ),
+)
+
+
+async def get_session(request: Request):  # pragma: no cover
+    session = open_session()
+    try:
+        yield session
+    finally:
+        await session.close()
+    await session_router.track_write(request, session)
 
 
-def get_session():  # pragma: no cover
-    with Session(engine) as session:
+async def get_read_session(request: Request):  # pragma: no cover
+    """Session for read-only handlers: a replica when one can serve."""
+    session = await session_router.read_session(request)
+    try:
         yield session
+    finally:
+        await session.close()
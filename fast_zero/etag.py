@@ -0,0 +1,72 @@
+"""ETags and conditional GET (`If-None-Match` -> 304).
+
+Tags are built from cheap change markers instead of the response body:
+`users.updated_at` for a user, `todos.updated_at` for a todo and
+`users.todos_version` for a user's todo collection. The latter is bumped
+by statement-level triggers on `todos`, so every write path (ORM, bulk
+statements, COPY) moves it and an unchanged poll costs one primary-key
+lookup.
+"""
+
+from hashlib import blake2b
+from http import HTTPStatus
+
+from fastapi import Request, Response
+
+# Mantido em sincronia com a migração d5a9e3b1c7f4
+TODOS_VERSION_FUNCTION = """
+CREATE OR REPLACE FUNCTION bump_todos_version() RETURNS trigger AS $$
+BEGIN
+    IF TG_OP = 'DELETE' THEN
+        UPDATE users SET todos_version = todos_version + 1
+        WHERE id IN (SELECT DISTINCT user_id FROM old_rows);
+    ELSE
+        UPDATE users SET todos_version = todos_version + 1
+        WHERE id IN (SELECT DISTINCT user_id FROM new_rows);
+    END IF;
+    RETURN NULL;
+END
+$$ LANGUAGE plpgsql
+"""
+
+# Um UPDATE em users por comando (não por linha): um COPY de milhões de
+# linhas incrementa a versão uma vez só
+TODOS_VERSION_TRIGGERS = tuple(
+    f'CREATE TRIGGER todos_version_{event.lower()} AFTER {event} ON todos '
+    f'REFERENCING {table} TABLE AS {alias} '
+    'FOR EACH STATEMENT EXECUTE FUNCTION bump_todos_version()'
+    for event, table, alias in (
+        ('INSERT', 'NEW', 'new_rows'),
+        ('UPDATE', 'NEW', 'new_rows'),
+        ('DELETE', 'OLD', 'old_rows'),
+    )
+)
+
+
+def make_etag(*parts) -> str:
+    """A weak ETag over `parts`: equal parts mean an equivalent body."""
+    raw = '|'.join(str(part) for part in parts).encode()
+    return f'W/"{blake2b(raw, digest_size=12).hexdigest()}"'
+
+
+def etag_matches(if_none_match: str | None, etag: str) -> bool:
+    """Weak comparison of `etag` against an `If-None-Match` header."""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == '*':
+        return True
+
+    opaque = etag.removeprefix('W/')
+    return any(
+        tag.strip().removeprefix('W/') == opaque
+        for tag in if_none_match.split(',')
+    )
+
+
+def not_modified(request: Request, etag: str) -> Response | None:
+    """A bodiless 304 when the client already holds `etag`."""
+    if etag_matches(request.headers.get('if-none-match'), etag):
+        return Response(
+            status_code=HTTPStatus.NOT_MODIFIED, headers={'ETag': etag}
+        )
+    return None
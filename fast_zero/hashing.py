@@ -0,0 +1,140 @@
+"""Password hashing kept off the event loop.
+
+Argon2 is deliberately expensive (CPU and memory), so hashing and
+verification run in a dedicated process pool. The pool admits a bounded
+number of pending jobs; past that, callers get a 503 with `Retry-After`
+instead of queueing behind a login storm and dragging every other
+endpoint down with them.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from http import HTTPStatus
+from time import perf_counter
+
+from fastapi import HTTPException
+from pwdlib import PasswordHash
+from pwdlib.hashers.argon2 import Argon2Hasher
+
+from fast_zero.metrics import password_hash_seconds
+from fast_zero.settings import get_settings
+
+settings = get_settings()
+
+pwd_context = PasswordHash((
+    Argon2Hasher(
+        time_cost=settings.ARGON2_TIME_COST,
+        memory_cost=settings.ARGON2_MEMORY_COST,
+        parallelism=settings.ARGON2_PARALLELISM,
+    ),
+))
+
+
+def get_password_hash(password: str):
+    return pwd_context.hash(password)
+
+
+def verify_password(plain_password: str, hashed_password: str):
+    return pwd_context.verify(plain_password, hashed_password)
+
+
+class HashingPool:
+    """Bounded process pool for password hashing jobs.
+
+    Workers are spawned lazily on the first job, so importing the app (or
+    running the test suite) doesn't fork a pool nobody uses. If a worker
+    dies, the jobs in flight get a 503 and the next job spawns a new pool.
+    """
+
+    def __init__(self, workers: int, max_pending: int, retry_after: int):
+        self.workers = workers
+        self.max_pending = max_pending
+        self.retry_after = retry_after
+        self.pending = 0
+        self._executor: ProcessPoolExecutor | None = None
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=multiprocessing.get_context('spawn'),
+            )
+        return self._executor
+
+    def _busy(self) -> HTTPException:
+        return HTTPException(
+            status_code=HTTPStatus.SERVICE_UNAVAILABLE,
+            detail='Server busy, try again later',
+            headers={'Retry-After': str(self.retry_after)},
+        )
+
+    async def run(self, fn, *args, operation: str | None = None):
+        """Run `fn(*args)` in the pool, or raise a 503 when it is full
+        or broken.
+
+        Admitted jobs are timed under `operation` in
+        `password_hash_seconds`; rejected ones are not recorded.
+        """
+        if self.pending >= self.max_pending:
+            raise self._busy()
+
+        self.pending += 1
+        started = perf_counter()
+        try:
+            executor = self._get_executor()
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(executor, fn, *args)
+        except BrokenProcessPool:
+            # Um worker morreu (p.ex. OOM killer): o pool não aceita mais
+            # jobs, então o descarta e o próximo job sobe um novo
+            if self._executor is executor:
+                self._executor = None
+                executor.shutdown(wait=False, cancel_futures=True)
+            raise self._busy() from None
+        finally:
+            self.pending -= 1
+            if operation is not None:
+                password_hash_seconds.observe(
+                    operation, value=perf_counter() - started
+                )
+
+    async def warm_up(self) -> None:
+        """Spawn every worker and run one hash in it, so the first
+        logins don't wait for process startup and argon2 imports."""
+        loop = asyncio.get_running_loop()
+        executor = self._get_executor()
+        await asyncio.gather(
+            *(
+                loop.run_in_executor(executor, get_password_hash, 'warm-up')
+                for _ in range(self.workers)
+            )
+        )
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(cancel_futures=True)
+            self._executor = None
+
+
+hashing_pool = HashingPool(
+    workers=settings.PASSWORD_HASH_WORKERS or os.cpu_count() or 1,
+    max_pending=settings.PASSWORD_HASH_MAX_PENDING,
+    retry_after=settings.PASSWORD_HASH_RETRY_AFTER,
+)
+
+
+async def hash_password(password: str) -> str:
+    return await hashing_pool.run(
+        get_password_hash, password, operation='hash'
+    )
+
+
+async def check_password(plain_password: str, hashed_password: str) -> bool:
+    return await hashing_pool.run(
+        verify_password, plain_password, hashed_password, operation='verify'
+    )
@@ -0,0 +1,217 @@
+"""Streaming import of todos from NDJSON or CSV.
+
+The request body is read chunk by chunk, every record is validated
+against `TodoSchema` as soon as it is complete, and valid rows are
+written with `COPY todos (...) FROM STDIN` once `chunk_size` of them have
+piled up. Memory is bounded by one chunk of rows, one line or CSV record
+of at most `max_line_bytes`, and the rejection report, which keeps only
+the first `max_errors` entries.
+"""
+
+import csv
+import json
+from typing import AsyncIterator, Literal
+
+from pydantic import ValidationError
+
+from fast_zero.database import ThreadedSession
+from fast_zero.schemas import TodoSchema
+
+ImportFormat = Literal['ndjson', 'csv']
+
+COPY_TODOS = 'COPY todos (title, description, state, user_id) FROM STDIN'
+
+
+def _decode_line(data: bytes) -> str | ValueError:
+    try:
+        return data.decode().removesuffix('\r')
+    except UnicodeDecodeError:
+        return ValueError('Line is not valid UTF-8')
+
+
+async def text_lines(
+    chunks: AsyncIterator[bytes], max_bytes: int
+) -> AsyncIterator[str | ValueError]:
+    """Decode a UTF-8 byte stream into lines, without line endings.
+
+    A line longer than `max_bytes` is not buffered: it comes out as a
+    `ValueError` and the rest of it is skipped up to the next newline.
+    A line that is not valid UTF-8 also comes out as a `ValueError`.
+    """
+    pending = bytearray()
+    skipping = False
+    async for chunk in chunks:
+        start = 0
+        # '\n' nunca aparece dentro de um caractere UTF-8 multibyte
+        while (end := chunk.find(b'\n', start)) != -1:
+            piece = chunk[start:end]
+            start = end + 1
+            if skipping:
+                skipping = False
+            elif len(pending) + len(piece) > max_bytes:
+                yield ValueError(f'Line longer than {max_bytes} bytes')
+            else:
+                pending += piece
+                yield _decode_line(pending)
+            pending.clear()
+
+        rest = chunk[start:]
+        if skipping:
+            continue
+        if len(pending) + len(rest) > max_bytes:
+            yield ValueError(f'Line longer than {max_bytes} bytes')
+            skipping = True
+            pending.clear()
+        else:
+            pending += rest
+
+    if pending and not skipping:
+        yield _decode_line(pending)
+
+
+async def ndjson_records(
+    lines: AsyncIterator[str | ValueError],
+) -> AsyncIterator:
+    """Yield each non-blank line parsed as JSON, or the `ValueError` it
+    raised, so one bad line doesn't stop the import."""
+    async for line in lines:
+        if isinstance(line, ValueError):
+            yield line
+            continue
+        if not line.strip():
+            continue
+        try:
+            yield json.loads(line)
+        except ValueError as exc:
+            yield exc
+
+
+async def csv_records(
+    lines: AsyncIterator[str | ValueError], max_bytes: int
+) -> AsyncIterator:
+    """Yield each CSV record as a dict keyed by the header row.
+
+    A quoted field may span lines, so lines are joined while the running
+    count of quotes is odd (escaped quotes come in pairs). A record that
+    grows past `max_bytes` characters, e.g. after a stray quote, is
+    reported as one error and parsing starts over at the next line.
+    """
+    header = None
+    record = []
+    size = 0
+    open_quote = False
+    async for line in lines:
+        if isinstance(line, ValueError):
+            # Linha longa demais: o registro em andamento vai junto
+            record, size, open_quote = [], 0, False
+            yield line
+            continue
+
+        record.append(line)
+        size += len(line) + 1
+        open_quote ^= line.count('"') % 2 == 1
+        if open_quote:
+            if size > max_bytes:
+                record, size, open_quote = [], 0, False
+                yield ValueError(f'Record longer than {max_bytes} bytes')
+            continue
+
+        values = next(csv.reader(['\n'.join(record)]), [])
+        record, size = [], 0
+        if not values:
+            continue
+        if header is None:
+            header = values
+        elif len(values) != len(header):
+            yield ValueError(
+                f'Expected {len(header)} fields, got {len(values)}'
+            )
+        else:
+            yield dict(zip(header, values))
+
+    if record:
+        yield ValueError('Unterminated quoted field')
+
+
+def validate(record) -> TodoSchema | str:
+    """The validated todo, or a short description of what is wrong."""
+    if isinstance(record, ValueError):
+        return str(record)
+    try:
+        return TodoSchema.model_validate(record)
+    except ValidationError as exc:
+        error = exc.errors()[0]
+        loc = '.'.join(str(part) for part in error['loc'])
+        return f'{loc}: {error["msg"]}' if loc else error['msg']
+
+
+def _copy_sync(sync_session, rows: list[tuple]):
+    dbapi_connection = sync_session.connection().connection
+    with dbapi_connection.driver_connection.cursor() as cursor:
+        with cursor.copy(COPY_TODOS) as copy:
+            for row in rows:
+                copy.write_row(row)
+
+
+async def copy_todos(session, rows: list[tuple]):
+    """Send `rows` through COPY on the session's connection, inside its
+    current transaction."""
+    if isinstance(session, ThreadedSession):
+        await session.run_sync(_copy_sync, rows)
+        return
+
+    connection = await session.connection()
+    raw = await connection.get_raw_connection()
+    async with raw.driver_connection.cursor() as cursor:
+        async with cursor.copy(COPY_TODOS) as copy:
+            for row in rows:
+                await copy.write_row(row)
+
+
+def _rows(records: list[TodoSchema], user_id: int) -> list[tuple]:
+    return [
+        (todo.title, todo.description, todo.state.value, user_id)
+        for todo in records
+    ]
+
+
+async def import_todos(  # noqa
+    session,
+    chunks: AsyncIterator[bytes],
+    fmt: ImportFormat,
+    user_id: int,
+    chunk_size: int,
+    max_errors: int,
+    max_line_bytes: int,
+) -> dict:
+    """Import every valid record of `chunks` for `user_id` in the session's
+    transaction (the caller commits) and report what was rejected."""
+    lines = text_lines(chunks, max_line_bytes)
+    if fmt == 'ndjson':
+        records = ndjson_records(lines)
+    else:
+        records = csv_records(lines, max_line_bytes)
+    accepted, rejected, errors = 0, 0, []
+    pending = []
+
+    row = 0
+    async for record in records:
+        row += 1
+        todo = validate(record)
+        if isinstance(todo, str):
+            rejected += 1
+            if len(errors) < max_errors:
+                errors.append({'row': row, 'detail': todo})
+            continue
+
+        pending.append(todo)
+        if len(pending) >= chunk_size:
+            await copy_todos(session, _rows(pending, user_id))
+            accepted += len(pending)
+            pending = []
+
+    if pending:
+        await copy_todos(session, _rows(pending, user_id))
+        accepted += len(pending)
+
+    return {'accepted': accepted, 'rejected': rejected, 'errors': errors}
@@ -0,0 +1,45 @@
+"""Periodic maintenance jobs run inside the application's event loop.
+
+Every worker runs its own copy, so a job must be safe to run concurrently
+with itself (row locks, `SKIP LOCKED`, advisory locks).
+"""
+
+import asyncio
+import logging
+from abc import ABC, abstractmethod
+
+logger = logging.getLogger(__name__)
+
+
+class PeriodicJob(ABC):
+    """Calls `run()` every `interval` seconds; `interval <= 0` disables."""
+
+    name = 'job'
+
+    def __init__(self, interval: float):
+        self.interval = interval
+        self._task: asyncio.Task | None = None
+
+    @abstractmethod
+    async def run(self): ...
+
+    async def run_forever(self):
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                await self.run()
+            except Exception:
+                logger.exception('%s failed', self.name)
+
+    def start(self):
+        if self.interval > 0 and self._task is None:
+            self._task = asyncio.create_task(self.run_forever())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
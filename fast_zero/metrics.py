@@ -0,0 +1,228 @@
+"""In-process metric primitives.
+
+Small, dependency-free counters and histograms used to expose runtime
+telemetry (connection pool usage, wait times, trash purging, request phases,
+etc.)
+through the `/metrics` router.
+"""
+
+from __future__ import annotations
+
+from bisect import bisect_left
+from threading import Lock
+
+# Upper bounds (in seconds) shared by every latency histogram
+DEFAULT_BUCKETS = (
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+    30.0,
+)
+
+# Consultas ao banco por requisição
+QUERY_COUNT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+
+
+class Histogram:
+    """Cumulative histogram with fixed bucket upper bounds."""
+
+    def __init__(self, buckets: tuple[float, ...] = DEFAULT_BUCKETS):
+        self.buckets = tuple(sorted(buckets))
+        self._counts = [0] * (len(self.buckets) + 1)
+        self._sum = 0.0
+        self._lock = Lock()
+
+    def observe(self, value: float) -> None:
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            self._counts[index] += 1
+            self._sum += value
+
+    def snapshot(self) -> dict:
+        """Return count, sum and cumulative bucket counts keyed by `le`."""
+        with self._lock:
+            counts = list(self._counts)
+            total = self._sum
+
+        buckets, cumulative = {}, 0
+        for bound, count in zip((*self.buckets, '+Inf'), counts):
+            cumulative += count
+            buckets[str(bound)] = cumulative
+
+        return {'count': cumulative, 'sum': total, 'buckets': buckets}
+
+
+class CounterVec:
+    """Counters keyed by a tuple of label values."""
+
+    def __init__(self, labels: tuple[str, ...]):
+        self.labels = labels
+        self._values: dict[tuple[str, ...], float] = {}
+        self._lock = Lock()
+
+    def inc(self, *values: str, amount: float = 1) -> None:
+        with self._lock:
+            self._values[values] = self._values.get(values, 0) + amount
+
+    def items(self) -> list[tuple[tuple[str, ...], float]]:
+        with self._lock:
+            return list(self._values.items())
+
+
+class HistogramVec:
+    """`Histogram`s keyed by a tuple of label values."""
+
+    def __init__(
+        self,
+        labels: tuple[str, ...],
+        buckets: tuple[float, ...] = DEFAULT_BUCKETS,
+    ):
+        self.labels = labels
+        self.buckets = buckets
+        self._histograms: dict[tuple[str, ...], Histogram] = {}
+        self._lock = Lock()
+
+    def observe(self, *values: str, value: float) -> None:
+        histogram = self._histograms.get(values)
+        if histogram is None:
+            with self._lock:
+                histogram = self._histograms.setdefault(
+                    values, Histogram(self.buckets)
+                )
+        histogram.observe(value)
+
+    def items(self) -> list[tuple[tuple[str, ...], Histogram]]:
+        with self._lock:
+            return list(self._histograms.items())
+
+
+class PoolMetrics:
+    """Counters and histograms fed by SQLAlchemy pool events."""
+
+    def __init__(self):
+        self.connects = 0
+        self.checkouts = 0
+        self.invalidations = 0
+        self.wait = Histogram()
+        self.connect_latency = Histogram()
+        self._lock = Lock()
+
+    def incr(self, name: str) -> None:
+        with self._lock:
+            setattr(self, name, getattr(self, name) + 1)
+
+
+pool_metrics = PoolMetrics()
+
+
+class PurgerMetrics:
+    """Progress and backlog of the trash purger."""
+
+    def __init__(self):
+        self.runs = 0
+        self.purged = 0
+        # Linhas vencidas ainda na lixeira / total na lixeira (última run)
+        self.backlog = 0
+        self.trashed = 0
+        self.last_run_at = None
+        self.batch = Histogram()
+
+    def snapshot(self) -> dict:
+        return {
+            'runs': self.runs,
+            'purged': self.purged,
+            'backlog': self.backlog,
+            'trashed': self.trashed,
+            'last_run_at': self.last_run_at,
+            'batch_seconds': self.batch.snapshot(),
+        }
+
+
+purger_metrics = PurgerMetrics()
+
+
+class RouteTimings:
+    """Per-route histograms of request phases (see `fast_zero.timing`)."""
+
+    def __init__(self):
+        self._routes: dict[str, tuple[dict[str, Histogram], Histogram]] = {}
+        self._lock = Lock()
+
+    def _route(self, route: str):
+        entry = self._routes.get(route)
+        if entry is None:
+            with self._lock:
+                entry = self._routes.setdefault(
+                    route, ({}, Histogram(QUERY_COUNT_BUCKETS))
+                )
+        return entry
+
+    def observe(self, route: str, phases: dict[str, float], queries: int):
+        histograms, query_count = self._route(route)
+        for name, seconds in phases.items():
+            histogram = histograms.get(name)
+            if histogram is None:
+                with self._lock:
+                    histogram = histograms.setdefault(name, Histogram())
+            histogram.observe(seconds)
+        query_count.observe(queries)
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            routes = {
+                route: (dict(histograms), query_count)
+                for route, (histograms, query_count) in self._routes.items()
+            }
+        return {
+            route: {
+                'phases': {
+                    name: histogram.snapshot()
+                    for name, histogram in histograms.items()
+                },
+                'queries': query_count.snapshot(),
+            }
+            for route, (histograms, query_count) in routes.items()
+        }
+
+    def clear(self):
+        with self._lock:
+            self._routes.clear()
+
+
+route_timings = RouteTimings()
+
+
+class RequestMetrics:
+    """HTTP request counts, latencies and in-flight requests."""
+
+    def __init__(self):
+        self.requests = CounterVec(('method', 'route', 'status'))
+        self.duration = HistogramVec(('method', 'route'))
+        self.in_progress = 0
+        self._lock = Lock()
+
+    def started(self) -> None:
+        with self._lock:
+            self.in_progress += 1
+
+    def finished(self, method: str, route: str, status: int, seconds: float):
+        with self._lock:
+            self.in_progress -= 1
+        self.requests.inc(method, route, str(status))
+        self.duration.observe(method, route, value=seconds)
+
+
+request_metrics = RequestMetrics()
+
+# Duração de hash_password / check_password, incluindo a fila do pool
+password_hash_seconds = HistogramVec(('operation',))
@@ -0,0 +1,50 @@
+"""`alembic upgrade head` that returns at once when there is nothing to do.
+
+Run by `entrypoint.sh` on every start, so on a scale-to-zero deployment
+its cost is part of each cold start. The revision in `alembic_version`
+is compared with the heads of `migrations/versions` with one query on a
+throwaway connection; alembic's environment (and with it the app's
+models) is only loaded when an upgrade is actually due.
+
+    python -m fast_zero.migrate
+"""
+
+import logging
+
+from alembic import command
+from alembic.config import Config
+from alembic.runtime.migration import MigrationContext
+from alembic.script import ScriptDirectory
+from sqlalchemy import create_engine
+from sqlalchemy.pool import NullPool
+
+from fast_zero.settings import get_settings
+
+logger = logging.getLogger(__name__)
+
+
+def at_head(config: Config, url: str) -> bool:
+    heads = set(ScriptDirectory.from_config(config).get_heads())
+    engine = create_engine(url, poolclass=NullPool)
+    try:
+        with engine.connect() as conn:
+            current = set(MigrationContext.configure(conn).get_current_heads())
+    finally:
+        engine.dispose()
+    return current == heads
+
+
+def main(config_file: str = 'alembic.ini'):
+    config = Config(config_file)
+    if at_head(config, get_settings().DATABASE_URL):
+        logger.info('Database already at head, skipping migrations')
+        return
+    command.upgrade(config, 'head')
+
+
+if __name__ == '__main__':
+    # Formato do alembic.ini; só este logger em INFO (o root em INFO
+    # faria o SQLAlchemy registrar o SQL da verificação)
+    logging.basicConfig(format='%(levelname)-5.5s [%(name)s] %(message)s')
+    logger.setLevel(logging.INFO)
+    main()
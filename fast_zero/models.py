@@ -1,9 +1,23 @@
 from datetime import datetime
 from enum import Enum
 
-from sqlalchemy import ForeignKey, func
+from sqlalchemy import (
+    DDL,
+    BigInteger,
+    Computed,
+    ForeignKey,
+    Index,
+    event,
+    func,
+    text,
+)
+from sqlalchemy.dialects.postgresql import TSVECTOR
 from sqlalchemy.orm import Mapped, mapped_column, registry
 
+from fast_zero.etag import TODOS_VERSION_FUNCTION, TODOS_VERSION_TRIGGERS
+from fast_zero.search import SEARCH_VECTOR
+from fast_zero.todo_stats import TODO_COUNTS_FUNCTION, TODO_COUNTS_TRIGGERS
+
 table_registry = registry()
 
 
@@ -21,6 +35,10 @@ class User:
     updated_at: Mapped[datetime] = mapped_column(
         init=False, default=func.now(), onupdate=func.now(), nullable=True
     )
+    # Incrementada por triggers a cada escrita em todos (ETag da coleção)
+    todos_version: Mapped[int] = mapped_column(
+        init=False, server_default='0', deferred=True
+    )
 
 
 class TodoState(str, Enum):
@@ -34,9 +52,74 @@ class TodoState(str, Enum):
 @table_registry.mapped_as_dataclass
 class Todo:
     __tablename__ = 'todos'
+    __table_args__ = (
+        # Toda consulta filtra pelo dono; as listagens paginam por id
+        Index('ix_todos_user_id_id', 'user_id', 'id'),
+        Index('ix_todos_user_id_state_id', 'user_id', 'state', 'id'),
+        # Busca por substring (ilike '%...%') usando trigramas
+        Index(
+            'ix_todos_title_trgm',
+            'title',
+            postgresql_using='gin',
+            postgresql_ops={'title': 'gin_trgm_ops'},
+        ),
+        Index(
+            'ix_todos_description_trgm',
+            'description',
+            postgresql_using='gin',
+            postgresql_ops={'description': 'gin_trgm_ops'},
+        ),
+        # Busca textual (q=) ranqueada
+        Index(
+            'ix_todos_search_vector', 'search_vector', postgresql_using='gin'
+        ),
+        # Expurgo da lixeira: só as linhas em 'trash', por idade
+        Index(
+            'ix_todos_trash_updated_at',
+            'updated_at',
+            postgresql_where=text("state = 'trash'"),
+        ),
+    )
+
     id: Mapped[int] = mapped_column(init=False, primary_key=True)
     title: Mapped[str]
     description: Mapped[str]
     state: Mapped[TodoState]
     # Toda tarefa pertence a alguém
     user_id: Mapped[int] = mapped_column(ForeignKey('users.id'))
+    updated_at: Mapped[datetime] = mapped_column(
+        init=False, server_default=func.now(), onupdate=func.now()
+    )
+    search_vector: Mapped[str] = mapped_column(
+        TSVECTOR,
+        Computed(SEARCH_VECTOR, persisted=True),
+        init=False,
+        deferred=True,
+    )
+
+
+@table_registry.mapped_as_dataclass
+class TodoCount:
+    """How many todos a user has in one state (see `todo_stats`)."""
+
+    __tablename__ = 'todo_counts'
+
+    user_id: Mapped[int] = mapped_column(
+        ForeignKey('users.id', ondelete='CASCADE'), primary_key=True
+    )
+    state: Mapped[TodoState] = mapped_column(primary_key=True)
+    count: Mapped[int] = mapped_column(BigInteger, default=0)
+
+
+event.listen(
+    Todo.__table__,
+    'before_create',
+    DDL('CREATE EXTENSION IF NOT EXISTS pg_trgm'),
+)
+
+for statement in (TODOS_VERSION_FUNCTION, *TODOS_VERSION_TRIGGERS):
+    event.listen(Todo.__table__, 'after_create', DDL(statement))
+
+# Os triggers precisam de todos e todo_counts já criadas
+for statement in (TODO_COUNTS_FUNCTION, *TODO_COUNTS_TRIGGERS):
+    event.listen(table_registry.metadata, 'after_create', DDL(statement))
@@ -0,0 +1,61 @@
+"""Keyset (cursor) pagination helpers.
+
+Instead of `OFFSET n`, which makes Postgres walk and discard every earlier
+row, the next page starts right after the last key the client saw:
+`WHERE id > :last_id ORDER BY id LIMIT :limit`. The key is handed to the
+client as an opaque, URL-safe cursor.
+"""
+
+from __future__ import annotations
+
+import json
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from binascii import Error as BinasciiError
+from http import HTTPStatus
+
+from fastapi import HTTPException
+
+
+def encode_cursor(last_id: int) -> str:
+    raw = json.dumps({'id': last_id}, separators=(',', ':')).encode()
+    return urlsafe_b64encode(raw).rstrip(b'=').decode()
+
+
+def decode_cursor(cursor: str) -> int:
+    padded = cursor + '=' * (-len(cursor) % 4)
+    try:
+        last_id = json.loads(urlsafe_b64decode(padded))['id']
+    except (BinasciiError, ValueError, TypeError, KeyError):
+        last_id = None
+
+    if not isinstance(last_id, int):
+        raise HTTPException(
+            status_code=HTTPStatus.BAD_REQUEST, detail='Invalid cursor'
+        )
+    return last_id
+
+
+def keyset(query, column, cursor: str | None, limit: int | None):
+    """Order `query` by `column`, resume after `cursor` and over-fetch one
+    row so `next_page` can tell whether another page exists."""
+    if cursor is not None:
+        query = query.where(column > decode_cursor(cursor))
+
+    query = query.order_by(column)
+
+    if limit is not None:
+        query = query.limit(limit + 1)
+    return query
+
+
+def next_page(rows: list, limit: int | None) -> tuple[list, str | None]:
+    """Trim the over-fetched row and build the cursor for the next page."""
+    if limit is None:
+        return rows, None
+
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+
+    if not has_more or not rows:
+        return rows, None
+    return rows, encode_cursor(rows[-1].id)
@@ -0,0 +1,320 @@
+"""Prometheus text exposition of the in-process metrics.
+
+`PrometheusMiddleware` counts requests and their latency per route
+template (`/todos/{todo_id}`, never the raw path) and tracks in-flight
+requests. `GET /metrics` renders those together with the engine pool and
+password hashing metrics.
+
+Each worker process only sees its own numbers. With
+`METRICS_MULTIPROC_DIR` set, every worker periodically dumps a snapshot
+to `<dir>/<pid>.json` and a scrape, whichever worker answers it, sums
+the snapshots of all workers: counters and histograms of dead workers
+are kept, so totals never go backwards, while gauges only count live
+ones. As with other multiprocess collectors, the directory must be
+emptied before the server starts.
+"""
+
+import json
+import os
+from pathlib import Path
+from time import perf_counter
+
+from fast_zero.database import pool_status, replicas
+from fast_zero.jobs import PeriodicJob
+from fast_zero.metrics import (
+    password_hash_seconds,
+    pool_metrics,
+    request_metrics,
+)
+from fast_zero.settings import get_settings
+from fast_zero.timing import route_template
+
+settings = get_settings()
+
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+
+class PrometheusMiddleware:
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] != 'http':
+            await self.app(scope, receive, send)
+            return
+
+        status = 500
+        started = perf_counter()
+        request_metrics.started()
+
+        async def send_with_status(message):
+            nonlocal status
+            if message['type'] == 'http.response.start':
+                status = message['status']
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            request_metrics.finished(
+                scope['method'],
+                route_template(scope),
+                status,
+                perf_counter() - started,
+            )
+
+
+def _family(
+    kind: str, description: str, samples: list, aggregate: str = 'sum'
+) -> dict:
+    # aggregate: como somar entre workers ('sum' ou 'max')
+    return {
+        'type': kind,
+        'help': description,
+        'samples': samples,
+        'aggregate': aggregate,
+    }
+
+
+def _labeled(vec, values) -> list:
+    # [rótulos, valor] para cada combinação de rótulos
+    return [[dict(zip(vec.labels, labels)), value] for labels, value in values]
+
+
+def collect() -> dict:
+    """Snapshot of this process's metrics, JSON-serializable."""
+    pool = pool_status()
+    return {
+        'http_requests_total': _family(
+            'counter',
+            'HTTP requests by route template and status.',
+            _labeled(
+                request_metrics.requests, request_metrics.requests.items()
+            ),
+        ),
+        'http_request_duration_seconds': _family(
+            'histogram',
+            'HTTP request latency by route template.',
+            _labeled(
+                request_metrics.duration,
+                (
+                    (labels, histogram.snapshot())
+                    for labels, histogram in request_metrics.duration.items()
+                ),
+            ),
+        ),
+        'http_requests_in_progress': _family(
+            'gauge',
+            'HTTP requests being handled.',
+            [[{}, request_metrics.in_progress]],
+        ),
+        'db_pool_size': _family(
+            'gauge', 'Connections kept in the pool.', [[{}, pool['pool_size']]]
+        ),
+        'db_pool_checked_out': _family(
+            'gauge', 'Connections in use.', [[{}, pool['checked_out']]]
+        ),
+        'db_pool_checked_in': _family(
+            'gauge',
+            'Idle connections in the pool.',
+            [[{}, pool['checked_in']]],
+        ),
+        'db_pool_overflow': _family(
+            'gauge',
+            'Connections open beyond pool_size.',
+            [[{}, pool['overflow']]],
+        ),
+        'db_pool_connects_total': _family(
+            'counter',
+            'New database connections.',
+            [[{}, pool_metrics.connects]],
+        ),
+        'db_pool_checkouts_total': _family(
+            'counter', 'Pool checkouts.', [[{}, pool_metrics.checkouts]]
+        ),
+        'db_pool_invalidations_total': _family(
+            'counter',
+            'Invalidated connections.',
+            [[{}, pool_metrics.invalidations]],
+        ),
+        'db_pool_wait_seconds': _family(
+            'histogram',
+            'Time waiting for a pool connection.',
+            [[{}, pool_metrics.wait.snapshot()]],
+        ),
+        'db_pool_connect_seconds': _family(
+            'histogram',
+            'Time to open a database connection.',
+            [[{}, pool_metrics.connect_latency.snapshot()]],
+        ),
+        'db_replica_lag_seconds': _family(
+            'gauge',
+            'Replication lag at the last check (-1: check failed).',
+            [
+                [
+                    {'replica': str(replica['replica'])},
+                    -1
+                    if replica['lag_seconds'] is None
+                    else replica['lag_seconds'],
+                ]
+                for replica in replicas.status()
+            ],
+            aggregate='max',
+        ),
+        'db_replica_in_rotation': _family(
+            'gauge',
+            'Whether the replica takes reads (1) or not (0).',
+            [
+                [
+                    {'replica': str(replica['replica'])},
+                    int(replica['in_rotation']),
+                ]
+                for replica in replicas.status()
+            ],
+            aggregate='max',
+        ),
+        'password_hash_seconds': _family(
+            'histogram',
+            'Password hashing and verification, including pool queueing.',
+            _labeled(
+                password_hash_seconds,
+                (
+                    (labels, histogram.snapshot())
+                    for labels, histogram in password_hash_seconds.items()
+                ),
+            ),
+        ),
+    }
+
+
+def _merge_value(family: dict, total, value):
+    if total is None:
+        return value
+    if family['aggregate'] == 'max':
+        return max(total, value)
+    if family['type'] != 'histogram':
+        return total + value
+    return {
+        'count': total['count'] + value['count'],
+        'sum': total['sum'] + value['sum'],
+        'buckets': {
+            le: total['buckets'].get(le, 0) + count
+            for le, count in value['buckets'].items()
+        },
+    }
+
+
+def merge(snapshots: list[tuple[dict, bool]]) -> dict:
+    """
+    Sum `(snapshot, alive)` pairs sample by sample; gauges only from the
+    live processes.
+    """
+    merged = {}
+    for snapshot, alive in snapshots:
+        for name, family in snapshot.items():
+            if family['type'] == 'gauge' and not alive:
+                continue
+            target = merged.setdefault(name, {**family, 'samples': {}})
+            for labels, value in family['samples']:
+                key = tuple(sorted(labels.items()))
+                target['samples'][key] = _merge_value(
+                    family, target['samples'].get(key), value
+                )
+
+    for family in merged.values():
+        family['samples'] = [
+            [dict(key), value] for key, value in family['samples'].items()
+        ]
+    return merged
+
+
+def _alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def write_snapshot(directory: str) -> None:
+    path = Path(directory) / f'{os.getpid()}.json'
+    tmp = path.with_suffix('.tmp')
+    # Troca atômica: um scrape nunca lê um arquivo pela metade
+    tmp.write_text(json.dumps(collect()), encoding='utf-8')
+    tmp.replace(path)
+
+
+def read_snapshots(directory: str) -> list[tuple[dict, bool]]:
+    snapshots = []
+    for path in Path(directory).glob('*.json'):
+        snapshots.append((
+            json.loads(path.read_text(encoding='utf-8')),
+            _alive(int(path.stem)),
+        ))
+    return snapshots
+
+
+def _labels(labels: dict) -> str:
+    if not labels:
+        return ''
+    pairs = ','.join(
+        f'{name}="{_escape(str(value))}"' for name, value in labels.items()
+    )
+    return f'{{{pairs}}}'
+
+
+def _escape(value: str) -> str:
+    return value.replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+
+def render(families: dict) -> str:
+    """Prometheus text format (0.0.4) for `collect()`-shaped families."""
+    lines = []
+    for name, family in families.items():
+        lines.append(f'# HELP {name} {family["help"]}')
+        lines.append(f'# TYPE {name} {family["type"]}')
+        for labels, value in family['samples']:
+            if family['type'] != 'histogram':
+                lines.append(f'{name}{_labels(labels)} {value}')
+                continue
+            for le, count in value['buckets'].items():
+                bucket = _labels({**labels, 'le': le})
+                lines.append(f'{name}_bucket{bucket} {count}')
+            lines.append(f'{name}_sum{_labels(labels)} {value["sum"]}')
+            lines.append(f'{name}_count{_labels(labels)} {value["count"]}')
+    lines.append('')
+    return '\n'.join(lines)
+
+
+def exposition() -> str:
+    """What `GET /metrics` serves: this worker's, or all workers'."""
+    directory = settings.METRICS_MULTIPROC_DIR
+    if not directory:
+        return render(collect())
+
+    write_snapshot(directory)
+    return render(merge(read_snapshots(directory)))
+
+
+class SnapshotWriter(PeriodicJob):
+    name = 'Metrics snapshot'
+
+    def __init__(self, directory: str | None, interval: float):
+        super().__init__(interval if directory else 0)
+        self.directory = directory
+
+    async def run(self):
+        write_snapshot(self.directory)
+
+    async def stop(self):
+        await super().stop()
+        # Última foto: os contadores deste worker sobrevivem a ele
+        if self.directory:
+            write_snapshot(self.directory)
+
+
+snapshot_writer = SnapshotWriter(
+    settings.METRICS_MULTIPROC_DIR, settings.METRICS_SNAPSHOT_INTERVAL
+)
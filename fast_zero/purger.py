@@ -0,0 +1,116 @@
+"""Background purge of trashed todos.
+
+Todos moved to `TodoState.trash` stay recoverable for
+`TRASH_RETENTION_DAYS` (counted from `updated_at`) and are then deleted
+for good. Each batch is its own short transaction that deletes at most
+`TRASH_PURGE_BATCH_SIZE` rows, picked with `FOR UPDATE SKIP LOCKED` so it
+never waits on, or blocks, a request touching the same rows. A pause
+between batches leaves room for foreground traffic.
+"""
+
+import asyncio
+from datetime import datetime, timedelta
+from time import perf_counter
+from zoneinfo import ZoneInfo
+
+from sqlalchemy import delete, func, select
+
+from fast_zero.database import open_session
+from fast_zero.jobs import PeriodicJob
+from fast_zero.metrics import purger_metrics
+from fast_zero.models import Todo, TodoState
+from fast_zero.settings import get_settings
+
+settings = get_settings()
+
+
+class TrashPurger(PeriodicJob):
+    name = 'Trash purge'
+
+    def __init__(  # noqa: PLR0913, PLR0917
+        self,
+        session_factory,
+        retention: timedelta,
+        batch_size: int,
+        max_batches: int,
+        pause: float,
+        interval: float,
+    ):
+        super().__init__(interval)
+        self.session_factory = session_factory
+        self.retention = retention
+        self.batch_size = batch_size
+        self.max_batches = max_batches
+        self.pause = pause
+
+    def _expired(self):
+        return (
+            Todo.state == TodoState.trash,
+            Todo.updated_at < func.now() - self.retention,
+        )
+
+    async def purge_batch(self) -> int:
+        """Delete one batch of expired trash and return how many rows."""
+        batch = (
+            select(Todo.id)
+            .where(*self._expired())
+            .limit(self.batch_size)
+            .with_for_update(skip_locked=True)
+        )
+        session = self.session_factory()
+        try:
+            result = await session.execute(
+                delete(Todo).where(Todo.id.in_(batch.scalar_subquery())),
+                execution_options={'synchronize_session': False},
+            )
+            await session.commit()
+        finally:
+            await session.close()
+        return result.rowcount
+
+    async def measure_backlog(self):
+        """Count expired and total trashed rows into `purger_metrics`."""
+        query = select(
+            func.count().filter(Todo.updated_at < func.now() - self.retention),
+            func.count(),
+        ).where(Todo.state == TodoState.trash)
+        session = self.session_factory()
+        try:
+            backlog, trashed = (await session.execute(query)).one()
+        finally:
+            await session.close()
+
+        purger_metrics.backlog = backlog
+        purger_metrics.trashed = trashed
+
+    async def purge(self) -> int:
+        """Purge expired trash batch by batch; returns the rows deleted."""
+        purged = 0
+        for _ in range(self.max_batches):
+            started = perf_counter()
+            deleted = await self.purge_batch()
+            purger_metrics.batch.observe(perf_counter() - started)
+            purged += deleted
+
+            if deleted < self.batch_size:
+                break
+            await asyncio.sleep(self.pause)
+
+        purger_metrics.runs += 1
+        purger_metrics.purged += purged
+        purger_metrics.last_run_at = datetime.now(tz=ZoneInfo('UTC'))
+        await self.measure_backlog()
+        return purged
+
+    async def run(self):
+        await self.purge()
+
+
+trash_purger = TrashPurger(
+    open_session,
+    retention=timedelta(days=settings.TRASH_RETENTION_DAYS),
+    batch_size=settings.TRASH_PURGE_BATCH_SIZE,
+    max_batches=settings.TRASH_PURGE_MAX_BATCHES,
+    pause=settings.TRASH_PURGE_PAUSE,
+    interval=settings.TRASH_PURGE_INTERVAL,
+)
@@ -0,0 +1,140 @@
+"""Cached readiness for orchestrator probes.
+
+`ReadinessProbe` runs `SELECT 1` on the primary in the background, every
+`HEALTH_PROBE_INTERVAL` seconds, and keeps the outcome. `GET
+/health/ready` only reads it, next to the engine pool occupancy and the
+password hashing backlog, so a probe never checks out a connection nor
+waits on a saturated pool. A worker is ready when:
+
+- the last database check succeeded less than `HEALTH_PROBE_MAX_AGE`
+  seconds ago;
+- fewer than `HEALTH_POOL_SATURATION` (a fraction) of the pool's
+  connections, overflow included, are checked out;
+- the hashing queue is below `HEALTH_HASHING_BACKLOG` of its capacity.
+
+With `HEALTH_PROBE_INTERVAL <= 0` the database is not checked and only
+the saturation limits apply. Each worker reports its own state, which is
+what the load balancer needs to route around it.
+"""
+
+import asyncio
+from time import monotonic, perf_counter
+
+from sqlalchemy import text
+
+from fast_zero.database import open_session, pool_status
+from fast_zero.hashing import HashingPool, hashing_pool
+from fast_zero.jobs import PeriodicJob
+from fast_zero.settings import get_settings
+
+settings = get_settings()
+
+
+class ReadinessProbe(PeriodicJob):
+    name = 'Readiness probe'
+
+    def __init__(  # noqa: PLR0913, PLR0917
+        self,
+        session_factory,
+        hashing: HashingPool,
+        interval: float,
+        timeout: float,
+        max_age: float,
+        pool_saturation: float,
+        hashing_backlog: float,
+    ):
+        super().__init__(interval)
+        self.session_factory = session_factory
+        self.hashing = hashing
+        self.timeout = timeout
+        self.max_age = max_age
+        self.pool_saturation = pool_saturation
+        self.hashing_backlog = hashing_backlog
+        self.database_ok: bool | None = None
+        self.database_latency: float | None = None
+        self.checked_at: float | None = None
+        self.last_ok_at: float | None = None
+
+    async def _select_one(self):
+        session = self.session_factory()
+        try:
+            await session.execute(text('SELECT 1'))
+        finally:
+            await session.close()
+
+    async def run(self):
+        started = perf_counter()
+        try:
+            # O timeout cobre também a espera por uma conexão do pool
+            await asyncio.wait_for(self._select_one(), self.timeout)
+        except Exception:
+            self.database_ok = False
+            self.database_latency = None
+        else:
+            self.database_ok = True
+            self.database_latency = perf_counter() - started
+            self.last_ok_at = monotonic()
+        self.checked_at = monotonic()
+
+    async def run_forever(self):
+        # Primeira verificação logo ao subir; até lá o worker não está pronto
+        await self.run()
+        await super().run_forever()
+
+    def database_status(self) -> str:
+        if self.checked_at is None:
+            return 'unknown'
+        if not self.database_ok:
+            return 'error'
+        if monotonic() - self.last_ok_at > self.max_age:
+            # O probe parou de rodar (loop travado, tarefa morta)
+            return 'stale'
+        return 'ok'
+
+    def report(self) -> dict:
+        """Readiness from the cached check and in-process counters only."""
+        pool = pool_status()
+        database = self.database_status()
+        reasons = []
+        # Com o probe desligado, o banco não entra na conta
+        if database != 'ok' and self.interval > 0:
+            reasons.append(f'database {database}')
+        if pool['checked_out'] >= pool['max_connections'] * (
+            self.pool_saturation
+        ):
+            reasons.append('connection pool saturated')
+        if self.hashing.pending >= self.hashing.max_pending * (
+            self.hashing_backlog
+        ):
+            reasons.append('password hashing backlog')
+
+        return {
+            'ready': not reasons,
+            'reasons': reasons,
+            'database_status': database,
+            'database_latency_ms': (
+                None
+                if self.database_latency is None
+                else self.database_latency * 1000
+            ),
+            'database_checked_seconds_ago': (
+                None
+                if self.checked_at is None
+                else monotonic() - self.checked_at
+            ),
+            'pool_checked_out': pool['checked_out'],
+            'pool_max_connections': pool['max_connections'],
+            'hashing_pending': self.hashing.pending,
+            'hashing_max_pending': self.hashing.max_pending,
+        }
+
+
+readiness_probe = ReadinessProbe(
+    open_session,
+    hashing_pool,
+    interval=settings.HEALTH_PROBE_INTERVAL,
+    timeout=settings.HEALTH_PROBE_TIMEOUT,
+    max_age=settings.HEALTH_PROBE_MAX_AGE,
+    pool_saturation=settings.HEALTH_POOL_SATURATION,
+    hashing_backlog=settings.HEALTH_HASHING_BACKLOG,
+)
@@ -0,0 +1,38 @@
+"""Response cache for the hot read endpoints.
+
+Cached routes and the scopes their write handlers invalidate:
+
+- `list_todos`: `todos:<user id>`
+- `read_users`: `users`
+- `read_user`: `user:<user id>`
+
+`read_users` and `read_user` may read from a replica, so their keys also
+carry `read_source`: a body loaded from a lagging replica never reaches a
+client pinned to the primary after its own write.
+
+The default backend is process-local, so with several workers a write
+only invalidates the worker that served it and the others may serve the
+old body for up to `RESPONSE_CACHE_TTL` seconds. Use a shared backend
+(e.g. `RedisBackend`) when that matters.
+"""
+
+from fast_zero.cache import MemoryBackend, ResponseCache
+from fast_zero.settings import get_settings
+
+settings = get_settings()
+
+response_cache = ResponseCache(
+    MemoryBackend(maxsize=settings.RESPONSE_CACHE_MAXSIZE),
+    ttl=settings.RESPONSE_CACHE_TTL,
+)
+
+
+def todos_scope(user_id: int) -> str:
+    return f'todos:{user_id}'
+
+
+def user_scope(user_id: int) -> str:
+    return f'user:{user_id}'
+
+
+USERS_SCOPE = 'users'
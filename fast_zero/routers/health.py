@@ -1,6 +1,15 @@
-"""Health check endpoint for application and database readiness.
-
-This module exposes a health check endpoint that verifies:
+"""Health check endpoints for application and database readiness.
+
+- `GET /health/live`: liveness. Answers as long as the event loop does;
+  touches neither the database nor any dependency.
+- `GET /health/ready`: readiness, served from the cached state of
+  `readiness_probe` (see `fast_zero.readiness`). Never checks out a
+  connection, so it stays cheap under aggressive probing and answers
+  at once even with the pool exhausted.
+- `GET /health/`: on-demand check, described below. Meant for humans and
+  monitors, not for orchestrator probes.
+
+The on-demand check verifies:
 - Application availability
 - Database connectivity (via a lightweight `SELECT 1`)
 
@@ -22,15 +31,16 @@ from typing import Annotated, Literal
 from fastapi import APIRouter, Depends, Response
 from sqlalchemy import text
 from sqlalchemy.exc import SQLAlchemyError
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from fast_zero.database import get_session
-from fast_zero.schemas import HealthCheck
+from fast_zero.readiness import readiness_probe
+from fast_zero.schemas import HealthCheck, Liveness, Readiness
 
 router = APIRouter(prefix='/health', tags=['health'])
 
 # Dependency alias, following the pattern from todos.py
-SessionDep = Annotated[Session, Depends(get_session)]
+SessionDep = Annotated[AsyncSession, Depends(get_session)]
 
 
 @router.get(
@@ -46,14 +56,14 @@ SessionDep = Annotated[Session, Depends(get_session)]
     """
     ),
 )
-def health_check(session: SessionDep, response: Response) -> HealthCheck:
+async def health_check(session: SessionDep, response: Response) -> HealthCheck:
     """Health check endpoint.
 
     Performs a lightweight database connectivity verification using `SELECT 1`.
     Sets HTTP status to 503 if the database is not reachable.
 
     Args:
-        session: SQLAlchemy session provided by dependency injection.
+        session: SQLAlchemy async session provided by dependency injection.
         response: FastAPI response object
         (used to set the appropriate status code).
 
@@ -65,7 +75,7 @@ def health_check(session: SessionDep, response: Response) -> HealthCheck:
 
     try:
         # Lightweight DB connectivity check
-        session.execute(text('SELECT 1'))
+        await session.execute(text('SELECT 1'))
     except SQLAlchemyError:
         database_status = 'error'
 
@@ -81,3 +91,21 @@ def health_check(session: SessionDep, response: Response) -> HealthCheck:
         database_status=database_status,
         timestamp=datetime.now(timezone.utc),
     )
+
+
+@router.get('/live', response_model=Liveness, summary='Liveness probe')
+async def liveness():
+    """The process is up and its event loop is responsive."""
+    return {'status': 'ok'}
+
+
+@router.get('/ready', response_model=Readiness, summary='Readiness probe')
+async def readiness(response: Response):
+    """
+    Whether this worker should receive traffic: last background database
+    check, pool saturation and hashing backlog. 503 when not ready.
+    """
+    report = readiness_probe.report()
+    if not report['ready']:
+        response.status_code = HTTPStatus.SERVICE_UNAVAILABLE
+    return report
@@ -0,0 +1,100 @@
+from http import HTTPStatus
+
+from fastapi import APIRouter, Response
+
+from fast_zero.database import pool_status, replicas
+from fast_zero.metrics import purger_metrics, route_timings
+from fast_zero.prometheus import CONTENT_TYPE, exposition
+from fast_zero.response_cache import response_cache
+from fast_zero.schemas import (
+    CacheStats,
+    PoolStats,
+    PurgerStats,
+    ReplicaStats,
+    ResponseCacheStats,
+    RouteTimingStats,
+)
+from fast_zero.security import token_cache, user_cache
+
+router = APIRouter(prefix='/metrics', tags=['metrics'])
+
+
+@router.get('', status_code=HTTPStatus.OK, response_class=Response)
+async def read_prometheus_metrics():
+    """
+    Prometheus scrape endpoint: request counts and latency per route
+    template, in-flight requests, pool and password hashing metrics,
+    summed over every worker when `METRICS_MULTIPROC_DIR` is set.
+    """
+    return Response(exposition(), media_type=CONTENT_TYPE)
+
+
+@router.get('/pool', status_code=HTTPStatus.OK, response_model=PoolStats)
+async def read_pool_stats():
+    """
+    Connection pool occupancy and telemetry for the application engine.
+
+    Reports checked-out/idle/overflow connections together with the
+    checkout wait time and connect latency histograms, so the worker
+    count can be sized against Postgres `max_connections`.
+    """
+    return pool_status()
+
+
+@router.get(
+    '/caches',
+    status_code=HTTPStatus.OK,
+    response_model=dict[str, CacheStats],
+)
+async def read_cache_stats():
+    """Hit/miss counters for the application caches."""
+    return {'users': user_cache.stats(), 'tokens': token_cache.stats()}
+
+
+@router.get(
+    '/responses',
+    status_code=HTTPStatus.OK,
+    response_model=dict[str, ResponseCacheStats],
+)
+async def read_response_cache_stats():
+    """
+    Response cache hit ratio per route, with an estimate of the time the
+    hits saved (hits times the average cost of a miss).
+    """
+    return response_cache.stats()
+
+
+@router.get('/purger', status_code=HTTPStatus.OK, response_model=PurgerStats)
+async def read_purger_stats():
+    """
+    Trash purger progress: runs, rows purged, batch durations and, as of
+    the last run, how many trashed rows were past retention (backlog).
+    """
+    return purger_metrics.snapshot()
+
+
+@router.get(
+    '/timings',
+    status_code=HTTPStatus.OK,
+    response_model=dict[str, RouteTimingStats],
+)
+async def read_route_timings():
+    """
+    Per-route histograms of the `Server-Timing` phases (auth, database,
+    endpoint, serialization, total) and of queries per request. Empty
+    unless `SERVER_TIMING` is on.
+    """
+    return route_timings.snapshot()
+
+
+@router.get(
+    '/replicas',
+    status_code=HTTPStatus.OK,
+    response_model=list[ReplicaStats],
+)
+async def read_replica_stats():
+    """
+    Replication lag measured at the last check for each configured read
+    replica, and whether it is in the read rotation.
+    """
+    return replicas.status()
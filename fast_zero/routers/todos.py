@@ -1,56 +1,204 @@
 from http import HTTPStatus
 from typing import Annotated
 
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy import select
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
+from fastapi.responses import StreamingResponse
+from sqlalchemy import (
+    Integer,
+    any_,
+    delete,
+    func,
+    insert,
+    literal,
+    select,
+    update,
+)
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from fast_zero.database import get_session
-from fast_zero.models import Todo, User
+from fast_zero.database import get_read_session, get_session
+from fast_zero.etag import make_etag, not_modified
+from fast_zero.export import MEDIA_TYPES, ExportFormat, stream_todos
+from fast_zero.importer import ImportFormat, import_todos
+from fast_zero.models import Todo, TodoCount, User
+from fast_zero.pagination import keyset, next_page
+from fast_zero.response_cache import response_cache, todos_scope
 from fast_zero.schemas import (
     Message,
+    TodoBulkCreate,
+    TodoBulkDelete,
+    TodoBulkResult,
+    TodoBulkUpdate,
+    TodoImportResult,
     TodoList,
     TodoPublic,
     TodoSchema,
     TodoState,
+    TodoStats,
     TodoUpdate,
 )
+from fast_zero.search import prefix_tsquery
 from fast_zero.security import get_current_user
+from fast_zero.serialization import todo_page
+from fast_zero.settings import get_settings
 
 router = APIRouter(prefix='/todos', tags=['todos'])
+settings = get_settings()
+
+# Colunas de TodoPublic, as únicas que as leituras precisam
+TODO_COLUMNS = (Todo.title, Todo.description, Todo.state, Todo.id)
 
-Session = Annotated[Session, Depends(get_session)]
+Session = Annotated[AsyncSession, Depends(get_session)]
+# Handlers só de leitura: vão para uma réplica quando houver
+ReadSession = Annotated[AsyncSession, Depends(get_read_session)]
 CurrentUser = Annotated[User, Depends(get_current_user)]
 
 
 @router.post('/', response_model=TodoPublic)
-def create_todo(
+async def create_todo(
     todo: TodoSchema,
     session: Session,
     user: CurrentUser,
+    response: Response,
 ):
-    db_todo = Todo(
-        title=todo.title,
-        description=todo.description,
-        state=todo.state,
-        user_id=user.id,
+    # INSERT ... RETURNING: id e updated_at voltam sem um refresh depois
+    db_todo = await session.scalar(
+        insert(Todo)
+        .values(**todo.model_dump(), user_id=user.id)
+        .returning(Todo)
     )
-    session.add(db_todo)
-    session.commit()
-    session.refresh(db_todo)
+    await session.commit()
+    await response_cache.invalidate(todos_scope(user.id))
 
+    response.headers['ETag'] = make_etag(
+        'todo', db_todo.id, db_todo.updated_at
+    )
     return db_todo
 
 
-@router.get('/', response_model=TodoList)
-def list_todos(  # noqa
+def owned_todos(user: User, ids: list[int]):
+    """`WHERE user_id = :user AND id = ANY(:ids)`, with the ids sent as a
+    single array parameter however long the batch is."""
+    return (
+        Todo.user_id == user.id,
+        Todo.id == any_(literal(ids, ARRAY(Integer))),
+    )
+
+
+@router.post('/bulk', response_model=TodoBulkResult)
+async def create_todos(
+    payload: TodoBulkCreate,
+    session: Session,
+    user: CurrentUser,
+):
+    """
+    Create many TODOs in one transaction.
+
+    The rows go out as multi-row `INSERT ... RETURNING` statements, so the
+    created TODOs come back without a refresh per row. Results follow the
+    order of `todos`.
+    """
+    if not payload.todos:
+        return {'results': []}
+
+    todos = await session.scalars(
+        insert(Todo).returning(Todo, sort_by_parameter_order=True),
+        [{**todo.model_dump(), 'user_id': user.id} for todo in payload.todos],
+    )
+    results = [
+        {'id': todo.id, 'status': 'created', 'todo': todo}
+        for todo in todos.all()
+    ]
+    await session.commit()
+    await response_cache.invalidate(todos_scope(user.id))
+
+    return {'results': results}
+
+
+def filter_todos(
+    user: User,
+    title: str | None,
+    description: str | None,
+    state: TodoState | None,
+    tsquery,
+):
+    """The user's todos narrowed by the `list_todos` filters, ranked
+    first when there is a full-text `tsquery`.
+
+    Selects only the `TodoPublic` columns, so results are plain rows: no
+    ORM instances, identity map or unit of work on the read path.
+    """
+    query = select(*TODO_COLUMNS).where(Todo.user_id == user.id)
+
+    if title:
+        query = query.filter(Todo.title.ilike(f'%{title}%'))
+    if description:
+        query = query.filter(Todo.description.ilike(f'%{description}%'))
+    if state:
+        query = query.filter(Todo.state == state)
+
+    if tsquery is not None:
+        query = query.where(Todo.search_vector.bool_op('@@')(tsquery))
+        query = query.order_by(
+            func.ts_rank(Todo.search_vector, tsquery).desc()
+        )
+    return query
+
+
+@router.post('/import', response_model=TodoImportResult)
+async def import_todos_stream(
+    request: Request,
     session: Session,
     user: CurrentUser,
+    format: ImportFormat = 'ndjson',
+):
+    """
+    Import TODOs from an NDJSON or CSV request body.
+
+    The body is consumed as a stream: each record is validated against
+    `TodoSchema` as it arrives and valid ones are loaded with `COPY` in
+    batches of `TODO_IMPORT_CHUNK_SIZE`, all in one transaction. CSV
+    bodies need a `title,description,state` header. Invalid records are
+    skipped and reported by row number (1-based, counting records only);
+    so is a line, or CSV record, longer than `TODO_IMPORT_MAX_LINE_BYTES`.
+    """
+    result = await import_todos(
+        session,
+        request.stream(),
+        format,
+        user.id,
+        settings.TODO_IMPORT_CHUNK_SIZE,
+        settings.TODO_IMPORT_MAX_ERRORS,
+        settings.TODO_IMPORT_MAX_LINE_BYTES,
+    )
+    await session.commit()
+    await response_cache.invalidate(todos_scope(user.id))
+
+    return result
+
+
+async def load_todos(session, query, limit: int | None, ranked: bool):
+    todos, next_cursor = next_page((await session.execute(query)).all(), limit)
+
+    if ranked:
+        # Resultados ranqueados não seguem a ordem por id do cursor
+        next_cursor = None
+    return todos, next_cursor
+
+
+@router.get('/', response_model=TodoList)
+async def list_todos(  # noqa
+    request: Request,
+    response: Response,
+    session: ReadSession,
+    user: CurrentUser,
     title: str | None = None,
     description: str | None = None,
     state: TodoState | None = None,
+    q: str | None = None,
     offset: int | None = None,
     limit: int | None = None,
+    cursor: str | None = None,
 ):
     """
     Retrieve a list of TODOs for the current user with optional
@@ -58,58 +206,254 @@ def list_todos(  # noqa
 
     - Filter by title or description keywords (case-insensitive).
     - Filter by completion state.
-    - Supports pagination via offset and limit.
+    - Full-text search with `q` (stemmed, prefix matching), ranked by
+      relevance with title matches first.
+    - Supports pagination via offset and limit, or via an opaque keyset
+      cursor (`next_cursor` from the previous page), which stays fast on
+      deep pages.
+    - Carries an ETag; `If-None-Match` answers 304 without running the
+      query while none of the user's TODOs changed.
 
     Args:
-        session (Session): SQLAlchemy session dependency.
+        request (Request): Incoming request (query string, headers).
+        response (Response): Response whose ETag header is set.
+        session (AsyncSession): SQLAlchemy async session dependency.
         user (User): Authenticated user dependency.
         title (str | None): Optional title keyword to search.
         description (str | None): Optional description keyword to search.
         state (TodoState | None): Optional state filter.
+        q (str | None): Optional full-text search terms. Results are
+            ranked, so it can't be combined with `cursor`.
         offset (int | None): Optional pagination offset.
         limit (int | None): Optional pagination limit.
+        cursor (str | None): Optional cursor to resume after.
 
     Returns:
-        dict: A dictionary containing the filtered list of TODOs.
+        dict: A dictionary containing the filtered list of TODOs and the
+        cursor of the next page (None on the last page).
     """
-    query = select(Todo).where(Todo.user_id == user.id)
+    tsquery = prefix_tsquery(q) if q else None
+    if tsquery is not None and cursor is not None:
+        raise HTTPException(
+            status_code=HTTPStatus.BAD_REQUEST,
+            detail='Cursor pagination is not available with q',
+        )
 
-    if title:
-        query = query.filter(Todo.title.ilike(f'%{title}%'))
-    if description:
-        query = query.filter(Todo.description.ilike(f'%{description}%'))
-    if state:
-        query = query.filter(Todo.state == state)
+    version = await session.scalar(
+        select(User.todos_version).where(User.id == user.id)
+    )
+    etag = make_etag('todos', user.id, version, request.url.query)
+    if (unchanged := not_modified(request, etag)) is not None:
+        return unchanged
+    response.headers['ETag'] = etag
+
+    query = filter_todos(user, title, description, state, tsquery)
 
     if offset is not None:
         query = query.offset(offset)
-    if limit is not None:
-        query = query.limit(limit)
+    query = keyset(query, Todo.id, cursor, limit)
+    ranked = tsquery is not None
+
+    if response_cache.enabled:
+
+        async def load_body():
+            page = await load_todos(session, query, limit, ranked)
+            return todo_page.dump_json(*page).decode()
+
+        # A versão na chave impede que o corpo fique atrás do ETag mesmo
+        # com escritas que não passam pelos handlers
+        body = await response_cache.get_or_load(
+            'list_todos',
+            todos_scope(user.id),
+            f'{version}:{request.url.query}',
+            load_body,
+        )
+        return Response(
+            body, media_type='application/json', headers={'ETag': etag}
+        )
+
+    todos, next_cursor = await load_todos(session, query, limit, ranked)
+
+    if settings.FAST_LIST_SERIALIZATION:
+        return todo_page.response(todos, next_cursor, {'ETag': etag})
+    return {'todos': todos, 'next_cursor': next_cursor}
+
+
+@router.get('/export', response_class=StreamingResponse)
+async def export_todos(  # noqa
+    session: ReadSession,
+    user: CurrentUser,
+    format: ExportFormat = 'ndjson',
+    title: str | None = None,
+    description: str | None = None,
+    state: TodoState | None = None,
+    q: str | None = None,
+):
+    """
+    Stream every TODO of the current user as NDJSON or CSV.
+
+    Takes the same filters as `list_todos` and keeps the same order, but
+    without pagination: rows are read through a server-side cursor and
+    written out as they arrive, so memory doesn't grow with the account.
+    """
+    tsquery = prefix_tsquery(q) if q else None
+    query = filter_todos(user, title, description, state, tsquery)
+
+    return StreamingResponse(
+        stream_todos(
+            session,
+            query.order_by(Todo.id),
+            format,
+            settings.TODO_EXPORT_CHUNK_SIZE,
+        ),
+        media_type=MEDIA_TYPES[format],
+        headers={
+            'Content-Disposition': f'attachment; filename="todos.{format}"'
+        },
+    )
+
+
+@router.get('/stats', response_model=TodoStats)
+async def read_todo_stats(session: ReadSession, user: CurrentUser):
+    """
+    How many TODOs the current user has in each state.
+
+    Served from the `todo_counts` counters kept by triggers on `todos`:
+    one row per state is read, however many TODOs the user has.
+    """
+    counts = dict.fromkeys(TodoState, 0)
+    counts.update(
+        (
+            await session.execute(
+                select(TodoCount.state, TodoCount.count).where(
+                    TodoCount.user_id == user.id
+                )
+            )
+        ).all()
+    )
+    return {'total': sum(counts.values()), 'states': counts}
+
 
-    todos = session.scalars(query).all()
+@router.patch('/bulk', response_model=TodoBulkResult)
+async def patch_todos(
+    payload: TodoBulkUpdate,
+    session: Session,
+    user: CurrentUser,
+):
+    """
+    Apply many partial updates in one transaction.
+
+    Items carrying the same changes share a single
+    `UPDATE ... WHERE id = ANY(...) RETURNING` statement (the usual "mark
+    these as done" batch is one statement). Each item reports `updated`
+    with the new TODO, or `not_found` when the id isn't one of the user's.
+    """
+    ids = [item.id for item in payload.todos]
+    if len(set(ids)) != len(ids):
+        raise HTTPException(
+            status_code=HTTPStatus.BAD_REQUEST,
+            detail='Duplicate todo ids in batch',
+        )
+
+    groups: dict[tuple, list[int]] = {}
+    for item in payload.todos:
+        changes = item.model_dump(exclude_unset=True, exclude={'id'})
+        groups.setdefault(tuple(sorted(changes.items())), []).append(item.id)
+
+    updated = {}
+    for changes, group_ids in groups.items():
+        if changes:
+            query = (
+                update(Todo)
+                .where(*owned_todos(user, group_ids))
+                .values(dict(changes))
+                .returning(Todo)
+            )
+        else:
+            query = select(Todo).where(*owned_todos(user, group_ids))
+
+        for todo in await session.scalars(query):
+            updated[todo.id] = todo
+    await session.commit()
+    await response_cache.invalidate(todos_scope(user.id))
 
-    return {'todos': todos}
+    return {
+        'results': [
+            {'id': todo_id, 'status': 'updated', 'todo': updated[todo_id]}
+            if todo_id in updated
+            else {'id': todo_id, 'status': 'not_found'}
+            for todo_id in ids
+        ]
+    }
+
+
+@router.delete('/bulk', response_model=TodoBulkResult)
+async def delete_todos(
+    payload: TodoBulkDelete,
+    session: Session,
+    user: CurrentUser,
+):
+    """
+    Delete many TODOs with one `DELETE ... WHERE id = ANY(...)`.
+
+    Each id reports `deleted`, or `not_found` when it isn't one of the
+    user's.
+    """
+    deleted = set(
+        await session.scalars(
+            delete(Todo)
+            .where(*owned_todos(user, payload.ids))
+            .returning(Todo.id)
+        )
+    )
+    await session.commit()
+    await response_cache.invalidate(todos_scope(user.id))
+
+    return {
+        'results': [
+            {
+                'id': todo_id,
+                'status': 'deleted' if todo_id in deleted else 'not_found',
+            }
+            for todo_id in payload.ids
+        ]
+    }
 
 
 @router.delete('/{todo_id}', response_model=Message)
-def delete_todo(todo_id: int, session: Session, user: CurrentUser):
-    todo = session.scalar(
-        select(Todo).where(Todo.user_id == user.id, Todo.id == todo_id)
+async def delete_todo(todo_id: int, session: Session, user: CurrentUser):
+    # Um único DELETE ... RETURNING: sem SELECT prévio da linha
+    deleted = await session.scalar(
+        delete(Todo)
+        .where(Todo.user_id == user.id, Todo.id == todo_id)
+        .returning(Todo.id)
     )
 
-    if not todo:
+    if deleted is None:
         raise HTTPException(
             status_code=HTTPStatus.NOT_FOUND, detail='Task not found.'
         )
+
+    await session.commit()
+    await response_cache.invalidate(todos_scope(user.id))
     return {'message': 'Task has been deleted successfully.'}
 
 
 @router.patch('/{todo_id}', response_model=TodoPublic)
-def patch_todo(
-    todo_id: int, session: Session, user: CurrentUser, todo: TodoUpdate
+async def patch_todo(
+    todo_id: int,
+    session: Session,
+    user: CurrentUser,
+    todo: TodoUpdate,
+    response: Response,
 ):
-    db_todo = session.scalar(
-        select(Todo).where(Todo.user_id == user.id, Todo.id == todo_id)
+    # Um único UPDATE ... RETURNING: sem SELECT antes nem refresh depois
+    query = select(Todo)
+    changes = todo.model_dump(exclude_unset=True)
+    if changes:
+        query = update(Todo).values(changes).returning(Todo)
+    db_todo = await session.scalar(
+        query.where(Todo.user_id == user.id, Todo.id == todo_id)
     )
 
     if not db_todo:
@@ -117,11 +461,10 @@ def patch_todo(
             status_code=HTTPStatus.NOT_FOUND, detail='Task not found.'
         )
 
-    for key, value in todo.model_dump(exclude_unset=True).items():
-        setattr(db_todo, key, value)
-
-    session.add(db_todo)
-    session.commit()
-    session.refresh(db_todo)
+    await session.commit()
+    await response_cache.invalidate(todos_scope(user.id))
 
+    response.headers['ETag'] = make_etag(
+        'todo', db_todo.id, db_todo.updated_at
+    )
     return db_todo
@@ -1,75 +1,163 @@
 from http import HTTPStatus
 from typing import Annotated
 
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy import select
-from sqlalchemy.orm import Session
-
-from fast_zero.database import get_session
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
+from sqlalchemy import select, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from fast_zero.database import get_read_session, get_session, read_source
+from fast_zero.etag import make_etag, not_modified
+from fast_zero.hashing import hash_password
 from fast_zero.models import User
+from fast_zero.pagination import keyset, next_page
+from fast_zero.response_cache import (
+    USERS_SCOPE,
+    response_cache,
+    todos_scope,
+    user_scope,
+)
 from fast_zero.schemas import Message, UserList, UserPublic, UserSchema
-from fast_zero.security import get_current_user, get_password_hash
+from fast_zero.security import get_current_user, invalidate_cached_user
+from fast_zero.serialization import dump_user, user_page
+from fast_zero.settings import get_settings
 
 router = APIRouter(prefix='/users', tags=['users'])
-T_Session = Annotated[Session, Depends(get_session)]
+settings = get_settings()
+
+# Colunas de UserPublic: a listagem não carrega senha nem timestamps
+USER_COLUMNS = (User.id, User.username, User.email)
+T_Session = Annotated[AsyncSession, Depends(get_session)]
+T_ReadSession = Annotated[AsyncSession, Depends(get_read_session)]
 T_CurrentUser = Annotated[User, Depends(get_current_user)]
 
 
-@router.post('/', status_code=HTTPStatus.CREATED, response_model=UserPublic)
-def create_user(user: UserSchema, session: T_Session):
-    db_user = session.scalar(
-        select(User).where(
+async def _already_taken(session, user: UserSchema) -> str | None:
+    """Why `user` can't sign up (username or email in use), or None."""
+    taken = await session.scalar(
+        select(User.username).where(
             (User.username == user.username) | (User.email == user.email)
         )
     )
+    if taken is None:
+        return None
+    if taken != user.username:
+        return 'Email already exists'
+    return 'Username already exists'
 
-    if db_user:
-        if db_user.username == user.username:
-            raise HTTPException(
-                status_code=HTTPStatus.BAD_REQUEST,
-                detail='Username already exists',
-            )
-        elif db_user.email == user.email:
-            raise HTTPException(
-                status_code=HTTPStatus.BAD_REQUEST,
-                detail='Email already exists',
-            )
 
-    db_user = User(
-        username=user.username,
-        email=user.email,
-        password=get_password_hash(user.password),
+@router.post('/', status_code=HTTPStatus.CREATED, response_model=UserPublic)
+async def create_user(user: UserSchema, session: T_Session):
+    """Create a user.
+
+    Duplicates are rejected by a lookup before the password is hashed, so
+    repeated signups for a taken name don't occupy the hashing pool. The
+    INSERT ... ON CONFLICT DO NOTHING still settles a race between two
+    signups that both passed the lookup.
+    """
+    if (detail := await _already_taken(session, user)) is not None:
+        raise HTTPException(status_code=HTTPStatus.BAD_REQUEST, detail=detail)
+
+    db_user = await session.scalar(
+        pg_insert(User)
+        .values(
+            username=user.username,
+            email=user.email,
+            password=await hash_password(user.password),
+        )
+        .on_conflict_do_nothing()
+        .returning(User)
     )
-    session.add(db_user)
-    session.commit()
-    session.refresh(db_user)
+
+    if db_user is None:
+        raise HTTPException(
+            status_code=HTTPStatus.BAD_REQUEST,
+            detail=await _already_taken(session, user)
+            or 'Username already exists',
+        )
+
+    await session.commit()
+    await response_cache.invalidate(USERS_SCOPE)
 
     return db_user
 
 
 @router.get('/', status_code=HTTPStatus.OK, response_model=UserList)
-def read_users(
-    session: T_Session,
+async def read_users(
+    request: Request,
+    session: T_ReadSession,
     limit: int = 10,
     skip: int = 0,
+    cursor: str | None = None,
 ):
-    users = session.scalars(select(User).limit(limit).offset(skip))
-    return {'users': users}
+    query = keyset(select(*USER_COLUMNS).offset(skip), User.id, cursor, limit)
+
+    async def load_page():
+        return next_page((await session.execute(query)).all(), limit)
+
+    if response_cache.enabled:
+
+        async def load_body():
+            return user_page.dump_json(*await load_page()).decode()
+
+        body = await response_cache.get_or_load(
+            'read_users',
+            USERS_SCOPE,
+            f'{read_source(session)}:{request.url.query}',
+            load_body,
+        )
+        return Response(body, media_type='application/json')
+
+    users, next_cursor = await load_page()
+
+    if settings.FAST_LIST_SERIALIZATION:
+        return user_page.response(users, next_cursor)
+    return {'users': users, 'next_cursor': next_cursor}
 
 
 @router.get('/{id}', status_code=HTTPStatus.OK, response_model=UserPublic)
-def read_user(id: int, session: T_Session):
-    user = session.scalar(select(User).where(User.id == id))
-    if not user:
-        raise HTTPException(
-            status_code=HTTPStatus.NOT_FOUND, detail='User ID not found'
+async def read_user(
+    id: int, session: T_ReadSession, request: Request, response: Response
+):
+    async def load_user():
+        user = (
+            await session.execute(
+                select(*USER_COLUMNS, User.updated_at).where(User.id == id)
+            )
+        ).first()
+        if not user:
+            raise HTTPException(
+                status_code=HTTPStatus.NOT_FOUND, detail='User ID not found'
+            )
+        return user, make_etag('user', user.id, user.updated_at)
+
+    if response_cache.enabled:
+
+        async def load_cached():
+            user, etag = await load_user()
+            return {'body': dump_user(user).decode(), 'etag': etag}
+
+        cached = await response_cache.get_or_load(
+            'read_user', user_scope(id), read_source(session), load_cached
+        )
+        if (unchanged := not_modified(request, cached['etag'])) is not None:
+            return unchanged
+        return Response(
+            cached['body'],
+            media_type='application/json',
+            headers={'ETag': cached['etag']},
         )
 
+    user, etag = await load_user()
+    if (unchanged := not_modified(request, etag)) is not None:
+        return unchanged
+    response.headers['ETag'] = etag
+
     return user
 
 
 @router.put('/{user_id}', response_model=UserPublic)
-def update_user(
+async def update_user(
     user_id: int,
     user: UserSchema,
     session: T_Session,
@@ -80,18 +168,29 @@ def update_user(
             status_code=HTTPStatus.FORBIDDEN, detail='Not enough permission'
         )
 
-    current_user.email = user.email
-    current_user.username = user.username
-    current_user.password = get_password_hash(user.password)
+    old_email = current_user.email
 
-    session.commit()
-    session.refresh(current_user)
+    # UPDATE ... RETURNING: updated_at volta sem um refresh depois
+    db_user = await session.scalar(
+        update(User)
+        .where(User.id == user_id)
+        .values(
+            email=user.email,
+            username=user.username,
+            password=await hash_password(user.password),
+        )
+        .returning(User)
+    )
+
+    await session.commit()
+    await invalidate_cached_user(old_email)
+    await response_cache.invalidate(USERS_SCOPE, user_scope(user_id))
 
-    return current_user
+    return db_user
 
 
 @router.delete('/{user_id}', response_model=Message)
-def delete_user(
+async def delete_user(
     user_id: int,
     session: T_Session,
     current_user: T_CurrentUser,
@@ -101,7 +200,11 @@ def delete_user(
             status_code=HTTPStatus.FORBIDDEN, detail='Not enough permission'
         )
 
-    session.delete(current_user)
-    session.commit()
+    await session.delete(current_user)
+    await session.commit()
+    await invalidate_cached_user(current_user.email)
+    await response_cache.invalidate(
+        USERS_SCOPE, user_scope(user_id), todos_scope(user_id)
+    )
 
     return {'message': 'User deleted'}
@@ -1,9 +1,13 @@
 from datetime import datetime
 from typing import Literal
 
-from pydantic import BaseModel, ConfigDict, EmailStr
+from pydantic import BaseModel, ConfigDict, EmailStr, Field
 
 from fast_zero.models import TodoState
+from fast_zero.settings import get_settings
+
+# Lotes maiores são recusados na validação, antes de validar cada item
+MAX_BULK_ITEMS = get_settings().TODO_BULK_MAX_ITEMS
 
 
 class Message(BaseModel):
@@ -29,6 +33,7 @@ class UserPublic(BaseModel):
 
 class UserList(BaseModel):
     users: list[UserPublic]
+    next_cursor: str | None = None
 
 
 class Token(BaseModel):
@@ -48,6 +53,7 @@ class TodoPublic(TodoSchema):
 
 class TodoList(BaseModel):
     todos: list[TodoPublic]
+    next_cursor: str | None = None
 
 
 class TodoUpdate(BaseModel):
@@ -56,7 +62,115 @@ class TodoUpdate(BaseModel):
     state: TodoState | None = None
 
 
+class TodoBulkCreate(BaseModel):
+    todos: list[TodoSchema] = Field(max_length=MAX_BULK_ITEMS)
+
+
+class TodoBulkUpdateItem(TodoUpdate):
+    id: int
+
+
+class TodoBulkUpdate(BaseModel):
+    todos: list[TodoBulkUpdateItem] = Field(max_length=MAX_BULK_ITEMS)
+
+
+class TodoBulkDelete(BaseModel):
+    ids: list[int] = Field(max_length=MAX_BULK_ITEMS)
+
+
+class TodoBulkItem(BaseModel):
+    id: int
+    status: Literal['created', 'updated', 'deleted', 'not_found']
+    todo: TodoPublic | None = None
+
+
+class TodoBulkResult(BaseModel):
+    results: list[TodoBulkItem]
+
+
+class TodoStats(BaseModel):
+    total: int
+    states: dict[TodoState, int]
+
+
+class TodoImportError(BaseModel):
+    row: int
+    detail: str
+
+
+class TodoImportResult(BaseModel):
+    accepted: int
+    rejected: int
+    errors: list[TodoImportError]
+
+
 class HealthCheck(BaseModel):
     app_status: Literal['ok', 'error']
     database_status: Literal['ok', 'error']
     timestamp: datetime
+
+
+class Liveness(BaseModel):
+    status: Literal['ok']
+
+
+class Readiness(BaseModel):
+    ready: bool
+    reasons: list[str]
+    database_status: Literal['ok', 'error', 'stale', 'unknown']
+    database_latency_ms: float | None
+    database_checked_seconds_ago: float | None
+    pool_checked_out: int
+    pool_max_connections: int
+    hashing_pending: int
+    hashing_max_pending: int
+
+
+class HistogramSnapshot(BaseModel):
+    count: int
+    sum: float
+    buckets: dict[str, int]
+
+
+class CacheStats(BaseModel):
+    hits: int
+    misses: int
+    hit_ratio: float
+
+
+class ResponseCacheStats(CacheStats):
+    saved_seconds: float
+
+
+class PoolStats(BaseModel):
+    pool_size: int
+    max_overflow: int
+    max_connections: int
+    checked_out: int
+    checked_in: int
+    overflow: int
+    connects: int
+    checkouts: int
+    invalidations: int
+    wait_seconds: HistogramSnapshot
+    connect_seconds: HistogramSnapshot
+
+
+class RouteTimingStats(BaseModel):
+    phases: dict[str, HistogramSnapshot]
+    queries: HistogramSnapshot
+
+
+class ReplicaStats(BaseModel):
+    replica: int
+    lag_seconds: float | None
+    in_rotation: bool
+
+
+class PurgerStats(BaseModel):
+    runs: int
+    purged: int
+    backlog: int
+    trashed: int
+    last_run_at: datetime | None
+    batch_seconds: HistogramSnapshot
@@ -0,0 +1,33 @@
+"""Full-text search over todos.
+
+`todos.search_vector` is a stored generated `tsvector` (title weighted
+above description), indexed with GIN. User input is turned into a
+prefix `tsquery`, so `q=mil` finds "milk" and `q=running` finds "runs".
+"""
+
+import re
+
+from sqlalchemy import func
+
+SEARCH_CONFIG = 'english'
+
+# Mantido em sincronia com a coluna gerada na migração c3f8a1e6d2b7
+SEARCH_VECTOR = (
+    f"setweight(to_tsvector('{SEARCH_CONFIG}', coalesce(title, '')), 'A') || "
+    f"setweight(to_tsvector('{SEARCH_CONFIG}', coalesce(description, '')), "
+    "'B')"
+)
+
+
+def prefix_tsquery(text: str):
+    """Build a `tsquery` matching every word of `text` as a prefix.
+
+    Returns None when `text` has no searchable words.
+    """
+    terms = re.findall(r'\w+', text)
+    if not terms:
+        return None
+
+    return func.to_tsquery(
+        SEARCH_CONFIG, ' & '.join(f'{term}:*' for term in terms)
+    )
@@ -1,30 +1,55 @@
 from datetime import datetime, timedelta
+from hashlib import blake2b
 from http import HTTPStatus
+from time import time
 
 from fastapi import Depends, HTTPException
 from fastapi.security import OAuth2PasswordBearer
 from jwt import decode, encode
 from jwt.exceptions import DecodeError, ExpiredSignatureError
-from pwdlib import PasswordHash
 from sqlalchemy import select
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import make_transient_to_detached
 from zoneinfo import ZoneInfo
 
+from fast_zero.cache import Cache, CacheBackend, MemoryBackend, RedisBackend
 from fast_zero.database import get_session
 from fast_zero.models import User
-from fast_zero.settings import Settings
+from fast_zero.settings import get_settings
+from fast_zero.timing import phase
 
-pwd_context = PasswordHash.recommended()
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl='/auth/token')
-settings = Settings()
+settings = get_settings()
 
 
-def get_password_hash(password: str):
-    return pwd_context.hash(password)
+def _user_cache_backend() -> CacheBackend:
+    """Per-process store, or a shared one with `USER_CACHE_REDIS_URL`.
 
+    Invalidation only reaches the backend of the worker that changed the
+    user: with the in-memory store, other workers keep serving a deleted
+    or updated user for up to `USER_CACHE_TTL` seconds.
+    """
+    if settings.USER_CACHE_REDIS_URL is None:
+        return MemoryBackend(maxsize=settings.USER_CACHE_MAXSIZE)
+    # Dependência opcional: só é necessária com o cache compartilhado
+    from redis.asyncio import Redis  # noqa: PLC0415
 
-def verify_password(plain_password: str, hashed_password: str):
-    return pwd_context.verify(plain_password, hashed_password)
+    return RedisBackend(
+        Redis.from_url(settings.USER_CACHE_REDIS_URL),
+        prefix='fast_zero:user:',
+    )
+
+
+# Usuários autenticados, indexados pelo `sub` do token (email). O hash da
+# senha não entra no cache: com o token verificado, ele não é necessário.
+user_cache = Cache(_user_cache_backend(), ttl=settings.USER_CACHE_TTL)
+
+# Claims já verificados, indexados por um digest do token. Cada entrada
+# expira junto com o próprio token (`exp`).
+token_cache = Cache(
+    MemoryBackend(maxsize=settings.TOKEN_CACHE_MAXSIZE),
+    ttl=settings.ACCESS_TOKEN_EXPIRE_MINUTES * 60,
+)
 
 
 def create_access_token(data: dict):
@@ -43,8 +68,61 @@ def create_access_token(data: dict):
     return encoded_jwt
 
 
-def get_current_user(
-    session: Session = Depends(get_session),
+def _dump_user(user: User) -> dict:
+    return {
+        'id': user.id,
+        'username': user.username,
+        'email': user.email,
+        'created_at': user.created_at.isoformat(),
+        'updated_at': user.updated_at and user.updated_at.isoformat(),
+    }
+
+
+def _load_user(data: dict) -> User:
+    user = User(
+        username=data['username'],
+        password='',
+        email=data['email'],
+    )
+    # Sem senha no cache: o atributo fica por carregar e o merge com
+    # load=False não o copia para a instância da sessão
+    del user.password
+    user.id = data['id']
+    user.created_at = datetime.fromisoformat(data['created_at'])
+    user.updated_at = data['updated_at'] and datetime.fromisoformat(
+        data['updated_at']
+    )
+    # Marca o objeto como já carregado do banco, sem pendências
+    make_transient_to_detached(user)
+    return user
+
+
+async def invalidate_cached_user(email: str):
+    await user_cache.invalidate(email)
+
+
+async def decode_token(token: str) -> dict:
+    """Verify `token` and return its claims, skipping repeated checks.
+
+    Raises the same `jwt` exceptions as `jwt.decode`.
+    """
+    key = blake2b(token.encode(), digest_size=16).hexdigest()
+
+    payload = await token_cache.get(key)
+    if payload is not None and payload['exp'] > time():
+        return payload
+
+    payload = decode(
+        token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM]
+    )
+    if 'exp' in payload:
+        await token_cache.set(key, payload, ttl=payload['exp'] - time())
+
+    return payload
+
+
+async def get_current_user(
+    session: AsyncSession = Depends(get_session),
     token: str = Depends(oauth2_scheme),
 ):
     credentials_exception = HTTPException(
@@ -54,9 +132,8 @@ def get_current_user(
     )
 
     try:
-        payload = decode(
-            token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM]
-        )
+        with phase('jwt'):
+            payload = await decode_token(token)
         username: str = payload.get('sub')
         if not username:
             raise credentials_exception
@@ -67,11 +144,19 @@ def get_current_user(
     except ExpiredSignatureError:
         raise credentials_exception
 
-    user = session.scalar(select(User).where(User.email == username))
+    with phase('user'):
+        cached = await user_cache.get(username)
+        if cached is not None:
+            # Anexa à sessão sem consultar o banco (load=False)
+            return await session.merge(_load_user(cached), load=False)
+
+        user = await session.scalar(select(User).where(User.email == username))
 
     if not user:
         raise credentials_exception
 
+    await user_cache.set(username, _dump_user(user))
+
     return user
 
 
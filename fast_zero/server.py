@@ -0,0 +1,216 @@
+"""Production server: preforked uvicorn workers under a small supervisor.
+
+    python -m fast_zero.server
+
+The supervisor binds the listening socket, imports the app once and
+forks `SERVER_WORKERS` workers (default: one per available CPU), so the
+code and everything built at import is shared copy-on-write. Each worker
+runs uvicorn on uvloop and httptools.
+
+- Recycling: a worker exits gracefully after `SERVER_MAX_REQUESTS` plus
+  a random jitter of up to `SERVER_MAX_REQUESTS_JITTER` requests, and is
+  replaced. The jitter keeps workers from restarting all at once.
+- Shutdown: on SIGTERM/SIGINT every worker stops accepting connections,
+  drains in-flight requests for up to `SERVER_GRACEFUL_TIMEOUT` seconds
+  and runs the lifespan shutdown, which closes the engine pools.
+  Workers still alive after that are killed.
+- Connection budget: with `DATABASE_MAX_CONNECTIONS` set, pool size and
+  overflow are scaled down so that workers x (pool + overflow) stays
+  within it. Password hashing workers are split across the server
+  workers the same way, unless `PASSWORD_HASH_WORKERS` is set.
+
+Startup work that must not be shared across processes (connections,
+hashing pools, background jobs) happens in each worker's lifespan.
+"""
+
+import logging
+import os
+import random
+import signal
+import sys
+import time
+from pathlib import Path
+
+from uvicorn import Config, Server
+
+from fast_zero.settings import Settings, get_settings
+
+# Mesmo logger (e formato) das mensagens do próprio uvicorn
+logger = logging.getLogger('uvicorn.error')
+
+# Intervalo do laço do supervisor; um worker que falha antes de
+# MIN_LIFETIME segundos só é reposto depois de RESPAWN_DELAY
+POLL_INTERVAL = 0.1
+MIN_LIFETIME = 5.0
+RESPAWN_DELAY = 1.0
+
+
+def available_cpus() -> int:
+    try:
+        # Respeita o cpuset do container, ao contrário de os.cpu_count()
+        return len(os.sched_getaffinity(0))
+    except AttributeError:
+        return os.cpu_count() or 1
+
+
+def worker_count(settings: Settings) -> int:
+    return settings.SERVER_WORKERS or available_cpus()
+
+
+def per_worker_overrides(settings: Settings, workers: int) -> dict:
+    """Environment overrides that fit every worker into the budgets."""
+    overrides = {}
+    if settings.PASSWORD_HASH_WORKERS is None:
+        overrides['PASSWORD_HASH_WORKERS'] = max(
+            available_cpus() // workers, 1
+        )
+
+    budget = settings.DATABASE_MAX_CONNECTIONS
+    if budget is not None:
+        per_worker = budget // workers
+        if per_worker < 1:
+            raise ValueError(
+                f'DATABASE_MAX_CONNECTIONS={budget} is not enough '
+                f'for {workers} workers'
+            )
+        pool_size = min(settings.DATABASE_POOL_SIZE, per_worker)
+        overrides['DATABASE_POOL_SIZE'] = pool_size
+        overrides['DATABASE_MAX_OVERFLOW'] = min(
+            settings.DATABASE_MAX_OVERFLOW, per_worker - pool_size
+        )
+    return {name: str(value) for name, value in overrides.items()}
+
+
+def max_requests(settings: Settings) -> int | None:
+    """This worker's request limit, jittered; None for no limit."""
+    if settings.SERVER_MAX_REQUESTS <= 0:
+        return None
+    return settings.SERVER_MAX_REQUESTS + random.randint(
+        0, settings.SERVER_MAX_REQUESTS_JITTER
+    )
+
+
+class Supervisor:
+    def __init__(self, app, settings: Settings, workers: int):
+        self.settings = settings
+        self.workers = workers
+        self.config = Config(
+            app,
+            host=settings.SERVER_HOST,
+            port=settings.SERVER_PORT,
+            loop='uvloop',
+            http='httptools',
+            lifespan='on',
+            timeout_keep_alive=settings.SERVER_KEEPALIVE,
+            timeout_graceful_shutdown=settings.SERVER_GRACEFUL_TIMEOUT,
+        )
+        # pid -> quando o worker subiu
+        self.children: dict[int, float] = {}
+        self.stopping = False
+
+    def spawn(self, sock):
+        pid = os.fork()
+        if pid:
+            self.children[pid] = time.monotonic()
+            return
+
+        # Processo filho: sinais voltam ao padrão até o uvicorn assumir
+        signal.signal(signal.SIGTERM, signal.SIG_DFL)
+        signal.signal(signal.SIGINT, signal.SIG_DFL)
+        random.seed()
+        self.config.limit_max_requests = max_requests(self.settings)
+        server = Server(self.config)
+        status = 1
+        try:
+            server.run(sockets=[sock])
+            # Sem `started`, o lifespan falhou ao subir
+            status = 0 if server.started else 3
+        finally:
+            os._exit(status)
+
+    def stop(self, signum, frame):
+        self.stopping = True
+
+    def reap(self) -> bool:
+        """Forget workers that exited; True if one failed right away."""
+        failed = False
+        while self.children:
+            pid, status = os.waitpid(-1, os.WNOHANG)
+            if not pid:
+                break
+            started = self.children.pop(pid)
+            code = os.waitstatus_to_exitcode(status)
+            # Na parada, sair pelo SIGTERM repassado é o esperado
+            if self.stopping or not code:
+                continue
+            logger.warning('Worker %d exited with status %d', pid, code)
+            if time.monotonic() - started < MIN_LIFETIME:
+                failed = True
+        return failed
+
+    def shutdown(self):
+        for pid in self.children:
+            os.kill(pid, signal.SIGTERM)
+
+        # Margem para o shutdown do lifespan depois da drenagem
+        deadline = time.monotonic() + self.settings.SERVER_GRACEFUL_TIMEOUT + 5
+        while self.children and time.monotonic() < deadline:
+            self.reap()
+            time.sleep(POLL_INTERVAL)
+
+        for pid in self.children:
+            logger.warning('Worker %d did not stop in time, killing it', pid)
+            os.kill(pid, signal.SIGKILL)
+        while self.children:
+            self.children.pop(os.waitpid(-1, 0)[0], None)
+
+    def run(self):
+        sock = self.config.bind_socket()
+        signal.signal(signal.SIGTERM, self.stop)
+        signal.signal(signal.SIGINT, self.stop)
+
+        for _ in range(self.workers):
+            self.spawn(sock)
+        logger.info('Started %d workers', self.workers)
+
+        while not self.stopping:
+            time.sleep(POLL_INTERVAL)
+            if self.reap():
+                # Evita um laço de forks quando o worker nem consegue subir
+                time.sleep(RESPAWN_DELAY)
+            # Reciclagem (limite de requisições) ou queda: repõe
+            while not self.stopping and len(self.children) < self.workers:
+                self.spawn(sock)
+
+        self.shutdown()
+        sock.close()
+
+
+def clear_metrics_dir(directory: str):
+    for path in Path(directory).glob('*.json'):
+        path.unlink()
+
+
+def main():
+    settings = get_settings()
+    workers = worker_count(settings)
+
+    try:
+        os.environ.update(per_worker_overrides(settings, workers))
+    except ValueError as exc:
+        sys.exit(str(exc))
+    get_settings.cache_clear()
+    settings = get_settings()
+
+    if settings.METRICS_MULTIPROC_DIR:
+        # Snapshots de uma execução anterior não podem somar nesta
+        clear_metrics_dir(settings.METRICS_MULTIPROC_DIR)
+
+    # Pré-carrega o app: os workers herdam os módulos já importados
+    from fast_zero.app import app  # noqa: PLC0415
+
+    Supervisor(app, settings, workers).run()
+
+
+if __name__ == '__main__':
+    main()
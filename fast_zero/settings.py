@@ -1,3 +1,5 @@
+from functools import lru_cache
+
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
@@ -6,6 +8,102 @@ class Settings(BaseSettings):
         env_file='.env', env_file_encoding='utf-8', extra='ignore'
     )
     DATABASE_URL: str
+    # Assíncrono (AsyncEngine + psycopg async) ou engine síncrona clássica
+    DATABASE_ASYNC: bool = True
+    # Pool de conexões (defaults iguais aos do QueuePool do SQLAlchemy)
+    DATABASE_POOL_SIZE: int = 5
+    DATABASE_MAX_OVERFLOW: int = 10
+    DATABASE_POOL_TIMEOUT: float = 30.0
+    DATABASE_POOL_RECYCLE: int = -1
+    DATABASE_POOL_PRE_PING: bool = False
+    DATABASE_POOL_USE_LIFO: bool = False
+    # Conexões que todos os workers juntos podem abrir (abaixo do
+    # max_connections do Postgres); None: cada worker usa o pool inteiro
+    DATABASE_MAX_CONNECTIONS: int | None = None
+    # Réplicas de leitura (JSON: '["postgresql+psycopg://..."]'); saem da
+    # rotação quando o atraso passa de REPLICA_MAX_LAG segundos
+    DATABASE_REPLICA_URLS: list[str] = []
+    REPLICA_MAX_LAG: float = 5.0
+    REPLICA_CHECK_INTERVAL: float = 2.0
+    REPLICA_CHECK_TIMEOUT: float = 1.0
+    # Quem acabou de escrever lê do primário por este tempo
+    READ_YOUR_WRITES_SECONDS: float = 10.0
+    READ_YOUR_WRITES_MAXSIZE: int = 10000
     SECRET_KEY: str
+    # Custo do argon2 e pool de processos para hashing de senhas
+    ARGON2_TIME_COST: int = 3
+    ARGON2_MEMORY_COST: int = 65536
+    ARGON2_PARALLELISM: int = 4
+    PASSWORD_HASH_WORKERS: int | None = None
+    PASSWORD_HASH_MAX_PENDING: int = 64
+    PASSWORD_HASH_RETRY_AFTER: int = 1
     ALGORITHM: str
     ACCESS_TOKEN_EXPIRE_MINUTES: int
+    # Cache de usuários autenticados (TTL <= 0 desliga o cache). Em memória,
+    # cada worker só vê as próprias invalidações: um usuário removido ou
+    # alterado em outro worker ainda autentica por até USER_CACHE_TTL
+    # segundos. Com USER_CACHE_REDIS_URL (requer o pacote redis) o cache é
+    # compartilhado e a invalidação vale para todos.
+    USER_CACHE_TTL: float = 5.0
+    USER_CACHE_MAXSIZE: int = 1024
+    USER_CACHE_REDIS_URL: str | None = None
+    # Claims de tokens já verificados (0 desliga o cache)
+    TOKEN_CACHE_MAXSIZE: int = 4096
+    # Máximo de itens por requisição nos endpoints /todos/bulk
+    TODO_BULK_MAX_ITEMS: int = 1000
+    # Linhas buscadas por vez (cursor no servidor) em GET /todos/export
+    TODO_EXPORT_CHUNK_SIZE: int = 1000
+    # Importação via COPY: linhas por lote e erros listados na resposta
+    TODO_IMPORT_CHUNK_SIZE: int = 5000
+    TODO_IMPORT_MAX_ERRORS: int = 100
+    # Linha (ou registro CSV) maior que isso vira erro e é descartada
+    TODO_IMPORT_MAX_LINE_BYTES: int = 65536
+    # Serializa GET /todos/ e GET /users/ sem revalidar cada linha
+    FAST_LIST_SERIALIZATION: bool = False
+    # Cache de respostas de leitura (TTL <= 0 desliga o cache)
+    RESPONSE_CACHE_TTL: float = 5.0
+    RESPONSE_CACHE_MAXSIZE: int = 4096
+    # Expurgo em lotes de tarefas na lixeira (intervalo <= 0 desliga)
+    TRASH_RETENTION_DAYS: float = 30.0
+    TRASH_PURGE_INTERVAL: float = 3600.0
+    TRASH_PURGE_BATCH_SIZE: int = 500
+    TRASH_PURGE_MAX_BATCHES: int = 1000
+    TRASH_PURGE_PAUSE: float = 0.1
+    # Reconciliação dos contadores de GET /todos/stats (<= 0 desliga)
+    TODO_COUNTS_RECONCILE_INTERVAL: float = 86400.0
+    # Cabeçalho Server-Timing e histogramas por rota/fase
+    SERVER_TIMING: bool = False
+    # Métricas Prometheus em GET /metrics; com vários workers, cada um
+    # grava um snapshot neste diretório (esvaziado antes de subir o servidor)
+    REQUEST_METRICS: bool = True
+    METRICS_MULTIPROC_DIR: str | None = None
+    METRICS_SNAPSHOT_INTERVAL: float = 5.0
+    # GET /health/ready: verificação do banco em segundo plano (intervalo
+    # <= 0 desliga) e limites de saturação, em fração da capacidade
+    HEALTH_PROBE_INTERVAL: float = 5.0
+    HEALTH_PROBE_TIMEOUT: float = 2.0
+    HEALTH_PROBE_MAX_AGE: float = 30.0
+    HEALTH_POOL_SATURATION: float = 1.0
+    HEALTH_HASHING_BACKLOG: float = 0.9
+    # Aquecimento no lifespan: conexões abertas, workers de hashing e
+    # mappers do ORM prontos antes da primeira requisição
+    STARTUP_WARMUP: bool = True
+    WARMUP_CONNECTIONS: int = 2
+    WARMUP_TIMEOUT: float = 10.0
+    # Servidor de produção (python -m fast_zero.server); SERVER_WORKERS
+    # None: um por CPU. Workers reciclados a cada SERVER_MAX_REQUESTS
+    # (+ jitter) requisições; 0 desliga
+    SERVER_HOST: str = '0.0.0.0'
+    SERVER_PORT: int = 8000
+    SERVER_WORKERS: int | None = None
+    SERVER_MAX_REQUESTS: int = 10000
+    SERVER_MAX_REQUESTS_JITTER: int = 1000
+    SERVER_GRACEFUL_TIMEOUT: int = 30
+    SERVER_KEEPALIVE: int = 5
+
+
+@lru_cache
+def get_settings() -> Settings:
+    """The settings of this process; the environment and `.env` are read
+    once, on the first call."""
+    return Settings()
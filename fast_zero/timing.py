@@ -0,0 +1,183 @@
+"""Per-request phase timings and the `Server-Timing` header.
+
+`ServerTimingMiddleware` opens a `RequestTimings` for every HTTP request
+in a context variable; the code being measured adds to it:
+
+- `jwt` and `user`: token decoding and user lookup in `get_current_user`;
+- `db`: every statement run through the engine, with the query count
+  (see `database.instrument_queries`);
+- `endpoint`: the path operation function itself;
+- `serialize`: from the endpoint's return to the response start, i.e.
+  `response_model` validation and JSON encoding;
+- `total`: from the request to the response start.
+
+Phases overlap (`user` includes its query, `endpoint` its `db` time).
+Work done after the response starts, like a streamed body, is not
+counted. The timings go out in `Server-Timing` and into `route_timings`.
+
+Enabled with `SERVER_TIMING`. When off, nothing is installed and `phase`
+costs one context variable lookup.
+"""
+
+from asyncio import iscoroutinefunction
+from contextlib import contextmanager, nullcontext
+from contextvars import ContextVar
+from functools import wraps
+from time import perf_counter
+
+from fastapi.routing import APIRoute
+from starlette.datastructures import MutableHeaders
+
+from fast_zero.metrics import route_timings
+
+# Sem estado: uma instância serve a todas as chamadas com timing desligado
+_NOOP = nullcontext()
+
+_current: ContextVar['RequestTimings | None'] = ContextVar(
+    'request_timings', default=None
+)
+
+
+class RequestTimings:
+    __slots__ = ('endpoint_done', 'phases', 'queries')
+
+    def __init__(self):
+        self.phases: dict[str, float] = {}
+        self.queries = 0
+        self.endpoint_done: float | None = None
+
+    def add(self, name: str, seconds: float):
+        self.phases[name] = self.phases.get(name, 0.0) + seconds
+
+    def header(self) -> str:
+        entries = []
+        for name, seconds in self.phases.items():
+            entry = f'{name};dur={seconds * 1000:.2f}'
+            if name == 'db':
+                entry += f';desc="{self.queries} queries"'
+            entries.append(entry)
+        return ', '.join(entries)
+
+
+def current() -> RequestTimings | None:
+    """Timings of the request being handled, if timing is enabled."""
+    return _current.get()
+
+
+@contextmanager
+def collect():
+    """Collect into a new `RequestTimings` while inside the block."""
+    timings = RequestTimings()
+    token = _current.set(timings)
+    try:
+        yield timings
+    finally:
+        _current.reset(token)
+
+
+class _Phase:
+    __slots__ = ('name', 'started', 'timings')
+
+    def __init__(self, timings: RequestTimings, name: str):
+        self.timings = timings
+        self.name = name
+
+    def __enter__(self):
+        self.started = perf_counter()
+
+    def __exit__(self, *exc_info):
+        self.timings.add(self.name, perf_counter() - self.started)
+
+
+def phase(name: str):
+    """Context manager adding the time spent inside it to `name`."""
+    timings = _current.get()
+    if timings is None:
+        return _NOOP
+    return _Phase(timings, name)
+
+
+def _timed_endpoint(call):
+    if iscoroutinefunction(call):
+
+        @wraps(call)
+        async def endpoint(**values):
+            started = perf_counter()
+            try:
+                return await call(**values)
+            finally:
+                _endpoint_done(started)
+
+    else:
+        # Roda no threadpool, que copia o contexto (e a mesma RequestTimings)
+        @wraps(call)
+        def endpoint(**values):
+            started = perf_counter()
+            try:
+                return call(**values)
+            finally:
+                _endpoint_done(started)
+
+    return endpoint
+
+
+def _endpoint_done(started: float):
+    timings = _current.get()
+    if timings is not None:
+        timings.endpoint_done = perf_counter()
+        timings.add('endpoint', timings.endpoint_done - started)
+
+
+def instrument_routes(app):
+    """Time the endpoint of every route registered on `app` so far."""
+    for route in app.routes:
+        if isinstance(route, APIRoute):
+            # O handler da rota já foi montado, mas chama dependant.call a
+            # cada requisição
+            route.dependant.call = _timed_endpoint(route.dependant.call)
+
+
+def route_template(scope) -> str:
+    """The matched route's path template, not the raw request path."""
+    route = scope.get('route')
+    if route is None:
+        # Caminhos sem rota não viram uma série por URL
+        return 'unmatched'
+    return route.path
+
+
+def route_name(scope) -> str:
+    route = route_template(scope)
+    if route == 'unmatched':
+        return route
+    return f'{scope["method"]} {route}'
+
+
+class ServerTimingMiddleware:
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] != 'http':
+            await self.app(scope, receive, send)
+            return
+
+        with collect() as timings:
+            started = perf_counter()
+
+            async def send_with_timings(message):
+                if message['type'] == 'http.response.start':
+                    now = perf_counter()
+                    if timings.endpoint_done is not None:
+                        timings.add('serialize', now - timings.endpoint_done)
+                    timings.add('total', now - started)
+
+                    MutableHeaders(scope=message).append(
+                        'Server-Timing', timings.header()
+                    )
+                    route_timings.observe(
+                        route_name(scope), timings.phases, timings.queries
+                    )
+                await send(message)
+
+            await self.app(scope, receive, send_with_timings)
@@ -0,0 +1,125 @@
+"""Per-user todo counts by state, kept in `todo_counts`.
+
+Statement-level triggers on `todos` apply the net change of every write
+(ORM, bulk statements, COPY, the trash purger) to the counter rows, so
+`GET /todos/stats` reads at most one row per state instead of counting
+the user's todos. `TodoCountReconciler` periodically compares the
+counters with a real count and repairs any drift.
+"""
+
+import logging
+
+from sqlalchemy import text
+
+from fast_zero.database import open_session
+from fast_zero.jobs import PeriodicJob
+from fast_zero.settings import get_settings
+
+logger = logging.getLogger(__name__)
+settings = get_settings()
+
+# Mantido em sincronia com a migração f1c7d3a5b8e2
+TODO_COUNTS_FUNCTION = """
+CREATE OR REPLACE FUNCTION count_todos() RETURNS trigger AS $$
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        INSERT INTO todo_counts AS c (user_id, state, count)
+        SELECT user_id, state, count(*) FROM new_rows
+        GROUP BY user_id, state ORDER BY user_id, state
+        ON CONFLICT (user_id, state)
+        DO UPDATE SET count = c.count + EXCLUDED.count;
+    ELSIF TG_OP = 'DELETE' THEN
+        -- Upsert como nos outros ramos: as travas seguem a mesma ordem
+        INSERT INTO todo_counts AS c (user_id, state, count)
+        SELECT user_id, state, -count(*) FROM old_rows
+        GROUP BY user_id, state ORDER BY user_id, state
+        ON CONFLICT (user_id, state)
+        DO UPDATE SET count = c.count + EXCLUDED.count;
+    ELSE
+        INSERT INTO todo_counts AS c (user_id, state, count)
+        SELECT user_id, state, sum(delta) FROM (
+            SELECT user_id, state, 1 AS delta FROM new_rows
+            UNION ALL
+            SELECT user_id, state, -1 FROM old_rows
+        ) AS d
+        GROUP BY user_id, state HAVING sum(delta) <> 0
+        ORDER BY user_id, state
+        ON CONFLICT (user_id, state)
+        DO UPDATE SET count = c.count + EXCLUDED.count;
+    END IF;
+    RETURN NULL;
+END
+$$ LANGUAGE plpgsql
+"""
+
+TODO_COUNTS_TRIGGERS = tuple(
+    f'CREATE TRIGGER todo_counts_{event.lower()} AFTER {event} ON todos '
+    f'REFERENCING {tables} '
+    'FOR EACH STATEMENT EXECUTE FUNCTION count_todos()'
+    for event, tables in (
+        ('INSERT', 'NEW TABLE AS new_rows'),
+        ('UPDATE', 'OLD TABLE AS old_rows NEW TABLE AS new_rows'),
+        ('DELETE', 'OLD TABLE AS old_rows'),
+    )
+)
+
+# Um único comando (um só snapshot) calcula a diferença entre a contagem
+# real e os contadores e a *soma* a eles: escritas concorrentes já
+# aplicadas pelos triggers não são sobrescritas
+RECONCILE_TODO_COUNTS = text("""
+WITH actual AS (
+    SELECT user_id, state, count(*) AS n FROM todos GROUP BY user_id, state
+), drift AS (
+    SELECT user_id, state, coalesce(a.n, 0) - coalesce(s.count, 0) AS delta
+    FROM actual AS a FULL JOIN todo_counts AS s USING (user_id, state)
+    WHERE coalesce(a.n, 0) <> coalesce(s.count, 0)
+)
+INSERT INTO todo_counts AS c (user_id, state, count)
+SELECT user_id, state, delta FROM drift ORDER BY user_id, state
+ON CONFLICT (user_id, state) DO UPDATE SET count = c.count + EXCLUDED.count
+RETURNING user_id
+""")
+
+# Dois workers reconciliando juntos aplicariam a mesma correção duas vezes
+RECONCILE_LOCK = text(
+    "SELECT pg_try_advisory_xact_lock(hashtext('todo_counts_reconcile'))"
+)
+
+
+async def reconcile_todo_counts(session) -> int | None:
+    """
+    Repair counters that drifted from the real counts.
+
+    Returns how many (user, state) counters were fixed, or None when
+    another reconciliation holds the lock.
+    """
+    if not await session.scalar(RECONCILE_LOCK):
+        await session.rollback()
+        return None
+
+    repaired = len((await session.execute(RECONCILE_TODO_COUNTS)).all())
+    await session.commit()
+    return repaired
+
+
+class TodoCountReconciler(PeriodicJob):
+    name = 'Todo count reconciliation'
+
+    def __init__(self, session_factory, interval: float):
+        super().__init__(interval)
+        self.session_factory = session_factory
+
+    async def run(self):
+        session = self.session_factory()
+        try:
+            repaired = await reconcile_todo_counts(session)
+        finally:
+            await session.close()
+
+        if repaired:
+            logger.warning('Repaired %d drifted todo counters', repaired)
+
+
+todo_count_reconciler = TodoCountReconciler(
+    open_session, settings.TODO_COUNTS_RECONCILE_INTERVAL
+)
@@ -0,0 +1,50 @@
+"""Startup work done before the first request instead of during it.
+
+With machines stopped when idle, every cold start puts the first
+requests on the critical path of lazy initialization. `warm_up()` runs
+in the lifespan, before the server accepts connections, and:
+
+- configures the ORM mappers, which SQLAlchemy otherwise does on the
+  first query (the Pydantic schemas need nothing: their validators are
+  built when the classes are defined, at import);
+- opens `WARMUP_CONNECTIONS` pool connections;
+- spawns the password hashing workers and runs one hash in each.
+
+A failed step is logged and startup goes on: the readiness probe is what
+tells the load balancer whether the worker can serve.
+"""
+
+import asyncio
+import logging
+from time import perf_counter
+
+from sqlalchemy.orm import configure_mappers
+
+from fast_zero.database import warm_pool
+from fast_zero.hashing import hashing_pool
+from fast_zero.settings import get_settings
+
+logger = logging.getLogger(__name__)
+settings = get_settings()
+
+
+async def warm_up() -> None:
+    started = perf_counter()
+    configure_mappers()
+
+    steps = {
+        'database pool': warm_pool(settings.WARMUP_CONNECTIONS),
+        'password hashing': hashing_pool.warm_up(),
+    }
+    results = await asyncio.gather(
+        *(
+            asyncio.wait_for(step, settings.WARMUP_TIMEOUT)
+            for step in steps.values()
+        ),
+        return_exceptions=True,
+    )
+    for name, result in zip(steps, results):
+        if isinstance(result, Exception):
+            logger.warning('Warm-up of %s failed', name, exc_info=result)
+
+    logger.info('Warm-up done in %.0f ms', (perf_counter() - started) * 1000)
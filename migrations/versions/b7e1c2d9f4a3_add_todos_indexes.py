@@ -0,0 +1,37 @@
+"""add todos indexes
+
+Revision ID: b7e1c2d9f4a3
+Revises: 4048fe01f9af
+Create Date: 2026-10-18 10:12:41.518204
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b7e1c2d9f4a3'
+down_revision: Union[str, None] = '4048fe01f9af'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+
+    # CONCURRENTLY não roda dentro de transação, mas não bloqueia escritas
+    with op.get_context().autocommit_block():
+        op.create_index('ix_todos_user_id_id', 'todos', ['user_id', 'id'], unique=False, postgresql_concurrently=True, if_not_exists=True)
+        op.create_index('ix_todos_user_id_state_id', 'todos', ['user_id', 'state', 'id'], unique=False, postgresql_concurrently=True, if_not_exists=True)
+        op.create_index('ix_todos_title_trgm', 'todos', ['title'], unique=False, postgresql_using='gin', postgresql_ops={'title': 'gin_trgm_ops'}, postgresql_concurrently=True, if_not_exists=True)
+        op.create_index('ix_todos_description_trgm', 'todos', ['description'], unique=False, postgresql_using='gin', postgresql_ops={'description': 'gin_trgm_ops'}, postgresql_concurrently=True, if_not_exists=True)
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_todos_description_trgm', table_name='todos', postgresql_concurrently=True, if_exists=True)
+        op.drop_index('ix_todos_title_trgm', table_name='todos', postgresql_concurrently=True, if_exists=True)
+        op.drop_index('ix_todos_user_id_state_id', table_name='todos', postgresql_concurrently=True, if_exists=True)
+        op.drop_index('ix_todos_user_id_id', table_name='todos', postgresql_concurrently=True, if_exists=True)
@@ -0,0 +1,34 @@
+"""add todos search vector
+
+Revision ID: c3f8a1e6d2b7
+Revises: b7e1c2d9f4a3
+Create Date: 2026-10-18 14:03:27.904512
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c3f8a1e6d2b7'
+down_revision: Union[str, None] = 'b7e1c2d9f4a3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Coluna gerada (STORED): reescreve a tabela uma única vez
+    op.add_column('todos', sa.Column('search_vector', postgresql.TSVECTOR(), sa.Computed("setweight(to_tsvector('english', coalesce(title, '')), 'A') || setweight(to_tsvector('english', coalesce(description, '')), 'B')", persisted=True), nullable=True))
+
+    with op.get_context().autocommit_block():
+        op.create_index('ix_todos_search_vector', 'todos', ['search_vector'], unique=False, postgresql_using='gin', postgresql_concurrently=True, if_not_exists=True)
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_todos_search_vector', table_name='todos', postgresql_concurrently=True, if_exists=True)
+
+    op.drop_column('todos', 'search_vector')
@@ -0,0 +1,62 @@
+"""add todos change tokens
+
+Revision ID: d5a9e3b1c7f4
+Revises: c3f8a1e6d2b7
+Create Date: 2026-10-18 21:12:40.518233
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd5a9e3b1c7f4'
+down_revision: Union[str, None] = 'c3f8a1e6d2b7'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+TODOS_VERSION_FUNCTION = """
+CREATE OR REPLACE FUNCTION bump_todos_version() RETURNS trigger AS $$
+BEGIN
+    IF TG_OP = 'DELETE' THEN
+        UPDATE users SET todos_version = todos_version + 1
+        WHERE id IN (SELECT DISTINCT user_id FROM old_rows);
+    ELSE
+        UPDATE users SET todos_version = todos_version + 1
+        WHERE id IN (SELECT DISTINCT user_id FROM new_rows);
+    END IF;
+    RETURN NULL;
+END
+$$ LANGUAGE plpgsql
+"""
+
+TRIGGERS = (
+    ('insert', 'INSERT', 'NEW', 'new_rows'),
+    ('update', 'UPDATE', 'NEW', 'new_rows'),
+    ('delete', 'DELETE', 'OLD', 'old_rows'),
+)
+
+
+def upgrade() -> None:
+    # Defaults constantes/estáveis: o Postgres não reescreve as tabelas
+    op.add_column('todos', sa.Column('updated_at', sa.DateTime(), server_default=sa.text('now()'), nullable=False))
+    op.add_column('users', sa.Column('todos_version', sa.Integer(), server_default='0', nullable=False))
+
+    op.execute(TODOS_VERSION_FUNCTION)
+    for name, event, table, alias in TRIGGERS:
+        op.execute(
+            f'CREATE TRIGGER todos_version_{name} AFTER {event} ON todos '
+            f'REFERENCING {table} TABLE AS {alias} '
+            'FOR EACH STATEMENT EXECUTE FUNCTION bump_todos_version()'
+        )
+
+
+def downgrade() -> None:
+    for name, *_ in TRIGGERS:
+        op.execute(f'DROP TRIGGER IF EXISTS todos_version_{name} ON todos')
+    op.execute('DROP FUNCTION IF EXISTS bump_todos_version()')
+
+    op.drop_column('users', 'todos_version')
+    op.drop_column('todos', 'updated_at')
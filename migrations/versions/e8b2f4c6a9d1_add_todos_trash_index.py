@@ -0,0 +1,29 @@
+"""add todos trash index
+
+Revision ID: e8b2f4c6a9d1
+Revises: d5a9e3b1c7f4
+Create Date: 2026-10-18 16:02:17.284913
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e8b2f4c6a9d1'
+down_revision: Union[str, None] = 'd5a9e3b1c7f4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Índice parcial: só cobre a lixeira, que o expurgo varre por idade
+    with op.get_context().autocommit_block():
+        op.create_index('ix_todos_trash_updated_at', 'todos', ['updated_at'], unique=False, postgresql_where=sa.text("state = 'trash'"), postgresql_concurrently=True, if_not_exists=True)
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_todos_trash_updated_at', table_name='todos', postgresql_concurrently=True, if_exists=True)
@@ -0,0 +1,91 @@
+"""add todo counts
+
+Revision ID: f1c7d3a5b8e2
+Revises: e8b2f4c6a9d1
+Create Date: 2026-10-18 17:41:05.613370
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f1c7d3a5b8e2'
+down_revision: Union[str, None] = 'e8b2f4c6a9d1'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+TODO_COUNTS_FUNCTION = """
+CREATE OR REPLACE FUNCTION count_todos() RETURNS trigger AS $$
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        INSERT INTO todo_counts AS c (user_id, state, count)
+        SELECT user_id, state, count(*) FROM new_rows
+        GROUP BY user_id, state ORDER BY user_id, state
+        ON CONFLICT (user_id, state)
+        DO UPDATE SET count = c.count + EXCLUDED.count;
+    ELSIF TG_OP = 'DELETE' THEN
+        -- Upsert como nos outros ramos: as travas seguem a mesma ordem
+        INSERT INTO todo_counts AS c (user_id, state, count)
+        SELECT user_id, state, -count(*) FROM old_rows
+        GROUP BY user_id, state ORDER BY user_id, state
+        ON CONFLICT (user_id, state)
+        DO UPDATE SET count = c.count + EXCLUDED.count;
+    ELSE
+        INSERT INTO todo_counts AS c (user_id, state, count)
+        SELECT user_id, state, sum(delta) FROM (
+            SELECT user_id, state, 1 AS delta FROM new_rows
+            UNION ALL
+            SELECT user_id, state, -1 FROM old_rows
+        ) AS d
+        GROUP BY user_id, state HAVING sum(delta) <> 0
+        ORDER BY user_id, state
+        ON CONFLICT (user_id, state)
+        DO UPDATE SET count = c.count + EXCLUDED.count;
+    END IF;
+    RETURN NULL;
+END
+$$ LANGUAGE plpgsql
+"""
+
+TRIGGERS = (
+    ('insert', 'INSERT', 'NEW TABLE AS new_rows'),
+    ('update', 'UPDATE', 'OLD TABLE AS old_rows NEW TABLE AS new_rows'),
+    ('delete', 'DELETE', 'OLD TABLE AS old_rows'),
+)
+
+
+def upgrade() -> None:
+    op.create_table('todo_counts',
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('state', postgresql.ENUM(name='todostate', create_type=False), nullable=False),
+    sa.Column('count', sa.BigInteger(), nullable=False),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('user_id', 'state')
+    )
+
+    op.execute(TODO_COUNTS_FUNCTION)
+    for name, event, tables in TRIGGERS:
+        op.execute(
+            f'CREATE TRIGGER todo_counts_{name} AFTER {event} ON todos '
+            f'REFERENCING {tables} '
+            'FOR EACH STATEMENT EXECUTE FUNCTION count_todos()'
+        )
+
+    # Os triggers travam escritas em todos até o commit: a carga inicial
+    # vê a mesma tabela que eles passam a manter
+    op.execute(
+        'INSERT INTO todo_counts (user_id, state, count) '
+        'SELECT user_id, state, count(*) FROM todos GROUP BY user_id, state'
+    )
+
+
+def downgrade() -> None:
+    for name, *_ in TRIGGERS:
+        op.execute(f'DROP TRIGGER IF EXISTS todo_counts_{name} ON todos')
+    op.execute('DROP FUNCTION IF EXISTS count_todos()')
+
+    op.drop_table('todo_counts')
@@ -1,15 +1,19 @@
 import factory
 import factory.fuzzy
 import pytest
+import pytest_asyncio
 from fastapi.testclient import TestClient
-from sqlalchemy import create_engine
-from sqlalchemy.orm import Session
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
 from testcontainers.postgres import PostgresContainer
 
 from fast_zero.app import app
-from fast_zero.database import get_session
+from fast_zero.database import get_read_session, get_session
+from fast_zero.hashing import get_password_hash
 from fast_zero.models import Todo, TodoState, User, table_registry
-from fast_zero.security import get_password_hash
+from fast_zero.response_cache import response_cache
+from fast_zero.security import token_cache, user_cache
+from fast_zero.settings import get_settings
 
 
 class UserFactory(factory.Factory):
@@ -33,12 +37,16 @@ class TodoFactory(factory.Factory):
 
 
 @pytest.fixture()
-def client(session):
+def client(session, monkeypatch):
     def get_session_override():
         return session
 
+    # Sem aquecimento: cada TestClient subiria os workers de hashing
+    monkeypatch.setattr(get_settings(), 'STARTUP_WARMUP', False)
+
     with TestClient(app) as client:
         app.dependency_overrides[get_session] = get_session_override
+        app.dependency_overrides[get_read_session] = get_session_override
         yield client
 
     app.dependency_overrides.clear()
@@ -47,47 +55,64 @@ def client(session):
 @pytest.fixture(scope='session')
 def engine():
     with PostgresContainer('postgres:16', driver='psycopg') as postgres:
-        _engine = create_engine(postgres.get_connection_url())
-
-        with _engine.begin():
-            yield _engine
+        _engine = create_async_engine(postgres.get_connection_url())
+        yield _engine
 
 
-@pytest.fixture()
-def session(engine):
-    table_registry.metadata.create_all(engine)
+@pytest_asyncio.fixture
+async def session(engine):
+    async with engine.begin() as conn:
+        await conn.run_sync(table_registry.metadata.create_all)
 
-    with Session(engine) as session:
+    async with AsyncSession(engine, expire_on_commit=False) as session:
         yield session
-    session.rollback()
 
-    table_registry.metadata.drop_all(engine)
+    async with engine.begin() as conn:
+        await conn.run_sync(table_registry.metadata.drop_all)
 
+    # O cache espelha o banco, que acabou de ser apagado
+    await user_cache.clear()
+    await token_cache.clear()
+    await response_cache.clear()
 
-@pytest.fixture()
-def user(session):
+
+@pytest.fixture
+def statements(engine):
+    """SQL statements sent to the test database during the test."""
+    executed = []
+
+    def record(conn, cursor, statement, *args):
+        executed.append(statement)
+
+    event.listen(engine.sync_engine, 'before_cursor_execute', record)
+    yield executed
+    event.remove(engine.sync_engine, 'before_cursor_execute', record)
+
+
+@pytest_asyncio.fixture
+async def user(session):
     pwd = 'vini'
 
     user = UserFactory(password=get_password_hash(pwd))
 
     session.add(user)
-    session.commit()
-    session.refresh(user)
+    await session.commit()
+    await session.refresh(user)
 
     user.clean_password = pwd  # hacks (Monkey Patch)
 
     return user
 
 
-@pytest.fixture()
-def other_user(session):
+@pytest_asyncio.fixture
+async def other_user(session):
     pwd = 'vini'
 
     user = UserFactory(password=get_password_hash(pwd))
 
     session.add(user)
-    session.commit()
-    session.refresh(user)
+    await session.commit()
+    await session.refresh(user)
 
     user.clean_password = pwd  # hacks (Monkey Patch)
 
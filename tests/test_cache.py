@@ -0,0 +1,126 @@
+import pytest
+
+from fast_zero.cache import Cache, MemoryBackend, ResponseCache
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.mark.asyncio
+async def test_memory_backend_expires_entries():
+    clock = FakeClock()
+    backend = MemoryBackend(clock=clock)
+
+    await backend.set('key', 'value', ttl=10)
+    assert await backend.get('key') == 'value'
+
+    clock.now = 10
+    assert await backend.get('key') is None
+    assert len(backend) == 0
+
+
+@pytest.mark.asyncio
+async def test_memory_backend_evicts_least_recently_used():
+    backend = MemoryBackend(maxsize=2)
+
+    await backend.set('a', 'first', ttl=10)
+    await backend.set('b', 'second', ttl=10)
+    await backend.get('a')
+    await backend.set('c', 'third', ttl=10)
+
+    assert await backend.get('a') == 'first'
+    assert await backend.get('b') is None
+    assert await backend.get('c') == 'third'
+
+
+@pytest.mark.asyncio
+async def test_cache_counts_hits_and_misses():
+    cache = Cache(MemoryBackend(), ttl=10)
+
+    assert await cache.get('key') is None
+    await cache.set('key', 'value')
+    assert await cache.get('key') == 'value'
+    await cache.invalidate('key')
+    assert await cache.get('key') is None
+
+    assert cache.stats() == {'hits': 1, 'misses': 2, 'hit_ratio': 1 / 3}
+
+
+@pytest.mark.asyncio
+async def test_cache_with_zero_ttl_is_disabled():
+    cache = Cache(MemoryBackend(), ttl=0)
+
+    await cache.set('key', 'value')
+
+    assert await cache.get('key') is None
+
+
+@pytest.mark.asyncio
+async def test_cache_set_with_shorter_ttl():
+    clock = FakeClock()
+    cache = Cache(MemoryBackend(clock=clock), ttl=60)
+
+    await cache.set('short', 'value', ttl=5)
+    await cache.set('long', 'value', ttl=600)
+    clock.now = 10
+
+    assert await cache.get('short') is None
+    assert await cache.get('long') == 'value'
+
+
+class Loader:
+    def __init__(self):
+        self.calls = 0
+
+    async def __call__(self):
+        self.calls += 1
+        return f'body {self.calls}'
+
+
+@pytest.mark.asyncio
+async def test_response_cache_hits_until_scope_is_invalidated():
+    cache = ResponseCache(MemoryBackend(), ttl=10)
+    load = Loader()
+
+    first = await cache.get_or_load('route', 'todos:1', 'limit=1', load)
+    second = await cache.get_or_load('route', 'todos:1', 'limit=1', load)
+    await cache.invalidate('todos:1')
+    third = await cache.get_or_load('route', 'todos:1', 'limit=1', load)
+
+    assert (first, second, third) == ('body 1', 'body 1', 'body 2')
+    assert cache.stats()['route']['hits'] == 1
+    assert cache.stats()['route']['misses'] == 2  # noqa: PLR2004
+
+
+@pytest.mark.asyncio
+async def test_response_cache_invalidation_is_per_scope():
+    cache = ResponseCache(MemoryBackend(), ttl=10)
+    load = Loader()
+
+    await cache.get_or_load('route', 'todos:1', '', load)
+    await cache.get_or_load('route', 'todos:2', '', load)
+    await cache.invalidate('todos:2')
+
+    assert await cache.get_or_load('route', 'todos:1', '', load) == 'body 1'
+    assert await cache.get_or_load('route', 'todos:2', '', load) == 'body 3'
+
+
+@pytest.mark.asyncio
+async def test_response_cache_losing_generation_only_misses():
+    backend = MemoryBackend(maxsize=2)
+    cache = ResponseCache(backend, ttl=10)
+    load = Loader()
+
+    await cache.get_or_load('route', 'users', '', load)
+    await backend.delete('generation:users')
+
+    assert await cache.get_or_load('route', 'users', '', load) == 'body 2'
+
+
+def test_response_cache_with_zero_ttl_is_disabled():
+    assert not ResponseCache(MemoryBackend(), ttl=0).enabled
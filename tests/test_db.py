@@ -1,9 +1,13 @@
-from sqlalchemy import select
+import pytest
+from sqlalchemy import create_engine, inspect, select
+from sqlalchemy.orm import Session
 
+from fast_zero.database import ThreadedSession
 from fast_zero.models import User
 
 
-def test_create_user(session):
+@pytest.mark.asyncio
+async def test_create_user(session):
     user = User(
         username='xispeteo',
         email='xispeteo@xpto@to',
@@ -11,11 +15,44 @@ def test_create_user(session):
     )
 
     session.add(user)
-    session.commit()
+    await session.commit()
 
     # session.refresh(user)
-    session.scalar(select(User).where(User.email == 'xispeteo@xpto@to'))
+    await session.scalar(select(User).where(User.email == 'xispeteo@xpto@to'))
 
     assert user.username == 'xispeteo'
     assert user.email == 'xispeteo@xpto@to'
     assert user.password == 'securepassword'
+
+
+@pytest.mark.asyncio
+async def test_threaded_session_runs_sync_session(engine, session):
+    sync_engine = create_engine(engine.url)
+
+    with Session(sync_engine) as sync_session:
+        threaded = ThreadedSession(sync_session)
+        threaded.add(
+            User(username='sync', email='sync@sync.com', password='secret')
+        )
+        await threaded.commit()
+
+        user = await threaded.scalar(
+            select(User).where(User.email == 'sync@sync.com')
+        )
+
+    sync_engine.dispose()
+
+    assert user.username == 'sync'
+    assert user.id == 1
+
+
+@pytest.mark.asyncio
+async def test_todos_indexes_match_query_patterns(engine, session):
+    async with engine.connect() as conn:
+        indexes = await conn.run_sync(
+            lambda sync_conn: inspect(sync_conn).get_indexes('todos')
+        )
+
+    columns = {index['name']: index['column_names'] for index in indexes}
+    assert columns['ix_todos_user_id_id'] == ['user_id', 'id']
+    assert columns['ix_todos_user_id_state_id'] == ['user_id', 'state', 'id']
@@ -0,0 +1,24 @@
+import pytest
+
+from fast_zero.etag import etag_matches, make_etag
+
+
+def test_make_etag_is_weak_and_stable():
+    etag = make_etag('todos', 1, 7, 'limit=10')
+
+    assert etag.startswith('W/"')
+    assert etag == make_etag('todos', 1, 7, 'limit=10')
+    assert etag != make_etag('todos', 1, 8, 'limit=10')
+
+
+@pytest.mark.parametrize(
+    'header',
+    ['W/"abc"', '"abc"', '"x", W/"abc"', '*'],
+)
+def test_etag_matches_weak_comparison(header):
+    assert etag_matches(header, 'W/"abc"')
+
+
+@pytest.mark.parametrize('header', [None, '', '"abd"', 'W/"x", "y"'])
+def test_etag_does_not_match(header):
+    assert not etag_matches(header, 'W/"abc"')
@@ -0,0 +1,32 @@
+import json
+
+from fast_zero.export import encode_csv, encode_ndjson
+from fast_zero.models import TodoState
+from tests.conftest import TodoFactory
+
+
+def _todos():
+    first = TodoFactory(
+        title='Olá', description='a, "b"', state=TodoState.done
+    )
+    first.id = 1
+    second = TodoFactory(title='two', description='', state=TodoState.draft)
+    second.id = 2
+    return [first, second]
+
+
+def test_encode_ndjson_one_object_per_line():
+    lines = encode_ndjson(_todos()).splitlines()
+
+    assert [json.loads(line) for line in lines] == [
+        {'title': 'Olá', 'description': 'a, "b"', 'state': 'done', 'id': 1},
+        {'title': 'two', 'description': '', 'state': 'draft', 'id': 2},
+    ]
+
+
+def test_encode_csv_quotes_and_header():
+    assert encode_csv(_todos(), header=True).splitlines() == [
+        'title,description,state,id',
+        'Olá,"a, ""b""",done,1',
+        'two,,draft,2',
+    ]
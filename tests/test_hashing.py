@@ -0,0 +1,83 @@
+import os
+from http import HTTPStatus
+
+import pytest
+from fastapi import HTTPException
+
+from fast_zero.hashing import (
+    HashingPool,
+    check_password,
+    get_password_hash,
+    hash_password,
+    hashing_pool,
+    verify_password,
+)
+from fast_zero.metrics import password_hash_seconds
+
+
+@pytest.mark.asyncio
+async def test_hash_password_runs_in_pool():
+    hashed = await hash_password('secret')
+
+    assert hashed != 'secret'
+    assert await check_password('secret', hashed)
+    assert not await check_password('wrong', hashed)
+
+    timings = dict(password_hash_seconds.items())
+    assert timings['hash',].snapshot()['count'] >= 1
+    assert timings['verify',].snapshot()['count'] >= 2  # noqa: PLR2004
+
+
+@pytest.mark.asyncio
+async def test_hashing_pool_rejects_when_saturated():
+    pool = HashingPool(workers=1, max_pending=0, retry_after=7)
+
+    with pytest.raises(HTTPException) as exc:
+        await pool.run(get_password_hash, 'secret')
+
+    assert exc.value.status_code == HTTPStatus.SERVICE_UNAVAILABLE
+    assert exc.value.headers == {'Retry-After': '7'}
+
+
+@pytest.mark.asyncio
+async def test_hashing_pool_recovers_from_dead_worker():
+    pool = HashingPool(workers=1, max_pending=4, retry_after=3)
+    try:
+        with pytest.raises(HTTPException) as exc:
+            await pool.run(os._exit, 1)
+
+        assert exc.value.status_code == HTTPStatus.SERVICE_UNAVAILABLE
+        assert exc.value.headers == {'Retry-After': '3'}
+        assert await pool.run(verify_password, 'x', get_password_hash('x'))
+    finally:
+        pool.shutdown()
+
+
+def hash_count() -> int:
+    histogram = dict(password_hash_seconds.items()).get(('hash',))
+    return histogram.snapshot()['count'] if histogram else 0
+
+
+@pytest.mark.asyncio
+async def test_rejected_jobs_are_not_timed():
+    pool = HashingPool(workers=1, max_pending=0, retry_after=1)
+    before = hash_count()
+
+    with pytest.raises(HTTPException):
+        await pool.run(get_password_hash, 'secret', operation='hash')
+
+    assert hash_count() == before
+
+
+def test_login_returns_503_when_hashing_pool_is_busy(
+    client, user, monkeypatch
+):
+    monkeypatch.setattr(hashing_pool, 'max_pending', 0)
+
+    response = client.post(
+        '/auth/token',
+        data={'username': user.email, 'password': user.clean_password},
+    )
+
+    assert response.status_code == HTTPStatus.SERVICE_UNAVAILABLE
+    assert response.headers['Retry-After'] == str(hashing_pool.retry_after)
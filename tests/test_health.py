@@ -1,8 +1,15 @@
+import asyncio
+import time
 from http import HTTPStatus
 from unittest.mock import MagicMock
 
+import pytest
 from sqlalchemy.exc import SQLAlchemyError
 
+from fast_zero.hashing import HashingPool
+from fast_zero.readiness import ReadinessProbe
+from fast_zero.routers import health
+
 
 def test_health_check_ok(client):
     response = client.get('/health')
@@ -25,3 +32,86 @@ def test_health_check_error(client, session):
         'database_status': 'error',
         'timestamp': response.json()['timestamp'],
     }
+
+
+class FakeSession:
+    def __init__(self, error=None):
+        self.error = error
+
+    async def execute(self, statement):
+        if self.error:
+            raise self.error
+
+    async def close(self):
+        pass
+
+
+def make_probe(session=None, **kwargs):
+    options = {
+        'interval': 5,
+        'timeout': 1,
+        'max_age': 30,
+        'pool_saturation': 1.0,
+        'hashing_backlog': 0.9,
+    } | kwargs
+    return ReadinessProbe(
+        lambda: session or FakeSession(),
+        HashingPool(workers=1, max_pending=10, retry_after=1),
+        **options,
+    )
+
+
+def test_liveness(client):
+    response = client.get('/health/live')
+
+    assert response.status_code == HTTPStatus.OK
+    assert response.json() == {'status': 'ok'}
+
+
+def test_readiness_serves_cached_check(client, monkeypatch):
+    probe = make_probe()
+    monkeypatch.setattr(health, 'readiness_probe', probe)
+
+    before = client.get('/health/ready')
+    asyncio.run(probe.run())
+    after = client.get('/health/ready')
+
+    assert before.status_code == HTTPStatus.SERVICE_UNAVAILABLE
+    assert before.json()['database_status'] == 'unknown'
+    assert after.status_code == HTTPStatus.OK
+    assert after.json()['reasons'] == []
+
+
+@pytest.mark.asyncio
+async def test_probe_reports_database_error():
+    probe = make_probe(FakeSession(SQLAlchemyError()))
+
+    await probe.run()
+
+    assert probe.report()['reasons'] == ['database error']
+
+
+@pytest.mark.asyncio
+async def test_probe_goes_stale():
+    probe = make_probe(max_age=0)
+
+    await probe.run()
+    time.sleep(0.01)
+
+    assert probe.database_status() == 'stale'
+
+
+@pytest.mark.asyncio
+async def test_probe_reports_saturation():
+    probe = make_probe(pool_saturation=0)
+    await probe.run()
+    probe.hashing.pending = 9
+
+    assert probe.report()['reasons'] == [
+        'connection pool saturated',
+        'password hashing backlog',
+    ]
+
+
+def test_disabled_probe_ignores_database():
+    assert make_probe(interval=0).report()['ready']
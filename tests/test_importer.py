@@ -0,0 +1,100 @@
+import pytest
+
+from fast_zero.importer import (
+    csv_records,
+    ndjson_records,
+    text_lines,
+    validate,
+)
+from fast_zero.models import TodoState
+
+
+async def _chunks(data: bytes, size: int = 3):
+    for start in range(0, len(data), size):
+        yield data[start : start + size]
+
+
+async def _collect(records):
+    return [record async for record in records]
+
+
+@pytest.mark.asyncio
+async def test_text_lines_splits_across_chunks():
+    lines = await _collect(
+        text_lines(_chunks('olá\r\nmundo\nfim'.encode()), 100)
+    )
+
+    assert lines == ['olá', 'mundo', 'fim']
+
+
+@pytest.mark.asyncio
+async def test_csv_records_joins_quoted_newlines():
+    data = b'title,description,state\n"a","multi\nline ""x""",done\nb,c\n'
+
+    first, second = await _collect(
+        csv_records(text_lines(_chunks(data), 100), 100)
+    )
+
+    assert first == {
+        'title': 'a',
+        'description': 'multi\nline "x"',
+        'state': 'done',
+    }
+    assert isinstance(second, ValueError)
+
+
+@pytest.mark.asyncio
+async def test_ndjson_records_skip_blank_lines():
+    data = b'{"title": "a", "description": "b", "state": "todo"}\n\n{'
+
+    todo, error = await _collect(
+        ndjson_records(text_lines(_chunks(data), 100))
+    )
+
+    assert validate(todo).state == TodoState.todo
+    assert isinstance(error, ValueError)
+
+
+@pytest.mark.asyncio
+async def test_text_lines_skips_oversized_line():
+    data = b'ok\n' + b'x' * 50 + b'\nafter\n' + b'y' * 50
+
+    lines = await _collect(text_lines(_chunks(data, size=7), 10))
+
+    assert lines[0] == 'ok'
+    assert isinstance(lines[1], ValueError)
+    assert lines[2] == 'after'
+    assert isinstance(lines[3], ValueError)
+    assert len(lines) == 4  # noqa: PLR2004
+
+
+@pytest.mark.asyncio
+async def test_text_lines_reports_invalid_utf8():
+    data = b'ok\nbad \xff\nafter\n\xc3'
+
+    lines = await _collect(text_lines(_chunks(data, size=4), 100))
+
+    assert lines[0] == 'ok'
+    assert str(lines[1]) == 'Line is not valid UTF-8'
+    assert lines[2] == 'after'
+    assert str(lines[3]) == 'Line is not valid UTF-8'
+
+
+@pytest.mark.asyncio
+async def test_csv_records_resync_after_unterminated_quote():
+    rows = ''.join(f'r{n},d,todo\n' for n in range(20))
+    data = f'title,description,state\n"stray,d,todo\n{rows}'.encode()
+
+    records = await _collect(csv_records(text_lines(_chunks(data), 100), 40))
+
+    error, *parsed = records
+    assert str(error) == 'Record longer than 40 bytes'
+    # Só as linhas engolidas pelo registro aberto se perdem
+    assert parsed[-1] == {'title': 'r19', 'description': 'd', 'state': 'todo'}
+    assert all(isinstance(record, dict) for record in parsed)
+
+
+def test_validate_reports_field_and_message():
+    assert validate({'title': 'a', 'description': 'b'}) == (
+        'state: Field required'
+    )
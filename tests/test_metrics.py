@@ -0,0 +1,85 @@
+from http import HTTPStatus
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from fast_zero.database import TimedAsyncQueuePool, instrument_pool
+from fast_zero.metrics import Histogram, pool_metrics
+
+
+def test_histogram_snapshot_is_cumulative():
+    histogram = Histogram(buckets=(0.1, 1.0))
+
+    histogram.observe(0.05)
+    histogram.observe(0.5)
+    histogram.observe(5)
+
+    assert histogram.snapshot() == {
+        'count': 3,
+        'sum': 5.55,
+        'buckets': {'0.1': 1, '1.0': 2, '+Inf': 3},
+    }
+
+
+@pytest.mark.asyncio
+async def test_instrument_pool_records_connects_and_wait(engine):
+    connects, checkouts = pool_metrics.connects, pool_metrics.checkouts
+    waits = pool_metrics.wait.snapshot()['count']
+
+    timed_engine = create_async_engine(
+        engine.url, poolclass=TimedAsyncQueuePool
+    )
+    instrument_pool(timed_engine.sync_engine)
+
+    async with timed_engine.connect() as conn:
+        await conn.execute(text('SELECT 1'))
+    await timed_engine.dispose()
+
+    assert pool_metrics.connects == connects + 1
+    assert pool_metrics.checkouts == checkouts + 1
+    assert pool_metrics.wait.snapshot()['count'] == waits + 1
+
+
+def test_read_pool_stats(client):
+    response = client.get('/metrics/pool')
+    data = response.json()
+
+    assert response.status_code == HTTPStatus.OK
+    assert data['pool_size'] == data['max_connections'] - data['max_overflow']
+    assert data['checked_out'] >= 0
+    assert '+Inf' in data['wait_seconds']['buckets']
+
+
+def test_read_cache_stats(client):
+    response = client.get('/metrics/caches')
+
+    assert response.status_code == HTTPStatus.OK
+    assert set(response.json()['users']) == {'hits', 'misses', 'hit_ratio'}
+
+
+def test_read_response_cache_stats(client):
+    client.get('/users/')
+    client.get('/users/')
+
+    response = client.get('/metrics/responses')
+
+    assert response.status_code == HTTPStatus.OK
+    assert response.json()['read_users']['hits'] >= 1
+    assert response.json()['read_users']['saved_seconds'] >= 0
+
+
+def test_read_purger_stats(client):
+    response = client.get('/metrics/purger')
+
+    assert response.status_code == HTTPStatus.OK
+    assert {'runs', 'purged', 'backlog', 'batch_seconds'} <= set(
+        response.json()
+    )
+
+
+def test_read_route_timings(client):
+    response = client.get('/metrics/timings')
+
+    assert response.status_code == HTTPStatus.OK
+    assert isinstance(response.json(), dict)
@@ -0,0 +1,21 @@
+from http import HTTPStatus
+
+import pytest
+from fastapi import HTTPException
+
+from fast_zero.pagination import decode_cursor, encode_cursor
+
+
+def test_cursor_round_trip():
+    cursor = encode_cursor(42)
+
+    assert '=' not in cursor
+    assert decode_cursor(cursor) == 42  # noqa: PLR2004
+
+
+@pytest.mark.parametrize('cursor', ['garbage', encode_cursor('x'), 'e30'])
+def test_decode_cursor_rejects_invalid_cursor(cursor):
+    with pytest.raises(HTTPException) as exc:
+        decode_cursor(cursor)
+
+    assert exc.value.status_code == HTTPStatus.BAD_REQUEST
@@ -0,0 +1,123 @@
+import json
+from http import HTTPStatus
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from fast_zero.app import app
+from fast_zero.metrics import request_metrics
+from fast_zero.prometheus import (
+    PrometheusMiddleware,
+    collect,
+    merge,
+    read_snapshots,
+    render,
+    write_snapshot,
+)
+
+# Acima do pid_max do Linux: nunca é um processo vivo
+DEAD_PID = 4_194_305
+
+
+def histogram(count, total):
+    return {'count': count, 'sum': total, 'buckets': {'0.1': count}}
+
+
+def test_middleware_labels_by_route_template():
+    test_app = FastAPI()
+
+    @test_app.get('/items/{item_id}')
+    async def read_item(item_id: int):
+        return {'id': item_id}
+
+    test_app.add_middleware(PrometheusMiddleware)
+    client = TestClient(test_app)
+
+    client.get('/items/1')
+    client.get('/items/2')
+    client.get('/items/x')
+
+    requests = dict(request_metrics.requests.items())
+    assert requests['GET', '/items/{item_id}', '200'] >= 2  # noqa: PLR2004
+    assert requests['GET', '/items/{item_id}', '422'] >= 1
+    assert ('GET', '/items/1', '200') not in requests
+    assert request_metrics.in_progress == 0
+
+
+def test_render_histogram():
+    text = render({
+        'latency_seconds': {
+            'type': 'histogram',
+            'help': 'Latency.',
+            'samples': [[{'route': '/a'}, histogram(3, 0.5)]],
+        }
+    })
+
+    assert '# TYPE latency_seconds histogram' in text
+    assert 'latency_seconds_bucket{route="/a",le="0.1"} 3' in text
+    assert 'latency_seconds_sum{route="/a"} 0.5' in text
+    assert 'latency_seconds_count{route="/a"} 3' in text
+
+
+def test_merge_sums_workers_and_drops_dead_gauges():
+    def snapshot(requests, in_progress):
+        return {
+            'requests_total': {
+                'type': 'counter',
+                'help': '',
+                'samples': [[{'route': '/a'}, requests]],
+                'aggregate': 'sum',
+            },
+            'latency_seconds': {
+                'type': 'histogram',
+                'help': '',
+                'samples': [[{'route': '/a'}, histogram(requests, 1.0)]],
+                'aggregate': 'sum',
+            },
+            'in_progress': {
+                'type': 'gauge',
+                'help': '',
+                'samples': [[{}, in_progress]],
+                'aggregate': 'sum',
+            },
+            'lag_seconds': {
+                'type': 'gauge',
+                'help': '',
+                'samples': [[{}, in_progress * 10]],
+                'aggregate': 'max',
+            },
+        }
+
+    merged = merge([
+        (snapshot(2, 1), True),
+        (snapshot(1, 2), True),
+        (snapshot(3, 4), False),
+    ])
+
+    assert merged['requests_total']['samples'] == [[{'route': '/a'}, 6]]
+    assert merged['latency_seconds']['samples'][0][1]['count'] == 6  # noqa: PLR2004
+    assert merged['in_progress']['samples'] == [[{}, 3]]
+    assert merged['lag_seconds']['samples'] == [[{}, 20]]
+
+
+def test_snapshots_round_trip(tmp_path):
+    write_snapshot(str(tmp_path))
+    (tmp_path / f'{DEAD_PID}.json').write_text(
+        json.dumps(collect()), encoding='utf-8'
+    )
+
+    snapshots = read_snapshots(str(tmp_path))
+
+    assert sorted(alive for _, alive in snapshots) == [False, True]
+
+
+def test_read_prometheus_metrics():
+    client = TestClient(app)
+    client.get('/')
+
+    response = client.get('/metrics')
+
+    assert response.status_code == HTTPStatus.OK
+    assert response.headers['content-type'].startswith('text/plain')
+    assert 'http_requests_total{method="GET",route="/"' in response.text
+    assert '# TYPE db_pool_checked_out gauge' in response.text
@@ -0,0 +1,76 @@
+from datetime import timedelta
+
+import pytest
+from sqlalchemy import func, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from fast_zero.metrics import purger_metrics
+from fast_zero.models import Todo, TodoState
+from fast_zero.purger import TrashPurger
+from tests.conftest import TodoFactory
+
+
+def make_purger(engine, **kwargs):
+    options = {
+        'retention': timedelta(days=30),
+        'batch_size': 2,
+        'max_batches': 10,
+        'pause': 0,
+        'interval': 0,
+    } | kwargs
+    return TrashPurger(
+        lambda: AsyncSession(engine, expire_on_commit=False), **options
+    )
+
+
+async def seed(session, user, expired, recent, kept):
+    session.add_all(
+        TodoFactory.create_batch(
+            expired + recent, user_id=user.id, state=TodoState.trash
+        )
+        + TodoFactory.create_batch(kept, user_id=user.id, state=TodoState.todo)
+    )
+    await session.commit()
+
+    # Os `expired` primeiros (e os fora da lixeira) ficam com 40 dias
+    await session.execute(
+        update(Todo)
+        .where((Todo.id <= expired) | (Todo.state != TodoState.trash))
+        .values(updated_at=func.now() - timedelta(days=40))
+    )
+    await session.commit()
+
+
+@pytest.mark.asyncio
+async def test_purge_deletes_only_expired_trash(session, engine, user):
+    await seed(session, user, expired=5, recent=2, kept=3)
+
+    purged = await make_purger(engine).purge()
+
+    assert purged == 5  # noqa: PLR2004
+    states = (await session.scalars(select(Todo.state))).all()
+    assert states.count(TodoState.trash) == 2  # noqa: PLR2004
+    assert states.count(TodoState.todo) == 3  # noqa: PLR2004
+    assert purger_metrics.backlog == 0
+    assert purger_metrics.trashed == 2  # noqa: PLR2004
+
+
+@pytest.mark.asyncio
+async def test_purge_stops_after_max_batches(session, engine, user):
+    await seed(session, user, expired=5, recent=0, kept=0)
+
+    purger = make_purger(engine, batch_size=2, max_batches=1)
+
+    assert await purger.purge() == 2  # noqa: PLR2004
+    assert purger_metrics.backlog == 3  # noqa: PLR2004
+    assert await purger.purge() == 2  # noqa: PLR2004
+
+
+@pytest.mark.asyncio
+async def test_start_is_noop_when_disabled():
+    purger = make_purger(None, interval=0)
+
+    purger.start()
+
+    assert purger._task is None
+    await purger.stop()
@@ -0,0 +1,154 @@
+import pytest
+import pytest_asyncio
+from fastapi import Request
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import create_async_engine
+from testcontainers.postgres import PostgresContainer
+
+from fast_zero import database
+from fast_zero.app import app
+from fast_zero.cache import Cache, MemoryBackend
+from fast_zero.database import (
+    ReplicaSet,
+    SessionRouter,
+    get_read_session,
+    get_session,
+)
+from fast_zero.models import User, table_registry
+from tests.conftest import TodoFactory
+
+
+@pytest.mark.asyncio
+async def test_replica_set_rotates_and_drops_lagging(monkeypatch):
+    lags = {'a': 0.5, 'b': 30.0, 'c': 0.0}
+
+    async def measure_lag(replica):
+        if replica == 'c':
+            raise ConnectionError
+        return lags[replica]
+
+    monkeypatch.setattr(database, 'measure_lag', measure_lag)
+    replicas = ReplicaSet(['a', 'b', 'c'], max_lag=5, timeout=1)
+
+    assert replicas.pick() is None
+    await replicas.check()
+
+    assert {replicas.pick() for _ in range(4)} == {'a'}
+    assert [r['in_rotation'] for r in replicas.status()] == [
+        True,
+        False,
+        False,
+    ]
+
+
+@pytest.fixture(scope='session')
+def replica_engine():
+    # Um segundo Postgres, independente: faz o papel de réplica atrasada
+    with PostgresContainer('postgres:16', driver='psycopg') as postgres:
+        _engine = create_async_engine(postgres.get_connection_url())
+        yield _engine
+
+
+@pytest_asyncio.fixture
+async def routed_client(client, session, engine, replica_engine, user):
+    async with replica_engine.begin() as conn:
+        await conn.run_sync(table_registry.metadata.create_all)
+        await conn.execute(
+            insert(User).values(
+                id=user.id,
+                username=user.username,
+                email=user.email,
+                password=user.password,
+            )
+        )
+
+    router = SessionRouter(
+        engine,
+        ReplicaSet([replica_engine], max_lag=5, timeout=5),
+        Cache(MemoryBackend(), ttl=60),
+    )
+    await router.replicas.check()
+
+    async def write_session(request: Request):
+        yield session
+        await router.track_write(request, session)
+
+    async def read_session(request: Request):
+        read = await router.read_session(request)
+        try:
+            yield read
+        finally:
+            await read.close()
+
+    app.dependency_overrides[get_session] = write_session
+    app.dependency_overrides[get_read_session] = read_session
+    yield client, router
+
+    async with replica_engine.begin() as conn:
+        await conn.run_sync(table_registry.metadata.drop_all)
+
+
+@pytest.mark.asyncio
+async def test_reads_go_to_replica_until_own_write(
+    routed_client, session, user, token
+):
+    client, router = routed_client
+    headers = {'Authorization': f'Bearer {token}'}
+    # Só no primário: a réplica ainda não "recebeu"
+    session.add(TodoFactory(user_id=user.id))
+    await session.commit()
+
+    from_replica = client.get('/todos/', headers=headers)
+
+    client.post(
+        '/todos/',
+        headers=headers,
+        json={'title': 't', 'description': 'd', 'state': 'todo'},
+    )
+    from_primary = client.get('/todos/', headers=headers)
+
+    assert from_replica.json()['todos'] == []
+    assert len(from_primary.json()['todos']) == 2  # noqa: PLR2004
+
+
+@pytest.mark.asyncio
+async def test_lagging_replica_leaves_rotation(
+    routed_client, session, user, token
+):
+    client, router = routed_client
+    session.add(TodoFactory(user_id=user.id))
+    await session.commit()
+
+    router.replicas.max_lag = -1
+    await router.replicas.check()
+    response = client.get(
+        '/todos/', headers={'Authorization': f'Bearer {token}'}
+    )
+
+    assert router.replicas.pick() is None
+    assert len(response.json()['todos']) == 1
+
+
+@pytest.mark.asyncio
+async def test_replica_read_does_not_feed_the_writers_cache(
+    routed_client, user, token
+):
+    client, router = routed_client
+    headers = {'Authorization': f'Bearer {token}'}
+    old_username = user.username
+
+    client.put(
+        f'/users/{user.id}',
+        headers=headers,
+        json={
+            'username': 'renamed',
+            'email': user.email,
+            'password': user.clean_password,
+        },
+    )
+    # Sem credenciais: lê da réplica, que ainda tem o nome antigo
+    stale = client.get(f'/users/{user.id}')
+    fresh = client.get(f'/users/{user.id}', headers=headers)
+
+    assert stale.json()['username'] == old_username
+    assert fresh.json()['username'] == 'renamed'
@@ -1,13 +1,19 @@
 from http import HTTPStatus
+from unittest.mock import AsyncMock
 
 import pytest
 from fastapi import HTTPException
+from freezegun import freeze_time
 from jwt import decode
+from jwt.exceptions import ExpiredSignatureError
 
 from fast_zero.security import (
     create_access_token,
+    decode_token,
     get_current_user,
     settings,
+    token_cache,
+    user_cache,
 )
 
 
@@ -31,12 +37,79 @@ def test_jwt_invalid_token(client):
     assert response.json() == {'detail': 'Could not validate credentials'}
 
 
-def test_get_current_user(session):
+@pytest.mark.asyncio
+async def test_get_current_user(session):
     token_none_sub = create_access_token({'sub': None})
     token_none_db_user = create_access_token({'sub': 'not_a_user@test.com'})
 
     with pytest.raises(HTTPException):
-        get_current_user(session, token_none_sub)
+        await get_current_user(session, token_none_sub)
 
     with pytest.raises(HTTPException):
-        get_current_user(session, token_none_db_user)
+        await get_current_user(session, token_none_db_user)
+
+
+@pytest.mark.asyncio
+async def test_get_current_user_is_served_from_cache(session, user):
+    token = create_access_token({'sub': user.email})
+    hits = user_cache.hits
+
+    first = await get_current_user(session, token)
+    session.scalar = AsyncMock(side_effect=AssertionError('query issued'))
+    second = await get_current_user(session, token)
+
+    assert second.id == first.id == user.id
+    assert user_cache.hits == hits + 1
+    assert 'password' not in await user_cache.get(user.email)
+
+
+def test_update_user_invalidates_cached_user(client, user, token):
+    headers = {'Authorization': f'Bearer {token}'}
+    client.get('/todos/', headers=headers)  # aquece o cache
+
+    client.put(
+        f'/users/{user.id}',
+        headers=headers,
+        json={
+            'username': 'renamed',
+            'email': 'renamed@test.com',
+            'password': 'secret',
+        },
+    )
+    response = client.get('/todos/', headers=headers)
+
+    assert response.status_code == HTTPStatus.UNAUTHORIZED
+
+
+def test_delete_user_invalidates_cached_user(client, user, token):
+    headers = {'Authorization': f'Bearer {token}'}
+    client.get('/todos/', headers=headers)  # aquece o cache
+
+    client.delete(f'/users/{user.id}', headers=headers)
+    response = client.get('/todos/', headers=headers)
+
+    assert response.status_code == HTTPStatus.UNAUTHORIZED
+
+
+@pytest.mark.asyncio
+async def test_decode_token_is_served_from_cache():
+    token = create_access_token({'sub': 'cached@test.com'})
+    hits = token_cache.hits
+
+    first = await decode_token(token)
+    second = await decode_token(token)
+
+    assert first == second
+    assert first['sub'] == 'cached@test.com'
+    assert token_cache.hits == hits + 1
+
+
+@pytest.mark.asyncio
+async def test_decode_token_cache_honours_token_expiry():
+    with freeze_time('2024-07-11 12:00:00'):
+        token = create_access_token({'sub': 'cached@test.com'})
+        await decode_token(token)
+
+    with freeze_time('2024-07-11 12:31:00'):
+        with pytest.raises(ExpiredSignatureError):
+            await decode_token(token)
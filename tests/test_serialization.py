@@ -0,0 +1,34 @@
+import json
+
+from fast_zero.schemas import TodoList, UserList
+from fast_zero.serialization import todo_page, user_page
+from tests.conftest import TodoFactory, UserFactory
+
+
+def _with_ids(objects):
+    for n, obj in enumerate(objects, start=1):
+        obj.id = n
+    return objects
+
+
+def test_todo_page_matches_response_model():
+    todos = _with_ids(TodoFactory.create_batch(3))
+
+    fast = json.loads(todo_page.dump_json(todos, 'abc'))
+    default = TodoList.model_validate(
+        {'todos': todos, 'next_cursor': 'abc'}, from_attributes=True
+    ).model_dump(mode='json')
+
+    assert fast == default
+    assert list(fast['todos'][0]) == list(default['todos'][0])
+
+
+def test_user_page_matches_response_model():
+    users = _with_ids(UserFactory.create_batch(3))
+
+    fast = json.loads(user_page.dump_json(users, None))
+    default = UserList.model_validate(
+        {'users': users, 'next_cursor': None}, from_attributes=True
+    ).model_dump(mode='json')
+
+    assert fast == default
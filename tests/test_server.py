@@ -0,0 +1,95 @@
+import os
+import signal
+import socket
+import subprocess
+import sys
+import time
+from http import HTTPStatus
+
+import httpx
+import pytest
+
+from fast_zero.server import max_requests, per_worker_overrides
+from fast_zero.settings import get_settings
+
+
+def settings_with(**values):
+    return get_settings().model_copy(update=values)
+
+
+def test_pool_fits_connection_budget():
+    settings = settings_with(
+        DATABASE_MAX_CONNECTIONS=40,
+        DATABASE_POOL_SIZE=5,
+        DATABASE_MAX_OVERFLOW=10,
+        PASSWORD_HASH_WORKERS=1,
+    )
+
+    overrides = per_worker_overrides(settings, workers=4)
+
+    assert overrides == {
+        'DATABASE_POOL_SIZE': '5',
+        'DATABASE_MAX_OVERFLOW': '5',
+    }
+
+
+def test_connection_budget_too_small():
+    settings = settings_with(DATABASE_MAX_CONNECTIONS=3)
+
+    with pytest.raises(ValueError, match='not enough for 4 workers'):
+        per_worker_overrides(settings, workers=4)
+
+
+def test_max_requests_jitter():
+    settings = settings_with(
+        SERVER_MAX_REQUESTS=100, SERVER_MAX_REQUESTS_JITTER=10
+    )
+
+    limits = {max_requests(settings) for _ in range(200)}
+
+    assert min(limits) >= 100  # noqa: PLR2004
+    assert max(limits) <= 110  # noqa: PLR2004
+    assert max_requests(settings_with(SERVER_MAX_REQUESTS=0)) is None
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def wait_until_up(url: str, timeout: float = 20):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            return httpx.get(url)
+        except httpx.TransportError:
+            time.sleep(0.05)
+    raise TimeoutError(url)
+
+
+def test_workers_are_recycled_and_stop_gracefully():
+    port = free_port()
+    env = os.environ | {
+        'SERVER_HOST': '127.0.0.1',
+        'SERVER_PORT': str(port),
+        'SERVER_WORKERS': '2',
+        'SERVER_MAX_REQUESTS': '3',
+        'SERVER_MAX_REQUESTS_JITTER': '0',
+        'STARTUP_WARMUP': 'false',
+        'HEALTH_PROBE_INTERVAL': '0',
+    }
+    server = subprocess.Popen(
+        [sys.executable, '-m', 'fast_zero.server'], env=env
+    )
+    try:
+        url = f'http://127.0.0.1:{port}/health/live'
+        wait_until_up(url)
+        # Bem além de 2 workers x 3 requisições: só responde se repuser
+        statuses = {httpx.get(url).status_code for _ in range(20)}
+    finally:
+        server.send_signal(signal.SIGTERM)
+        returncode = server.wait(timeout=30)
+
+    assert statuses == {HTTPStatus.OK}
+    assert returncode == 0
@@ -0,0 +1,92 @@
+from contextlib import nullcontext
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import text
+
+from fast_zero.database import instrument_queries
+from fast_zero.metrics import route_timings
+from fast_zero.schemas import Message
+from fast_zero.timing import (
+    ServerTimingMiddleware,
+    collect,
+    instrument_routes,
+    phase,
+)
+
+
+@pytest.fixture
+def timed_client():
+    app = FastAPI()
+
+    @app.get('/async/{item}', response_model=Message)
+    async def read_async(item: int):
+        with phase('jwt'):
+            pass
+        return {'message': str(item)}
+
+    @app.get('/sync', response_model=Message)
+    def read_sync():
+        return {'message': 'sync'}
+
+    instrument_routes(app)
+    app.add_middleware(ServerTimingMiddleware)
+
+    route_timings.clear()
+    yield TestClient(app)
+    route_timings.clear()
+
+
+def server_timing(response) -> set[str]:
+    return {
+        entry.split(';')[0].strip()
+        for entry in response.headers['server-timing'].split(',')
+    }
+
+
+def test_server_timing_header_has_phases(timed_client):
+    response = timed_client.get('/async/1')
+
+    assert response.json() == {'message': '1'}
+    assert server_timing(response) == {
+        'jwt',
+        'endpoint',
+        'serialize',
+        'total',
+    }
+
+
+def test_sync_endpoint_is_timed(timed_client):
+    response = timed_client.get('/sync')
+
+    assert {'endpoint', 'serialize'} <= server_timing(response)
+
+
+def test_route_timings_use_the_route_template(timed_client):
+    timed_client.get('/async/1')
+    timed_client.get('/async/2')
+    timed_client.get('/missing')
+
+    snapshot = route_timings.snapshot()
+    stats = snapshot['GET /async/{item}']
+
+    assert stats['phases']['total']['count'] == 2  # noqa: PLR2004
+    assert stats['queries']['buckets']['0'] == 2  # noqa: PLR2004
+    assert 'unmatched' in snapshot
+
+
+def test_phase_is_a_noop_outside_a_request():
+    assert isinstance(phase('jwt'), nullcontext)
+
+
+@pytest.mark.asyncio
+async def test_instrument_queries_counts_statements(engine):
+    instrument_queries(engine.sync_engine)
+    with collect() as timings:
+        async with engine.connect() as conn:
+            await conn.execute(text('SELECT 1'))
+            await conn.execute(text('SELECT 2'))
+
+    assert timings.queries == 2  # noqa: PLR2004
+    assert timings.phases['db'] > 0
@@ -0,0 +1,68 @@
+import pytest
+from sqlalchemy import select, text
+
+from fast_zero.models import TodoCount, TodoState
+from fast_zero.todo_stats import RECONCILE_LOCK, reconcile_todo_counts
+from tests.conftest import TodoFactory
+
+
+async def counts(session, user):
+    rows = await session.execute(
+        select(TodoCount.state, TodoCount.count).where(
+            TodoCount.user_id == user.id
+        )
+    )
+    return {state: count for state, count in rows if count}
+
+
+@pytest.mark.asyncio
+async def test_triggers_count_statement_writes(session, user):
+    session.add_all(
+        TodoFactory.create_batch(4, user_id=user.id, state=TodoState.todo)
+    )
+    await session.commit()
+
+    await session.execute(
+        text("UPDATE todos SET state = 'done' WHERE id <= 2")
+    )
+    await session.execute(text('DELETE FROM todos WHERE id = 4'))
+    await session.commit()
+
+    assert await counts(session, user) == {
+        TodoState.todo: 1,
+        TodoState.done: 2,
+    }
+
+
+@pytest.mark.asyncio
+async def test_reconcile_repairs_drift(session, user):
+    session.add_all(
+        TodoFactory.create_batch(3, user_id=user.id, state=TodoState.doing)
+    )
+    await session.commit()
+    # Contadores corrompidos por fora dos triggers
+    await session.execute(text('UPDATE todo_counts SET count = 7'))
+    await session.execute(
+        text(
+            'INSERT INTO todo_counts (user_id, state, count) '
+            "VALUES (:user_id, 'trash', 2)"
+        ),
+        {'user_id': user.id},
+    )
+    await session.commit()
+
+    repaired = await reconcile_todo_counts(session)
+
+    assert repaired == 2  # noqa: PLR2004
+    assert await counts(session, user) == {TodoState.doing: 3}
+    assert await reconcile_todo_counts(session) == 0
+
+
+@pytest.mark.asyncio
+async def test_reconcile_skips_when_locked(session, engine):
+    async with engine.connect() as other:
+        await other.scalar(RECONCILE_LOCK)
+
+        assert await reconcile_todo_counts(session) is None
+
+        await other.rollback()
@@ -1,7 +1,15 @@
+import json
 from http import HTTPStatus
 
-from fast_zero.models import TodoState
-from tests.conftest import TodoFactory
+import pytest
+from sqlalchemy import select, text
+
+from fast_zero.models import Todo, TodoState
+from fast_zero.pagination import encode_cursor
+from fast_zero.response_cache import response_cache
+from fast_zero.routers import todos
+from fast_zero.schemas import MAX_BULK_ITEMS, TodoPublic
+from tests.conftest import TodoFactory, UserFactory
 
 
 def test_create_todo(client, token):
@@ -23,10 +31,30 @@ def test_create_todo(client, token):
     }
 
 
-def test_list_todos_should_return_5_todos(session, client, user, token):
+def test_create_todo_is_a_single_statement(client, token, statements):
+    headers = {'Authorization': f'Bearer {token}'}
+    # Primeira requisição autenticada: o usuário vai para o cache
+    client.get('/todos/stats', headers=headers)
+    statements.clear()
+
+    response = client.post(
+        '/todos/',
+        headers=headers,
+        json={'title': 't', 'description': 'd', 'state': 'todo'},
+    )
+
+    assert response.status_code == HTTPStatus.OK
+    assert response.headers['ETag']
+    assert len(statements) == 1
+    assert statements[0].startswith('INSERT INTO todos')
+    assert 'RETURNING' in statements[0]
+
+
+@pytest.mark.asyncio
+async def test_list_todos_should_return_5_todos(session, client, user, token):
     expected_todos = 5
-    session.bulk_save_objects(TodoFactory.create_batch(5, user_id=user.id))
-    session.commit()
+    session.add_all(TodoFactory.create_batch(5, user_id=user.id))
+    await session.commit()
     response = client.get(
         '/todos/',  # sem query
         headers={'Authorization': f'Bearer {token}'},
@@ -35,12 +63,13 @@ def test_list_todos_should_return_5_todos(session, client, user, token):
     assert len(response.json()['todos']) == expected_todos
 
 
-def test_list_todos_pagination_should_return_2_todos(
+@pytest.mark.asyncio
+async def test_list_todos_pagination_should_return_2_todos(
     session, user, client, token
 ):
     expected_todos = 2
-    session.bulk_save_objects(TodoFactory.create_batch(5, user_id=user.id))
-    session.commit()
+    session.add_all(TodoFactory.create_batch(5, user_id=user.id))
+    await session.commit()
     response = client.get(
         '/todos/?offset=1&limit=2',
         headers={'Authorization': f'Bearer {token}'},
@@ -48,14 +77,15 @@ def test_list_todos_pagination_should_return_2_todos(
     assert len(response.json()['todos']) == expected_todos
 
 
-def test_list_todos_filter_title_should_return_5_todos(
+@pytest.mark.asyncio
+async def test_list_todos_filter_title_should_return_5_todos(
     session, user, client, token
 ):
     expected_todos = 5
-    session.bulk_save_objects(
+    session.add_all(
         TodoFactory.create_batch(5, user_id=user.id, title='Test todo 1')
     )
-    session.commit()
+    await session.commit()
     response = client.get(
         '/todos/?title=Test todo 1',
         headers={'Authorization': f'Bearer {token}'},
@@ -63,14 +93,15 @@ def test_list_todos_filter_title_should_return_5_todos(
     assert len(response.json()['todos']) == expected_todos
 
 
-def test_list_todos_filter_description_should_return_5_todos(
+@pytest.mark.asyncio
+async def test_list_todos_filter_description_should_return_5_todos(
     session, user, client, token
 ):
     expected_todos = 5
-    session.bulk_save_objects(
+    session.add_all(
         TodoFactory.create_batch(5, user_id=user.id, description='description')
     )
-    session.commit()
+    await session.commit()
     response = client.get(
         '/todos/?description=desc',
         headers={'Authorization': f'Bearer {token}'},
@@ -78,14 +109,15 @@ def test_list_todos_filter_description_should_return_5_todos(
     assert len(response.json()['todos']) == expected_todos
 
 
-def test_list_todos_filter_state_should_return_5_todos(
+@pytest.mark.asyncio
+async def test_list_todos_filter_state_should_return_5_todos(
     session, user, client, token
 ):
     expected_todos = 5
-    session.bulk_save_objects(
+    session.add_all(
         TodoFactory.create_batch(5, user_id=user.id, state=TodoState.draft)
     )
-    session.commit()
+    await session.commit()
     response = client.get(
         '/todos/?state=draft',
         headers={'Authorization': f'Bearer {token}'},
@@ -93,11 +125,12 @@ def test_list_todos_filter_state_should_return_5_todos(
     assert len(response.json()['todos']) == expected_todos
 
 
-def test_list_todos_filter_combined_should_return_5_todos(
+@pytest.mark.asyncio
+async def test_list_todos_filter_combined_should_return_5_todos(
     session, user, client, token
 ):
     expected_todos = 5
-    session.bulk_save_objects(
+    session.add_all(
         TodoFactory.create_batch(
             5,
             user_id=user.id,
@@ -107,7 +140,7 @@ def test_list_todos_filter_combined_should_return_5_todos(
         )
     )
 
-    session.bulk_save_objects(
+    session.add_all(
         TodoFactory.create_batch(
             3,
             user_id=user.id,
@@ -116,7 +149,7 @@ def test_list_todos_filter_combined_should_return_5_todos(
             state=TodoState.todo,
         )
     )
-    session.commit()
+    await session.commit()
 
     response = client.get(
         '/todos/?title=Test todo combined&description=combined&state=done',
@@ -126,12 +159,13 @@ def test_list_todos_filter_combined_should_return_5_todos(
     assert len(response.json()['todos']) == expected_todos
 
 
-def test_delete_todo(session, client, user, token):
+@pytest.mark.asyncio
+async def test_delete_todo(session, client, user, token):
     todo = TodoFactory(user_id=user.id)
 
     session.add(todo)
-    session.commit()
-    session.refresh(todo)
+    await session.commit()
+    await session.refresh(todo)
 
     response = client.delete(
         f'/todos/{todo.id}', headers={'Authorization': f'Bearer {token}'}
@@ -140,6 +174,7 @@ def test_delete_todo(session, client, user, token):
     assert response.json() == {
         'message': 'Task has been deleted successfully.'
     }
+    assert await session.scalar(select(Todo).where(Todo.id == todo.id)) is None
 
 
 def test_delete_todo_error(client, token):
@@ -150,12 +185,13 @@ def test_delete_todo_error(client, token):
     assert response.json() == {'detail': 'Task not found.'}
 
 
-def test_patch_todo(session, client, user, token):
+@pytest.mark.asyncio
+async def test_patch_todo(session, client, user, token):
     todo = TodoFactory(user_id=user.id)
 
     session.add(todo)
-    session.commit()
-    session.refresh(todo)
+    await session.commit()
+    await session.refresh(todo)
 
     response = client.patch(
         f'/todos/{todo.id}',
@@ -166,6 +202,27 @@ def test_patch_todo(session, client, user, token):
     assert response.json()['title'] == 'teste!'
 
 
+@pytest.mark.asyncio
+async def test_patch_todo_is_a_single_statement(
+    session, client, user, token, statements
+):
+    todo = TodoFactory(user_id=user.id)
+    session.add(todo)
+    await session.commit()
+    headers = {'Authorization': f'Bearer {token}'}
+    client.get('/todos/stats', headers=headers)
+    statements.clear()
+
+    response = client.patch(
+        f'/todos/{todo.id}', json={'state': 'done'}, headers=headers
+    )
+
+    assert response.json()['state'] == 'done'
+    assert len(statements) == 1
+    assert statements[0].startswith('UPDATE todos')
+    assert 'RETURNING' in statements[0]
+
+
 def test_patch_todo_error(client, token):
     response = client.patch(
         '/todos/10',
@@ -174,3 +231,421 @@ def test_patch_todo_error(client, token):
     )
     assert response.status_code == HTTPStatus.NOT_FOUND
     assert response.json() == {'detail': 'Task not found.'}
+
+
+@pytest.mark.asyncio
+async def test_list_todos_cursor_pagination_walks_every_page(
+    session, user, client, token
+):
+    session.add_all(TodoFactory.create_batch(5, user_id=user.id))
+    await session.commit()
+    headers = {'Authorization': f'Bearer {token}'}
+
+    pages = [client.get('/todos/?limit=2', headers=headers).json()]
+    while pages[-1]['next_cursor']:
+        pages.append(
+            client.get(
+                f'/todos/?limit=2&cursor={pages[-1]["next_cursor"]}',
+                headers=headers,
+            ).json()
+        )
+
+    ids = [todo['id'] for page in pages for todo in page['todos']]
+    assert ids == [1, 2, 3, 4, 5]
+    assert [len(page['todos']) for page in pages] == [2, 2, 1]
+
+
+def test_list_todos_invalid_cursor(client, token):
+    response = client.get(
+        '/todos/?cursor=not-a-cursor',
+        headers={'Authorization': f'Bearer {token}'},
+    )
+
+    assert response.status_code == HTTPStatus.BAD_REQUEST
+    assert response.json() == {'detail': 'Invalid cursor'}
+
+
+@pytest.mark.asyncio
+async def test_list_todos_search_ranks_title_matches_first(
+    session, user, client, token
+):
+    session.add_all([
+        TodoFactory(
+            user_id=user.id, title='Plan the week', description='buy milk'
+        ),
+        TodoFactory(
+            user_id=user.id, title='Buy milk', description='at the store'
+        ),
+        TodoFactory(
+            user_id=user.id, title='Call mom', description='on sunday'
+        ),
+    ])
+    await session.commit()
+
+    response = client.get(
+        '/todos/?q=milk', headers={'Authorization': f'Bearer {token}'}
+    )
+
+    titles = [todo['title'] for todo in response.json()['todos']]
+    assert titles == ['Buy milk', 'Plan the week']
+    assert response.json()['next_cursor'] is None
+
+
+@pytest.mark.asyncio
+async def test_list_todos_search_matches_prefixes_and_stems(
+    session, user, client, token
+):
+    session.add(
+        TodoFactory(user_id=user.id, title='Morning runs', description='5km')
+    )
+    await session.commit()
+    headers = {'Authorization': f'Bearer {token}'}
+
+    prefix = client.get('/todos/?q=morn', headers=headers)
+    stemmed = client.get('/todos/?q=running', headers=headers)
+
+    assert [t['title'] for t in prefix.json()['todos']] == ['Morning runs']
+    assert [t['title'] for t in stemmed.json()['todos']] == ['Morning runs']
+
+
+def test_list_todos_search_rejects_cursor(client, token):
+    response = client.get(
+        f'/todos/?q=milk&cursor={encode_cursor(1)}',
+        headers={'Authorization': f'Bearer {token}'},
+    )
+
+    assert response.status_code == HTTPStatus.BAD_REQUEST
+    assert response.json() == {
+        'detail': 'Cursor pagination is not available with q'
+    }
+
+
+def test_create_todos_bulk(client, token):
+    response = client.post(
+        '/todos/bulk',
+        headers={'Authorization': f'Bearer {token}'},
+        json={
+            'todos': [
+                {'title': 'first', 'description': 'one', 'state': 'draft'},
+                {'title': 'second', 'description': 'two', 'state': 'todo'},
+            ]
+        },
+    )
+
+    assert response.status_code == HTTPStatus.OK
+    assert response.json() == {
+        'results': [
+            {
+                'id': 1,
+                'status': 'created',
+                'todo': {
+                    'id': 1,
+                    'title': 'first',
+                    'description': 'one',
+                    'state': 'draft',
+                },
+            },
+            {
+                'id': 2,
+                'status': 'created',
+                'todo': {
+                    'id': 2,
+                    'title': 'second',
+                    'description': 'two',
+                    'state': 'todo',
+                },
+            },
+        ]
+    }
+
+
+def test_create_todos_bulk_over_limit(client, token):
+    todo = {'title': 't', 'description': 'd', 'state': 'draft'}
+
+    response = client.post(
+        '/todos/bulk',
+        headers={'Authorization': f'Bearer {token}'},
+        json={'todos': [todo] * (MAX_BULK_ITEMS + 1)},
+    )
+
+    assert response.status_code == HTTPStatus.UNPROCESSABLE_ENTITY
+    assert response.json()['detail'][0]['type'] == 'too_long'
+
+
+@pytest.mark.asyncio
+async def test_patch_todos_bulk(session, client, user, other_user, token):
+    session.add_all(TodoFactory.create_batch(3, user_id=user.id))
+    session.add(TodoFactory(user_id=other_user.id))
+    await session.commit()
+
+    response = client.patch(
+        '/todos/bulk',
+        headers={'Authorization': f'Bearer {token}'},
+        json={
+            'todos': [
+                {'id': 1, 'state': 'done'},
+                {'id': 2, 'state': 'done'},
+                {'id': 3, 'title': 'renamed'},
+                {'id': 4, 'state': 'done'},
+            ]
+        },
+    )
+
+    results = response.json()['results']
+    assert [(r['id'], r['status']) for r in results] == [
+        (1, 'updated'),
+        (2, 'updated'),
+        (3, 'updated'),
+        (4, 'not_found'),
+    ]
+    assert results[0]['todo']['state'] == 'done'
+    assert results[2]['todo']['title'] == 'renamed'
+    assert results[3]['todo'] is None
+
+
+def test_patch_todos_bulk_rejects_duplicate_ids(client, token):
+    response = client.patch(
+        '/todos/bulk',
+        headers={'Authorization': f'Bearer {token}'},
+        json={'todos': [{'id': 1}, {'id': 1, 'state': 'done'}]},
+    )
+
+    assert response.status_code == HTTPStatus.BAD_REQUEST
+    assert response.json() == {'detail': 'Duplicate todo ids in batch'}
+
+
+@pytest.mark.asyncio
+async def test_delete_todos_bulk(session, client, user, other_user, token):
+    session.add_all(TodoFactory.create_batch(2, user_id=user.id))
+    session.add(TodoFactory(user_id=other_user.id))
+    await session.commit()
+    headers = {'Authorization': f'Bearer {token}'}
+
+    response = client.request(
+        'DELETE', '/todos/bulk', headers=headers, json={'ids': [1, 3, 2]}
+    )
+
+    assert [(r['id'], r['status']) for r in response.json()['results']] == [
+        (1, 'deleted'),
+        (3, 'not_found'),
+        (2, 'deleted'),
+    ]
+    assert client.get('/todos/', headers=headers).json()['todos'] == []
+
+
+@pytest.mark.asyncio
+async def test_export_todos_ndjson(session, client, user, other_user, token):
+    session.add_all([
+        TodoFactory(user_id=user.id, title='one', state=TodoState.done),
+        TodoFactory(user_id=user.id, title='two', state=TodoState.todo),
+        TodoFactory(user_id=other_user.id, title='three'),
+    ])
+    await session.commit()
+
+    response = client.get(
+        '/todos/export', headers={'Authorization': f'Bearer {token}'}
+    )
+
+    assert response.status_code == HTTPStatus.OK
+    assert response.headers['content-type'] == 'application/x-ndjson'
+    rows = [json.loads(line) for line in response.text.splitlines()]
+    assert [(row['id'], row['title'], row['state']) for row in rows] == [
+        (1, 'one', 'done'),
+        (2, 'two', 'todo'),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_export_todos_csv_with_filters(session, client, user, token):
+    session.add_all([
+        TodoFactory(
+            user_id=user.id,
+            title='one',
+            description='a, b',
+            state=TodoState.done,
+        ),
+        TodoFactory(user_id=user.id, title='two', state=TodoState.todo),
+    ])
+    await session.commit()
+
+    response = client.get(
+        '/todos/export?format=csv&state=done',
+        headers={'Authorization': f'Bearer {token}'},
+    )
+
+    assert response.headers['content-type'].startswith('text/csv')
+    assert response.text.splitlines() == [
+        'title,description,state,id',
+        'one,"a, b",done,1',
+    ]
+
+
+def test_import_todos_ndjson(client, token):
+    headers = {'Authorization': f'Bearer {token}'}
+    body = '\n'.join([
+        '{"title": "one", "description": "a", "state": "todo"}',
+        '{"title": "two", "description": "b", "state": "nope"}',
+        'not json',
+        '{"title": "three", "description": "c", "state": "done"}',
+    ])
+
+    response = client.post('/todos/import', headers=headers, content=body)
+
+    assert response.status_code == HTTPStatus.OK
+    assert response.json()['accepted'] == 2  # noqa: PLR2004
+    assert response.json()['rejected'] == 2  # noqa: PLR2004
+    assert [e['row'] for e in response.json()['errors']] == [2, 3]
+
+    todos = client.get('/todos/', headers=headers).json()['todos']
+    assert [(t['title'], t['state']) for t in todos] == [
+        ('one', 'todo'),
+        ('three', 'done'),
+    ]
+
+
+def test_import_todos_csv(client, token):
+    headers = {'Authorization': f'Bearer {token}'}
+    body = 'title,description,state\r\none,"a, b",todo\r\ntwo,b\r\n'
+
+    response = client.post(
+        '/todos/import?format=csv', headers=headers, content=body
+    )
+
+    assert response.json() == {
+        'accepted': 1,
+        'rejected': 1,
+        'errors': [{'row': 2, 'detail': 'Expected 3 fields, got 2'}],
+    }
+    todos = client.get('/todos/', headers=headers).json()['todos']
+    assert [t['description'] for t in todos] == ['a, b']
+
+
+def test_import_todos_reports_invalid_utf8_row(client, token):
+    headers = {'Authorization': f'Bearer {token}'}
+    body = b'\n'.join([
+        b'{"title": "one", "description": "a", "state": "todo"}',
+        b'{"title": "tw\xff", "description": "b", "state": "todo"}',
+        b'{"title": "three", "description": "c", "state": "done"}',
+    ])
+
+    response = client.post('/todos/import', headers=headers, content=body)
+
+    assert response.json() == {
+        'accepted': 2,
+        'rejected': 1,
+        'errors': [{'row': 2, 'detail': 'Line is not valid UTF-8'}],
+    }
+    todos = client.get('/todos/', headers=headers).json()['todos']
+    assert [t['title'] for t in todos] == ['one', 'three']
+
+
+@pytest.mark.asyncio
+async def test_list_todos_fast_serialization_keeps_shape(
+    session, client, user, token, monkeypatch
+):
+    session.add_all(TodoFactory.create_batch(3, user_id=user.id))
+    await session.commit()
+    headers = {'Authorization': f'Bearer {token}'}
+
+    default = client.get('/todos/?limit=2', headers=headers)
+    monkeypatch.setattr(todos.settings, 'FAST_LIST_SERIALIZATION', True)
+    fast = client.get('/todos/?limit=2', headers=headers)
+
+    assert fast.headers['content-type'] == 'application/json'
+    assert fast.json() == default.json()
+
+
+def test_list_todos_selects_only_public_columns():
+    query = todos.filter_todos(UserFactory(), None, None, None, None)
+
+    assert [column.name for column in query.selected_columns] == list(
+        TodoPublic.model_fields
+    )
+
+
+def test_list_todos_conditional_get(client, token):
+    headers = {'Authorization': f'Bearer {token}'}
+    todo = {'title': 't', 'description': 'd', 'state': 'draft'}
+
+    first = client.get('/todos/', headers=headers)
+    etag = first.headers['etag']
+    unchanged = client.get(
+        '/todos/', headers={**headers, 'If-None-Match': etag}
+    )
+    other_query = client.get(
+        '/todos/?limit=1', headers={**headers, 'If-None-Match': etag}
+    )
+    client.post('/todos/', headers=headers, json=todo)
+    changed = client.get('/todos/', headers={**headers, 'If-None-Match': etag})
+
+    assert unchanged.status_code == HTTPStatus.NOT_MODIFIED
+    assert not unchanged.content
+    assert unchanged.headers['etag'] == etag
+    assert other_query.status_code == HTTPStatus.OK
+    assert changed.status_code == HTTPStatus.OK
+    assert changed.headers['etag'] != etag
+    assert len(changed.json()['todos']) == 1
+
+
+@pytest.mark.asyncio
+async def test_todos_version_bumps_once_per_statement(session, client, token):
+    headers = {'Authorization': f'Bearer {token}'}
+    todo = {'title': 't', 'description': 'd', 'state': 'draft'}
+
+    client.post('/todos/bulk', headers=headers, json={'todos': [todo] * 3})
+    client.request('DELETE', '/todos/bulk', headers=headers, json={'ids': [1]})
+
+    version = await session.scalar(text('SELECT todos_version FROM users'))
+    assert version == 2  # noqa: PLR2004
+
+
+@pytest.mark.asyncio
+async def test_list_todos_is_cached_per_version(session, client, user, token):
+    headers = {'Authorization': f'Bearer {token}'}
+
+    client.get('/todos/', headers=headers)
+    client.get('/todos/', headers=headers)
+    # Escrita por fora dos handlers: a versão da coleção muda mesmo assim
+    session.add(TodoFactory(user_id=user.id))
+    await session.commit()
+    fresh = client.get('/todos/', headers=headers)
+
+    assert response_cache.stats()['list_todos']['hits'] >= 1
+    assert len(fresh.json()['todos']) == 1
+
+
+def test_read_todo_stats_follows_writes(client, token):
+    headers = {'Authorization': f'Bearer {token}'}
+    todo = {'title': 't', 'description': 'd', 'state': 'draft'}
+
+    client.post('/todos/', headers=headers, json=todo)
+    client.post('/todos/bulk', headers=headers, json={'todos': [todo] * 3})
+    client.patch('/todos/1', headers=headers, json={'state': 'done'})
+    client.patch('/todos/2', headers=headers, json={'title': 'sem estado'})
+    client.delete('/todos/3', headers=headers)
+
+    response = client.get('/todos/stats', headers=headers)
+
+    assert response.status_code == HTTPStatus.OK
+    assert response.json() == {
+        'total': 3,
+        'states': {
+            'draft': 2,
+            'todo': 0,
+            'doing': 0,
+            'done': 1,
+            'trash': 0,
+        },
+    }
+
+
+@pytest.mark.asyncio
+async def test_read_todo_stats_is_per_user(session, client, other_user, token):
+    session.add_all(TodoFactory.create_batch(3, user_id=other_user.id))
+    await session.commit()
+
+    response = client.get(
+        '/todos/stats', headers={'Authorization': f'Bearer {token}'}
+    )
+
+    assert response.json()['total'] == 0
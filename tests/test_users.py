@@ -1,5 +1,7 @@
 from http import HTTPStatus
+from unittest.mock import AsyncMock
 
+from fast_zero.routers import users
 from fast_zero.schemas import UserPublic
 
 
@@ -45,11 +47,42 @@ def test_create_user(client):
     }
 
 
+def test_create_user_is_a_lookup_and_an_insert(client, statements):
+    response = client.post(
+        '/users',
+        json={'username': 'u', 'email': 'u@test.com', 'password': 'p'},
+    )
+
+    assert response.status_code == HTTPStatus.CREATED
+    assert len(statements) == 2  # noqa: PLR2004
+    assert statements[0].startswith('SELECT users.username')
+    assert 'ON CONFLICT DO NOTHING RETURNING' in statements[1]
+
+
+def test_create_user_duplicate_skips_hashing(client, user, monkeypatch):
+    monkeypatch.setattr(
+        users,
+        'hash_password',
+        AsyncMock(side_effect=AssertionError('password hashed')),
+    )
+
+    response = client.post(
+        '/users',
+        json={
+            'username': user.username,
+            'email': 'new@test.com',
+            'password': 'p',
+        },
+    )
+
+    assert response.json() == {'detail': 'Username already exists'}
+
+
 def test_read_users(client):
     response = client.get('/users/')
 
     assert response.status_code == HTTPStatus.OK
-    assert response.json() == {'users': []}
+    assert response.json() == {'users': [], 'next_cursor': None}
 
 
 def test_read_user(client, user):
@@ -69,7 +102,7 @@ def test_read_users_with_user(client, user):
     response = client.get('/users/')
 
     assert response.status_code == HTTPStatus.OK
-    assert response.json() == {'users': [user_schema]}
+    assert response.json() == {'users': [user_schema], 'next_cursor': None}
 
 
 def test_update_user(client, user, token):
@@ -90,6 +123,28 @@ def test_update_user(client, user, token):
     # assert success.json() == user_schema
 
 
+def test_update_user_is_a_single_statement(client, user, token, statements):
+    headers = {'Authorization': f'Bearer {token}'}
+    # Primeira requisição autenticada: o usuário vai para o cache
+    client.get('/todos/stats', headers=headers)
+    statements.clear()
+
+    response = client.put(
+        f'/users/{user.id}',
+        headers=headers,
+        json={'username': 'vini', 'email': 'vini@vini.com', 'password': 'x'},
+    )
+
+    assert response.json() == {
+        'id': user.id,
+        'username': 'vini',
+        'email': 'vini@vini.com',
+    }
+    assert len(statements) == 1
+    assert statements[0].startswith('UPDATE users')
+    assert 'RETURNING' in statements[0]
+
+
 def test_update_user_not_enough_permission(client, user, other_user, token):
     update_test_user = {
         'username': 'vini',
@@ -142,3 +197,42 @@ def test_delete_user(client, user, token):
 #     )
 #     assert response.status_code == HTTPStatus.FORBIDDEN
 #     assert response.json() == {'detail': 'Not enough permissions'}
+
+
+def test_read_users_with_cursor(client, user, other_user):
+    first = client.get('/users/?limit=1').json()
+    second = client.get(f'/users/?limit=1&cursor={first["next_cursor"]}')
+
+    assert [u['id'] for u in first['users']] == [user.id]
+    assert second.json() == {
+        'users': [UserPublic.model_validate(other_user).model_dump()],
+        'next_cursor': None,
+    }
+
+
+def test_read_users_selects_only_public_columns():
+    assert [column.name for column in users.USER_COLUMNS] == list(
+        UserPublic.model_fields
+    )
+
+
+def test_read_user_conditional_get(client, user, token):
+    etag = client.get(f'/users/{user.id}').headers['etag']
+
+    unchanged = client.get(
+        f'/users/{user.id}', headers={'If-None-Match': etag}
+    )
+    client.put(
+        f'/users/{user.id}',
+        headers={'Authorization': f'Bearer {token}'},
+        json={
+            'username': 'renamed',
+            'email': user.email,
+            'password': user.clean_password,
+        },
+    )
+    changed = client.get(f'/users/{user.id}', headers={'If-None-Match': etag})
+
+    assert unchanged.status_code == HTTPStatus.NOT_MODIFIED
+    assert changed.status_code == HTTPStatus.OK
+    assert changed.json()['username'] == 'renamed'
@@ -0,0 +1,66 @@
+import logging
+
+import pytest
+from alembic.config import Config
+from alembic.script import ScriptDirectory
+from sqlalchemy import create_engine, text
+
+from fast_zero import warmup
+from fast_zero.hashing import HashingPool
+from fast_zero.migrate import at_head
+from fast_zero.settings import get_settings
+
+
+def test_settings_are_read_once():
+    assert get_settings() is get_settings()
+
+
+@pytest.mark.asyncio
+async def test_hashing_warm_up_spawns_every_worker():
+    pool = HashingPool(workers=2, max_pending=4, retry_after=1)
+    try:
+        await pool.warm_up()
+
+        assert len(pool._get_executor()._processes) == 2  # noqa: PLR2004
+    finally:
+        pool.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_warm_up_logs_failed_steps(monkeypatch, caplog):
+    async def broken(connections):
+        raise ConnectionError
+
+    async def noop():
+        pass
+
+    monkeypatch.setattr(warmup, 'warm_pool', broken)
+    monkeypatch.setattr(warmup.hashing_pool, 'warm_up', noop)
+
+    with caplog.at_level(logging.WARNING):
+        await warmup.warm_up()
+
+    assert 'Warm-up of database pool failed' in caplog.text
+
+
+def test_at_head(engine):
+    url = engine.url.render_as_string(hide_password=False)
+    config = Config('alembic.ini')
+    head = ScriptDirectory.from_config(config).get_current_head()
+
+    before = at_head(config, url)
+    sync_engine = create_engine(url)
+    with sync_engine.begin() as conn:
+        conn.execute(
+            text('CREATE TABLE alembic_version (version_num varchar(32))')
+        )
+        conn.execute(
+            text('INSERT INTO alembic_version VALUES (:head)'), {'head': head}
+        )
+    after = at_head(config, url)
+    with sync_engine.begin() as conn:
+        conn.execute(text('DROP TABLE alembic_version'))
+    sync_engine.dispose()
+
+    assert not before
+    assert after